@@ -0,0 +1,176 @@
+# Copyright (c) 2024, Oracle and/or its affiliates.
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License, version 2.0,
+# as published by the Free Software Foundation.
+#
+# This program is designed to work with certain software (including
+# but not limited to OpenSSL) that is licensed under separate terms, as
+# designated in a particular file or component or in included license
+# documentation.  The authors of MySQL hereby grant you an additional
+# permission to link the program and your derivative works with the
+# separately licensed software that they have either included with
+# the program or referenced in the documentation.
+#
+# This program is distributed in the hope that it will be useful,  but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See
+# the GNU General Public License, version 2.0, for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software Foundation, Inc.,
+# 51 Franklin St, Fifth Floor, Boston, MA 02110-1301 USA
+
+import inspect
+import re
+import threading
+
+import mysqlsh
+
+import gui_plugin as gui
+
+
+class Command():
+    """A command resolved to the function it executes
+
+    Resolving a command walks the object chain of the command string and
+    inspects the arguments of the function, so this is done once per command
+    and kept in the CommandRegistry.
+    """
+
+    def __init__(self, name, func, is_gui, f_args):
+        self.name = name
+        self.func = func
+        # Whether the function belongs to the gui global object
+        self.is_gui = is_gui
+        # The names of the function arguments
+        self.f_args = frozenset(f_args)
+
+
+class CommandRegistry():
+    """Registry of the commands executed through the web socket
+
+    Each command is resolved when it is executed for the first time, later
+    requests of the same command only need a dict lookup.
+    """
+    __instance = None
+
+    @staticmethod
+    def get_instance() -> 'CommandRegistry':
+        if CommandRegistry.__instance is None:
+            CommandRegistry()
+        return CommandRegistry.__instance
+
+    def __init__(self):
+        if CommandRegistry.__instance is not None:
+            raise Exception(
+                "This class is a singleton, use get_instance function to get an instance.")
+        else:
+            CommandRegistry.__instance = self
+            self._commands = {}
+            self._lock = threading.Lock()
+
+    def get(self, cmd) -> Command:
+        command = self._commands.get(cmd)
+        if command is None:
+            # Errors are not cached, so a command becomes available as soon
+            # as the plugin defining it has been loaded
+            command = self.resolve(cmd)
+            with self._lock:
+                self._commands[cmd] = command
+
+        return command
+
+    def clear(self):
+        with self._lock:
+            self._commands = {}
+
+    def resolve(self, cmd) -> Command:
+        # Loop over all chained objects/functions of the given cmd and find
+        # the function to call
+        matches = re.findall(r'(\w+)\.', cmd + '.')
+        parent_obj = None
+        func = None
+
+        if len(matches) < 2:
+            raise Exception(
+                f"The command '{cmd}' is using wrong format. "
+                "Use <global>[.<object>]*.<function>")
+
+        # Last entry is a function name
+        function_name = matches[-1]
+
+        # Rest is a chain of objects
+        objects = matches[:-1]
+
+        found_objects = []
+
+        # Selects the parent object
+        if objects[0] == 'gui':
+            parent_obj = gui
+            objects = objects[1:]
+            found_objects.append('gui')
+        else:
+            parent_obj = mysqlsh.globals
+
+        # Searches the object hierarchy
+        for object in objects:
+            try:
+                child = getattr(parent_obj, object)
+
+                # Set the parent_obj for the next object evaluation
+                parent_obj = child
+                found_objects.append(object)
+            except:
+                if len(found_objects) == 0:
+                    raise Exception(
+                        f"The '{object}' global object does not exist")
+                else:
+                    raise Exception(
+                        f"Object '{'.'.join(found_objects)}' has no member named '{object}'")
+
+        # Searches the target function
+        try:
+            func = getattr(parent_obj, function_name)
+        except:
+            raise Exception(
+                f"Object '{'.'.join(found_objects)}' has no member function named '{function_name}'")
+
+        f_args = []
+        if func:
+            f_args = get_function_arguments(
+                func=func, mod=parent_obj, mod_cmd=function_name)
+
+        return Command(cmd, func, found_objects[0] == 'gui', f_args)
+
+
+def get_function_arguments(func, mod, mod_cmd):
+    try:
+        # try to use the regular inspection function to get the function
+        # arguments
+        sig = inspect.signature(func)
+        f_args = [p.name for p in sig.parameters.values()]
+    except:  # pragma: no cover
+        # if that fails, fall back to parsing the help output of that
+        # function
+        help_func = getattr(mod, 'help')
+        help_output = help_func(f'{mod_cmd}')
+
+        match = re.match(r'(.|\s)*?SYNTAX(.|\s)*?\(([\w,\[\]\s]*)',
+                         help_output, flags=re.MULTILINE)
+        arguments = match[3].replace('[', '').replace(']', '').\
+            replace('\n', '').replace(' ', '')
+
+        f_args = arguments.split(",")
+
+        # Include the kwargs
+        if 'kwargs' in f_args:
+            f_args.remove('kwargs')
+            desc_idx = help_output.find(
+                'The kwargs parameter accepts the following options:')
+            desc = help_output[desc_idx + 53:]
+            matches = re.findall(r'-\s(\w*)\:', desc, flags=re.MULTILINE)
+            for match in matches:
+                f_args.append(match)
+
+    return f_args
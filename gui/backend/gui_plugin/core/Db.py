@@ -26,13 +26,38 @@ import gui_plugin.core.Logger as logger
 import re
 import json
 import datetime
-import uuid
+from collections import namedtuple
+from functools import lru_cache
 from os import path, listdir
 from pathlib import Path
 from .Protocols import Response
-from .GuiBackendDbManager import BackendSqliteDbManager
+from .GuiBackendDbManager import BackendSqliteDbManager, BackendDbPool
 from gui_plugin.core import Error
 
+# The columns of the backend tables holding JSON documents
+JSON_COLUMNS = {
+    "db_connection": ("options",),
+    "profile": ("options",),
+}
+
+# The result columns decoded by GuiBackendDb.select unless the query sets them
+DEFAULT_JSON_COLUMNS = frozenset(
+    column for columns in JSON_COLUMNS.values() for column in columns)
+
+
+@lru_cache(maxsize=256)
+def get_row_type(columns):
+    return namedtuple("Row", columns, rename=True)
+
+
+def decode_json_value(value):
+    if isinstance(value, str):
+        try:
+            return json.loads(value)
+        except ValueError as e:  # pragma: no cover
+            pass
+    return value
+
 
 class BackendDatabase():
     def __init__(self, be_session=None, log_rotation=False):
@@ -44,9 +69,9 @@ class BackendDatabase():
 
     def __enter__(self):
         if self.db is None:
-            self.db = GuiBackendDb(
-                log_rotation=self.log_rotation,
-                session_uuid=str(uuid.uuid1()))
+            # Not bound to a web session, so the pooled sessions of the
+            # thread can be reused
+            self.db = GuiBackendDb(log_rotation=self.log_rotation)
 
         return self.db
 
@@ -87,12 +112,14 @@ class GuiBackendDb():
 
         self._session_uuid = session_uuid
 
-        backend_db_manager = BackendSqliteDbManager(
+        self._db_manager = BackendSqliteDbManager(
             log_rotation=log_rotation,
             session_uuid=self._session_uuid)
 
-        # Opens the session to the backend database
-        self._db = backend_db_manager.open_database()
+        # Gets a session to the backend database, the sessions are pooled
+        # per thread and returned to the pool on close
+        self._db = BackendDbPool.get_instance().acquire(self._db_manager)
+        self._closed = False
 
     def execute(self, sql, params=None):
         return self._db.execute(sql, params)
@@ -110,11 +137,13 @@ class GuiBackendDb():
         self._db.rollback()
 
     def close(self):
-        self._db.close()
+        if not self._closed:
+            self._closed = True
+            BackendDbPool.get_instance().release(self._db_manager, self._db)
 
     def commit_and_close(self):
         self._db.commit()
-        self._db.close()
+        self.close()
 
     def rollback_and_close(self):
         self.rollback()
@@ -140,29 +169,63 @@ class GuiBackendDb():
 
         return Response.standard(status['type'], status['msg'], {"id": last_id})
 
-    def select(self, sql, params=None, close=None):
+    def select(self, sql, params=None, close=None, json_columns=None, as_tuples=False):
+        """Executes the query and returns the rows
+
+        Args:
+            sql (str): The query
+            params (tuple): The query parameters
+            close (bool): Whether the database should be closed afterwards
+            json_columns (iterable): The result columns holding JSON documents
+                to be decoded, DEFAULT_JSON_COLUMNS if not given
+            as_tuples (bool): Whether the rows are returned as named tuples
+                instead of dicts
+
+        Returns:
+            The list of rows
+        """
         res = None
         rows = []
+        if json_columns is None:
+            json_columns = DEFAULT_JSON_COLUMNS
         try:
             resultset = None
             if params:
                 resultset = self.execute(sql, params)
             else:
                 resultset = self.execute(sql)
+            # The rows are built below, so plain tuples are fetched instead
+            # of sqlite3.Row objects
+            resultset.row_factory = None
             res = resultset.fetch_all()
-            for row in res:
-                # check if one of the fields could be JSON, and if so, convert
-                # it to a dict if possible
-                row_dict = dict(row)
-                for key, val in row_dict.items():
-                    if isinstance(val, str):
-                        if val.startswith('{') and val.endswith('}'):
-                            try:
-                                row_dict[key] = json.loads(val)
-                            except ValueError as e:  # pragma: no cover
-                                pass
-
-                rows.append(row_dict)
+
+            columns = tuple(
+                description[0] for description in resultset.description or ())
+            json_indexes = frozenset(index for index, column in enumerate(columns)
+                                     if column in json_columns)
+
+            if as_tuples:
+                row_type = get_row_type(columns)
+                if json_indexes:
+                    rows = [row_type._make(
+                        decode_json_value(value) if index in json_indexes else value
+                        for index, value in enumerate(row)) for row in res]
+                else:
+                    rows = [row_type._make(row) for row in res]
+            else:
+                if len(set(columns)) != len(columns):
+                    # Like for sqlite3.Row, the first column of a given name wins
+                    indexes = {}
+                    for index, column in enumerate(columns):
+                        indexes.setdefault(column, index)
+                    rows = [{column: row[index] for column, index in indexes.items()}
+                            for row in res]
+                else:
+                    rows = [dict(zip(columns, row)) for row in res]
+
+                for column in {columns[index] for index in json_indexes}:
+                    for row in rows:
+                        row[column] = decode_json_value(row[column])
 
         except Exception as e:  # pragma: no cover
             # TODO(rennox): Is this the right way to set the last error?
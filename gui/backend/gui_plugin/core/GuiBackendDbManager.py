@@ -22,11 +22,13 @@
 # 51 Franklin St, Fifth Floor, Boston, MA 02110-1301 USA
 
 import contextlib
+import json
 import os
 import pathlib
 import re
 import sqlite3
 import stat
+import threading
 from datetime import date
 from os import chdir, getcwd, listdir, makedirs, path, remove, rename
 
@@ -38,13 +40,20 @@ from gui_plugin.core.dbms import DbSessionFactory
 from gui_plugin.core.lib.Version import Version
 
 # Refers to the schema version supported by this version of the code
-CURRENT_DB_VERSION = Version((0, 0, 16))
+CURRENT_DB_VERSION = Version((0, 0, 17))
 # Do not change it, it was dropped in 0.0.16 and that is valid value
 DROPPED_VERSION_IN_NAME_DB_VERSION = Version((0, 0, 16))
 OLDEST_SUPPORTED_DB_VERSION = Version((0, 0, 11))
 DEFAULT_CONFIG = {
     "log_rotation_period": 7
 }
+# The maximum number of idle backend database sessions kept by a thread,
+# across all databases and web sessions
+BACKEND_DB_POOL_IDLE_MAX = 4
+# The number of rows moved to the backup log database per transaction
+LOG_ROTATION_BATCH_SIZE = 10000
+# The log tables and their indexed timestamp column
+LOG_TABLES = {"log": "event_time", "message": "sent"}
 
 
 class BackendDbManager():
@@ -56,6 +65,9 @@ class BackendDbManager():
 
     Subclasses of this class handle the specific implementation details
     """
+    # The database files deployed or upgraded already by this process
+    _verified_databases = set()
+    _verified_databases_lock = threading.Lock()
 
     def __init__(self, log_rotation=False, session_uuid=None, connection_options=None):
         self._session_uuid = session_uuid
@@ -67,32 +79,55 @@ class BackendDbManager():
 
         # Log rotation verification should be enabled by the caller
         # only at specific locations
-        db = self.open_database()
-        if log_rotation and self.check_if_logs_need_rotation(db):
-            self.backup_logs(db)
-        db.close()
+        if log_rotation:
+            db = self.open_database()
+            if self.check_if_logs_need_rotation(db):
+                self.backup_logs(db)
+            db.close()
 
     def ensure_database_exists(self):
-        if not self.current_database_exist():
-            self.initialize_db()
-        else:
-            self.check_for_previous_version_and_upgrade()
+        # The version check and the upgrade are done once per process, as
+        # long as the database file is not removed
+        db_file = self._connection_options["db_file"]
+        with BackendDbManager._verified_databases_lock:
+            if db_file in BackendDbManager._verified_databases and \
+                    self.current_database_exist():
+                return
+
+            if not self.current_database_exist():
+                self.initialize_db()
+            else:
+                self.check_for_previous_version_and_upgrade()
+
+            BackendDbManager._verified_databases.add(db_file)
+
+    @property
+    def pool_key(self):
+        # Sessions are named after the web session they were opened for, so
+        # they are only shared between managers of the same web session
+        return json.dumps([self._session_uuid, self._connection_options],
+                          sort_keys=True)
+
+    def get_log_rotation_cutoff(self, db):
+        # The timestamps are stored as 'YYYY-MM-DD HH:MM:SS' strings so
+        # comparing them against the date keeps the timestamp index usable
+        return db.execute("SELECT date('now');").fetch_one()[0]
 
     def check_if_logs_need_rotation(self, db):
-        sql_message = "SELECT COUNT(sent) FROM `gui_log`.`message` WHERE date(sent) < date('now');"
-        sql_log = "SELECT COUNT(event_time) FROM `gui_log`.`log` WHERE date(event_time) < date('now');"
-        old_rows_count = 0
         try:
-            res = db.execute(sql_message).fetch_one()
-            old_rows_count += int(res[0])
-
-            res = db.execute(sql_log).fetch_one()
-            old_rows_count += int(res[0])
+            cutoff = self.get_log_rotation_cutoff(db)
+            for table, column in LOG_TABLES.items():
+                res = db.execute(f"""SELECT EXISTS(
+                                        SELECT 1 FROM `gui_log`.`{table}`
+                                        WHERE `{column}` < ?);""",
+                                 (cutoff,)).fetch_one()
+                if res[0]:
+                    return True
         except Exception as e:  # pragma: no cover
             # TODO(rennox): Is this the right way to set the last error?
             db.set_last_error(e)
 
-        return old_rows_count > 0
+        return False
 
     def open_database(self):  # pragma: no cover
         raise NotImplementedError()
@@ -110,6 +145,88 @@ class BackendDbManager():
         raise NotImplementedError()
 
 
+class BackendDbPool():
+    """
+    Process wide pool of open sessions to the backend database.
+
+    The sessions are kept per thread, a session released by a thread is
+    handed out again to the next GuiBackendDb created on that thread. This
+    saves opening the database and attaching the log database on every
+    request and keeps the statement cache of the connection.
+    """
+    __instance = None
+
+    @staticmethod
+    def get_instance() -> 'BackendDbPool':
+        if BackendDbPool.__instance is None:
+            BackendDbPool()
+        return BackendDbPool.__instance
+
+    def __init__(self, max_idle=BACKEND_DB_POOL_IDLE_MAX):
+        if BackendDbPool.__instance is not None:
+            raise Exception(
+                "This class is a singleton, use get_instance function to get an instance.")
+        else:
+            BackendDbPool.__instance = self
+
+        self.max_idle = max_idle
+        self._local = threading.local()
+
+    def _get_idle_sessions(self):
+        # The (pool key, session) pairs of the idle sessions of the current
+        # thread, the most recently released last
+        if not hasattr(self._local, "sessions"):
+            self._local.sessions = []
+        return self._local.sessions
+
+    def acquire(self, db_manager):
+        """Returns an open session for the database of the given manager
+
+        Args:
+            db_manager (BackendDbManager): The manager of the database
+
+        Returns:
+            An idle session of the current thread or a new one
+        """
+        idle_sessions = self._get_idle_sessions()
+        key = db_manager.pool_key
+        for i in range(len(idle_sessions) - 1, -1, -1):
+            if idle_sessions[i][0] == key:
+                db = idle_sessions.pop(i)[1]
+                db.clear_stats()
+                return db
+
+        return db_manager.open_database()
+
+    def release(self, db_manager, db):
+        """Returns a session acquired from the pool
+
+        Any transaction left open is rolled back. If the thread has more
+        idle sessions than max_idle, the least recently released one is
+        closed, so a long-lived thread serving many web sessions does not
+        keep their sessions open.
+        """
+        idle_sessions = self._get_idle_sessions()
+        try:
+            if db.conn.in_transaction:
+                db.rollback()
+        except Exception as e:  # pragma: no cover
+            logger.exception(e)
+            db.close()
+            return
+
+        idle_sessions.append((db_manager.pool_key, db))
+        while len(idle_sessions) > self.max_idle:
+            idle_sessions.pop(0)[1].close()
+
+    def clear(self):
+        """Closes the idle sessions of the current thread"""
+        sessions = getattr(self._local, "sessions", [])
+        self._local.sessions = []
+        for _, db in sessions:
+            db.close()
+
+
 class BackendSqliteDbManager(BackendDbManager):
     """
     Implementation details for the backend database in Sqlite
@@ -140,7 +257,7 @@ class BackendSqliteDbManager(BackendDbManager):
 
     def open_database(self):
         session_id = "BackendDB-" + \
-            "anonymous" if self._session_uuid is None else self._session_uuid
+            ("anonymous" if self._session_uuid is None else self._session_uuid)
         return DbSessionFactory.create("Sqlite", session_id, False, self._connection_options,
                                        None, True, None, None, None, None, None)
 
@@ -318,10 +435,6 @@ class BackendSqliteDbManager(BackendDbManager):
         new_filename = pathlib.Path(self.db_dir,
                                     f"mysqlsh_gui_backend_log_{date.today().strftime('%Y.%m.%d')}.sqlite3")
 
-        # The backup was done for today already
-        if new_filename.exists():
-            return
-
         # check files, remove oldest if count > 6
         backup_files = []
         for f in listdir(self.db_dir):
@@ -336,43 +449,54 @@ class BackendSqliteDbManager(BackendDbManager):
             backup_files.remove(file_to_remove)
 
         try:
+            cutoff = self.get_log_rotation_cutoff(db)
+
             db.execute(
                 f"ATTACH DATABASE '{new_filename}' as 'backup';")
 
-            db.start_transaction()
-
-            # create tables and copy data
-            # from log and message to backup db
-            copy_sql = """CREATE TABLE `backup`.`log` AS
-                            SELECT *
-                            FROM `gui_log`.`log`
-                            WHERE date(`event_time`) < date('now')"""
-            db.execute(copy_sql)
-
-            copy_sql = """CREATE TABLE `backup`.`message` AS
-                            SELECT *
-                            FROM `gui_log`.`message`
-                            WHERE date(`sent`) < date('now')"""
-            db.execute(copy_sql)
-
-            # delete old logs and messages
-            delete_sql = """DELETE FROM `gui_log`.`log`
-                            WHERE date(`event_time`) < date('now')"""
-            db.execute(delete_sql)
-
-            delete_sql = """DELETE FROM `gui_log`.`message`
-                            WHERE date(`sent`) < date('now')"""
-            db.execute(delete_sql)
-            db.commit()
-
-            # detach backup db. can not detach inside a transaction.
-            db.execute(f"DETACH DATABASE 'backup';")
+            try:
+                # Old rows are moved to the backup db in batches, each batch
+                # in its own transaction, so the log tables are not locked
+                # for the whole rotation. A rotation that was interrupted is
+                # resumed into the backup db of the day.
+                for table, column in LOG_TABLES.items():
+                    db.execute(f"""CREATE TABLE IF NOT EXISTS `backup`.`{table}` AS
+                                    SELECT *
+                                    FROM `gui_log`.`{table}`
+                                    WHERE 0""")
+
+                    while True:
+                        res = db.execute(f"""SELECT MAX(`id`) FROM (
+                                                SELECT `id`
+                                                FROM `gui_log`.`{table}`
+                                                WHERE `{column}` < ?
+                                                ORDER BY `id`
+                                                LIMIT ?)""",
+                                         (cutoff, LOG_ROTATION_BATCH_SIZE)).fetch_one()
+                        last_id = res[0]
+                        if last_id is None:
+                            break
+
+                        db.start_transaction()
+                        db.execute(f"""INSERT INTO `backup`.`{table}`
+                                        SELECT *
+                                        FROM `gui_log`.`{table}`
+                                        WHERE `{column}` < ? AND `id` <= ?""",
+                                   (cutoff, last_id))
+                        db.execute(f"""DELETE FROM `gui_log`.`{table}`
+                                        WHERE `{column}` < ? AND `id` <= ?""",
+                                   (cutoff, last_id))
+                        db.commit()
+            finally:
+                # detach backup db. can not detach inside a transaction.
+                if db.conn.in_transaction:
+                    db.rollback()
+                db.execute(f"DETACH DATABASE 'backup';")
 
         except Exception as e:  # pragma: no cover
             logger.error(f"Exception caught during log backup: {e}")
             # TODO(rennox): Is this the right way to set the last error?
             db.set_last_error(e)
-            db.rollback()
 
     def remove_db_file(self, path):
         self.remove_wal_and_shm_files(path)
@@ -22,14 +22,261 @@
 # 51 Franklin St, Fifth Floor, Boston, MA 02110-1301 USA
 
 import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import contextmanager
 from threading import Event, Thread
 
 import mysqlsh
 
+import gui_plugin.core.Logger as logger
 from gui_plugin.core.Protocols import Response
 
+# The maximum number of threads executing requests, not counting the threads
+# of requests blocked waiting, e.g. for the reply to a prompt
+REQUEST_WORKERS_MAX = 32
 
-class RequestHandler(Thread):
+# The maximum number of requests of a web session executed at the same time,
+# including the blocked ones
+REQUEST_WORKERS_PER_SESSION_MAX = 8
+
+# The maximum number of requests of a web session waiting for a worker
+REQUEST_QUEUE_DEPTH_MAX = 256
+
+# The number of seconds an idle worker waits for a request before it exits
+REQUEST_WORKER_IDLE_TIMEOUT = 60
+
+
+class RequestWorker(Thread):
+    """
+    A thread of the RequestWorkerPool executing one request after another.
+
+    The shell context created for the print and prompt delegates is kept for
+    the next request as long as the requests come from the same web session,
+    the delegates forward to the request currently executed by the worker.
+    """
+
+    def __init__(self, pool):
+        super().__init__(daemon=True)
+        self._pool = pool
+        self._shell_ctx = None
+        self._shell_ctx_session = None
+        self.request = None
+
+    def get_context(self):
+        return self.request.get_context() if self.request else None
+
+    def get_shell_context(self, web_session):
+        if self._shell_ctx is not None and self._shell_ctx_session != web_session:
+            self._shell_ctx.finalize()
+            self._shell_ctx = None
+
+        if self._shell_ctx is None:
+            shell = mysqlsh.globals.shell
+
+            self._shell_ctx = shell.create_context({"printDelegate": lambda x: self.request.on_shell_print(x),
+                                                    "diagDelegate": lambda x: self.request.on_shell_print_diag(x),
+                                                    "errorDelegate": lambda x: self.request.on_shell_print_error(x),
+                                                    "promptDelegate": lambda x, y: self.request.on_shell_prompt(x, y), })
+            self._shell_ctx_session = web_session
+
+        return self._shell_ctx
+
+    def run(self):
+        try:
+            while True:
+                request = self._pool.next_request(self)
+                if request is None:
+                    break
+
+                self.request = request
+                try:
+                    request.run()
+                except Exception as e:  # pragma: no cover
+                    logger.exception(e)
+                finally:
+                    self.request = None
+                    self._pool.finish(request)
+        finally:
+            if self._shell_ctx is not None:
+                self._shell_ctx.finalize()
+
+
+class RequestWorkerPool():
+    """
+    Bounded pool of RequestWorker threads.
+
+    Requests are queued per web session and the sessions are served round
+    robin, so a burst of requests of one session does not delay the requests
+    of other sessions by more than one request per session. A session has at
+    most max_session_workers requests executing at the same time.
+
+    A request waiting for something outside of the pool, like the reply to a
+    prompt, does so in a blocked() section. Blocked requests do not count
+    against max_workers, so other requests are not held up by them.
+    """
+    __instance = None
+
+    @staticmethod
+    def get_instance() -> 'RequestWorkerPool':
+        if RequestWorkerPool.__instance is None:
+            RequestWorkerPool()
+        return RequestWorkerPool.__instance
+
+    def __init__(self, max_workers=REQUEST_WORKERS_MAX,
+                 max_queue_depth=REQUEST_QUEUE_DEPTH_MAX,
+                 idle_timeout=REQUEST_WORKER_IDLE_TIMEOUT,
+                 max_session_workers=REQUEST_WORKERS_PER_SESSION_MAX):
+        if RequestWorkerPool.__instance is not None:
+            raise Exception(
+                "This class is a singleton, use get_instance function to get an instance.")
+        else:
+            RequestWorkerPool.__instance = self
+
+        self.max_workers = max_workers
+        self.max_queue_depth = max_queue_depth
+        self.idle_timeout = idle_timeout
+        self.max_session_workers = max_session_workers
+        self._condition = threading.Condition()
+        self._queues = OrderedDict()
+        self._queued = 0
+        self._running = {}
+        self._workers = []
+        self._idle = 0
+        self._blocked = 0
+        self._metrics = {
+            "requests": 0,
+            "rejected": 0,
+            "wait_time_total": 0.0,
+            "wait_time_max": 0.0,
+            "run_time_total": 0.0,
+            "run_time_max": 0.0,
+        }
+
+    def submit(self, request, web_session):
+        with self._condition:
+            queue = self._queues.get(web_session)
+            if queue is None:
+                queue = self._queues[web_session] = deque()
+
+            if len(queue) >= self.max_queue_depth:
+                self._metrics["rejected"] += 1
+                raise Exception(f'Too many requests are pending for this '
+                                f'session, the request was not executed.')
+
+            request.queued_time = time.monotonic()
+            request.pool_session = web_session
+            queue.append(request)
+            self._queued += 1
+
+            self._start_worker()
+            self._condition.notify()
+
+    def _start_worker(self):
+        # Must be called holding the condition
+        if self._queued > self._idle and \
+                len(self._workers) - self._blocked < self.max_workers:
+            worker = RequestWorker(self)
+            self._workers.append(worker)
+            worker.start()
+
+    def _next_session(self):
+        # The first session in line that may execute another request
+        for web_session in self._queues:
+            if self._running.get(web_session, 0) < self.max_session_workers:
+                return web_session
+        return None
+
+    def next_request(self, worker):
+        with self._condition:
+            self._idle += 1
+            try:
+                while True:
+                    # Blocked requests that resumed may have left more
+                    # workers than allowed
+                    if len(self._workers) - self._blocked > self.max_workers:
+                        self._workers.remove(worker)
+                        return None
+
+                    web_session = self._next_session()
+                    if web_session is not None:
+                        break
+
+                    if not self._condition.wait(self.idle_timeout) and \
+                            self._next_session() is None:
+                        self._workers.remove(worker)
+                        return None
+
+                # Take the next request of the session and move the session
+                # to the end of the line
+                queue = self._queues.pop(web_session)
+                request = queue.popleft()
+                if queue:
+                    self._queues[web_session] = queue
+                self._queued -= 1
+                self._running[web_session] = self._running.get(web_session, 0) + 1
+
+                return request
+            finally:
+                self._idle -= 1
+
+    def finish(self, request):
+        """Called by the worker once the request was executed"""
+        with self._condition:
+            web_session = request.pool_session
+            self._running[web_session] -= 1
+            if self._running[web_session] == 0:
+                del self._running[web_session]
+
+            # Requests of the session might wait for this one to finish
+            self._condition.notify()
+
+    @contextmanager
+    def blocked(self):
+        """Marks the request of the current worker as blocked waiting
+
+        Another worker is started if requests are queued, so the pool keeps
+        executing requests while this one waits.
+        """
+        with self._condition:
+            self._blocked += 1
+            self._start_worker()
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._blocked -= 1
+
+    def record(self, wait_time, run_time):
+        with self._condition:
+            metrics = self._metrics
+            metrics["requests"] += 1
+            metrics["wait_time_total"] += wait_time
+            metrics["wait_time_max"] = max(metrics["wait_time_max"], wait_time)
+            metrics["run_time_total"] += run_time
+            metrics["run_time_max"] = max(metrics["run_time_max"], run_time)
+
+    def get_metrics(self):
+        """Returns the request metrics of the pool
+
+        Wait time is the time between a request being queued and its
+        execution being started, run time the time of the execution.
+        """
+        with self._condition:
+            metrics = dict(self._metrics)
+            metrics["workers"] = len(self._workers)
+            metrics["idle_workers"] = self._idle
+            metrics["blocked_workers"] = self._blocked
+            metrics["queued"] = self._queued
+
+        requests = metrics["requests"]
+        metrics["wait_time_avg"] = metrics["wait_time_total"] / requests if requests else 0.0
+        metrics["run_time_avg"] = metrics["run_time_total"] / requests if requests else 0.0
+
+        return metrics
+
+
+class RequestHandler():
     """
     This class will handle web requests to execute a specific API on the shell
     out of the context of either:
@@ -38,7 +285,8 @@ class RequestHandler(Thread):
     - A Shell Module Session
 
     This handler is meant for operations to be executed on the Shell instance
-    running the Web Server.
+    running the Web Server. The requests are executed by the threads of the
+    RequestWorkerPool.
 
     This handler adds the following features:
 
@@ -48,7 +296,6 @@ class RequestHandler(Thread):
     """
 
     def __init__(self, request_id, func, kwargs, web_handler, lock_session=False):
-        super().__init__()
         self._request_id = request_id
         self._func = func
         self._kwargs = kwargs
@@ -56,6 +303,8 @@ class RequestHandler(Thread):
         self._text_cache = None
         self._thread_context = None
         self._lock_session = lock_session
+        self.queued_time = None
+        self.pool_session = None
 
         # Prompt handling members
         self._prompt_event = None
@@ -110,7 +359,8 @@ class RequestHandler(Thread):
         self.web_handler.send_prompt_response(
             self.request_id, options, self)
 
-        self._prompt_event.wait()
+        with RequestWorkerPool.get_instance().blocked():
+            self._prompt_event.wait()
         self._prompt_event.clear()
 
         return [self._prompt_replied, self._prompt_reply]
@@ -133,27 +383,37 @@ class RequestHandler(Thread):
         self._prompt_reply = reply['reply']
         self._prompt_event.set()
 
+    def start(self):
+        """
+        Queues the request to be executed by the RequestWorkerPool.
+        """
+        RequestWorkerPool.get_instance().submit(
+            self, getattr(self._web_handler, "session_uuid", None))
+
     def run(self):
         """
-        Thread function to setup the shell callbacks for print and prompt
-        functions.
+        Executes the request on the current RequestWorker, using its shell
+        context for the print and prompt callbacks.
         """
+        start_time = time.monotonic()
+
         self._thread_context = threading.local()
         self._thread_context.request_id = self._request_id
         self._thread_context.web_handler = self._web_handler
         self._prompt_event = Event()
 
-        shell = mysqlsh.globals.shell
-
-        self._shell_ctx = shell.create_context({"printDelegate": lambda x: self.on_shell_print(x),
-                                                "diagDelegate": lambda x: self.on_shell_print_diag(x),
-                                                "errorDelegate": lambda x: self.on_shell_print_error(x),
-                                                "promptDelegate": lambda x, y: self.on_shell_prompt(x, y), })
+        worker = threading.current_thread()
+        self._shell_ctx = worker.get_shell_context(
+            getattr(self._web_handler, "session_uuid", None))
         self._shell = self._shell_ctx.get_shell()
 
-        self._do_execute()
-
-        self._shell_ctx.finalize()
+        try:
+            self._do_execute()
+        finally:
+            end_time = time.monotonic()
+            RequestWorkerPool.get_instance().record(
+                start_time - (self.queued_time or start_time),
+                end_time - start_time)
 
     def _do_execute(self):
         result = None
@@ -162,12 +422,14 @@ class RequestHandler(Thread):
                 # The session will be used by an external (non GUI) plugin,
                 # the session needs to be locked and it needs to notify a task
                 # will begin execution
-                self._kwargs["session"].lock()
+                with RequestWorkerPool.get_instance().blocked():
+                    self._kwargs["session"].lock()
                 self._kwargs["session"].notify_task_execution_state(
                     None, "started")
             result = self._func(**self._kwargs)
             if hasattr(self._thread_context, "completion_event"):
-                self._thread_context.completion_event.wait()
+                with RequestWorkerPool.get_instance().blocked():
+                    self._thread_context.completion_event.wait()
         except Exception as e:
             result = Response.exception(e)
         finally:
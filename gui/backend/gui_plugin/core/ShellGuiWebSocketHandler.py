@@ -24,7 +24,6 @@
 import base64
 import datetime
 import hashlib
-import inspect
 import json
 import re
 import sys
@@ -33,12 +32,11 @@ import uuid
 from contextlib import contextmanager
 from queue import Empty, Queue
 
-import mysqlsh
-
 import gui_plugin as gui
 import gui_plugin.core.Logger as logger
 import gui_plugin.core.WebSocketCommon as WebSocket
 from gui_plugin.core.BackendDbLogger import BackendDbLogger
+from gui_plugin.core.CommandRegistry import CommandRegistry
 from gui_plugin.core.Db import GuiBackendDb
 from gui_plugin.core.dbms.DbMySQLSession import DbSession
 from gui_plugin.core.HTTPWebSocketsHandler import HTTPWebSocketsHandler
@@ -68,6 +66,8 @@ class ShellGuiWebSocketHandler(HTTPWebSocketsHandler):
         self._module_sessions = {}
         self._requests = {}
         self._requests_mutex = threading.Lock()
+        # The user id and the compiled access pattern of its privileges
+        self._command_privilege = (None, None)
         self.key = None
         self.packets = {}
 
@@ -100,6 +100,7 @@ class ShellGuiWebSocketHandler(HTTPWebSocketsHandler):
         elif request == 'logout':
             if self.is_authenticated:
                 self._session_user_id = None
+                self._command_privilege = (None, None)
                 self.send_response_message('OK',
                                            f'User successfully logged out.',
                                            json_message.get('request_id'))
@@ -497,6 +498,9 @@ class ShellGuiWebSocketHandler(HTTPWebSocketsHandler):
                         'sha256', json_msg['password'].encode(), salt.encode(), 100000).hex()
 
                 if self.is_local_session or row[1] == password_hash + salt:
+                    # The privileges are read again for the new login
+                    self._command_privilege = (None, None)
+
                     with self.db_tx() as db:
                         db.execute('UPDATE session SET user_id=? WHERE uuid=?',
                                    (row['id'], self.session_uuid))
@@ -549,28 +553,13 @@ class ShellGuiWebSocketHandler(HTTPWebSocketsHandler):
                     'No command given. Please provide the command.')
 
             # Check if user is allowed to execute this command
-            allowed = False
-            res = self.db.execute(
-                '''SELECT p.name, p.access_pattern
-                FROM privilege p
-                    INNER JOIN role_has_privilege r_p
-                        ON p.id = r_p.privilege_id
-                    INNER JOIN user_has_role u_r
-                        ON r_p.role_id = u_r.role_id
-                WHERE u_r.user_id = ? AND p.privilege_type_id = 1''',
-                (self.session_user_id,)).fetch_all()
-            for row in res:
-                p = re.compile(row[1])
-                m = p.match(cmd)
-                if not m:
-                    raise Exception(f'This user account has no privileges to '
-                                    f'execute the command {cmd}')
-                allowed = True
-                break
-
-            if not allowed:
+            pattern = self.get_command_privilege_pattern()
+            if pattern is None:
                 raise Exception(f'This user does not have the necessary '
                                 f'privileges to execute the command {cmd}.')
+            if not pattern.match(cmd):
+                raise Exception(f'This user account has no privileges to '
+                                f'execute the command {cmd}')
 
             # Argument need to be passed in a dict using the argument names as
             # the keys
@@ -579,70 +568,17 @@ class ShellGuiWebSocketHandler(HTTPWebSocketsHandler):
 
             kwargs = {**args, **kwargs}
 
-            # Inspect the function arguments and check if there are arguments
-            # named user_id, profile_id, web_session, request_id,
-            # module_session, async_web_session or session.
+            # Look up the function to call and its arguments. Check if there
+            # are arguments named user_id, profile_id, web_session,
+            # request_id, module_session, async_web_session or session.
             # If so, replace them with session variables
-            f_args = []
-
-            # Loop over all chained objects/functions of the given cmd and find
-            # the function to call
-            matches = re.findall(r'(\w+)\.', cmd + '.')
-            parent_obj = None
-            func = None
-
-            if len(matches) < 2:
-                raise Exception(
-                    f"The command '{cmd}' is using wrong format. "
-                    "Use <global>[.<object>]*.<function>")
-
-            # Last entry is a function name
-            function_name = matches[-1]
-
-            # Rest is a chain of objects
-            objects = matches[:-1]
-
-            found_objects = []
-
-            # Selects the parent object
-            if objects[0] == 'gui':
-                parent_obj = gui
-                objects = objects[1:]
-                found_objects.append('gui')
-            else:
-                parent_obj = mysqlsh.globals
-
-            # Searches the object hierarchy
-            for object in objects:
-                try:
-                    child = getattr(parent_obj, object)
-
-                    # Set the parent_obj for the next object evaluation
-                    parent_obj = child
-                    found_objects.append(object)
-                except:
-                    if len(found_objects) == 0:
-                        raise Exception(
-                            f"The '{object}' global object does not exist")
-                    else:
-                        raise Exception(
-                            f"Object '{'.'.join(found_objects)}' has no member named '{object}'")
-
-            # Searches the target function
-            try:
-                func = getattr(parent_obj, function_name)
-            except:
-                raise Exception(
-                    f"Object '{'.'.join(found_objects)}' has no member function named '{function_name}'")
-
-            f_args = {}
-            if func:
-                f_args = self.get_function_arguments(
-                    func=func, mod=parent_obj, mod_cmd=function_name)
+            command = CommandRegistry.get_instance().get(cmd)
+            func = command.func
+            f_args = command.f_args
 
             lock_session = False
 
-            if found_objects[0] == 'gui':
+            if command.is_gui:
                 # This is the `user_id` that needs to be provided by the user
                 # like for the function `add_profile(user_id, profile)`
                 if "user_id" in f_args:
@@ -721,7 +657,7 @@ class ShellGuiWebSocketHandler(HTTPWebSocketsHandler):
                 # The plugins written for the Shell that work with standard Shell session fall on this branch,
                 # the session must be locked while the function is executed to avoid race conditions that may
                 # lead to shell failures
-                if found_objects[0] != 'gui':
+                if not command.is_gui:
                     lock_session = True
 
                 del kwargs['module_session_id']
@@ -752,36 +688,29 @@ class ShellGuiWebSocketHandler(HTTPWebSocketsHandler):
         if result is not None:
             self.send_command_response(request_id, result)
 
-    def get_function_arguments(self, func, mod, mod_cmd):
-        try:
-            # try to use the regular inspection function to get the function
-            # arguments
-            sig = inspect.signature(func)
-            f_args = [p.name for p in sig.parameters.values()]
-        except:  # pragma: no cover
-            # if that fails, fall back to parsing the help output of that
-            # function
-            help_func = getattr(mod, 'help')
-            help_output = help_func(f'{mod_cmd}')
-
-            match = re.match(r'(.|\s)*?SYNTAX(.|\s)*?\(([\w,\[\]\s]*)',
-                             help_output, flags=re.MULTILINE)
-            arguments = match[3].replace('[', '').replace(']', '').\
-                replace('\n', '').replace(' ', '')
-
-            f_args = arguments.split(",")
-
-            # Include the kwargs
-            if 'kwargs' in f_args:
-                f_args.remove('kwargs')
-                desc_idx = help_output.find(
-                    'The kwargs parameter accepts the following options:')
-                desc = help_output[desc_idx + 53:]
-                matches = re.findall(r'-\s(\w*)\:', desc, flags=re.MULTILINE)
-                for match in matches:
-                    f_args.append(match)
-
-        return f_args
+    def get_command_privilege_pattern(self):
+        """Returns the compiled access pattern for commands of the session user
+
+        The privileges are queried and compiled once per login, the cache is
+        reset when the session logs out or a user is authenticated.
+        """
+        user_id, pattern = self._command_privilege
+        if user_id != self.session_user_id or user_id is None:
+            res = self.db.execute(
+                '''SELECT p.name, p.access_pattern
+                FROM privilege p
+                    INNER JOIN role_has_privilege r_p
+                        ON p.id = r_p.privilege_id
+                    INNER JOIN user_has_role u_r
+                        ON r_p.role_id = u_r.role_id
+                WHERE u_r.user_id = ? AND p.privilege_type_id = 1''',
+                (self.session_user_id,)).fetch_all()
+
+            # As before, the first privilege found decides
+            pattern = re.compile(res[0][1]) if res else None
+            self._command_privilege = (self.session_user_id, pattern)
+
+        return pattern
 
     def register_module_session(self, module_session):
         self._module_sessions[module_session.module_session_id] = module_session
@@ -511,6 +511,7 @@ CREATE TABLE IF NOT EXISTS `logs`.`log` (
   `event_type` VARCHAR(45) NULL,
   `message` TEXT NULL,
   PRIMARY KEY (`id`),
+  INDEX `log_event_time_idx` (`event_time` ASC) VISIBLE,
   CONSTRAINT `fk_log_user1`
     FOREIGN KEY (`user_id`)
     REFERENCES `user` (`id`)
@@ -537,6 +538,7 @@ CREATE TABLE IF NOT EXISTS `logs`.`message` (
   `message` TEXT NULL,
   `sent` DATETIME NULL,
   PRIMARY KEY (`id`),
+  INDEX `message_sent_idx` (`sent` ASC) VISIBLE,
   CONSTRAINT `fk_message_session1`
     FOREIGN KEY (`session_id`)
     REFERENCES `session` (`id`)
@@ -549,7 +551,7 @@ ENGINE = InnoDB;
 -- View `schema_version`
 -- -----------------------------------------------------
 DROP VIEW IF EXISTS `schema_version` ;
-CREATE VIEW schema_version (major, minor, patch) AS SELECT 0, 0, 16;
+CREATE VIEW schema_version (major, minor, patch) AS SELECT 0, 0, 17;
 
 -- -----------------------------------------------------
 -- Data for table `data_category`
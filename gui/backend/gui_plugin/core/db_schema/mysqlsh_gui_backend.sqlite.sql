@@ -574,6 +574,8 @@ CREATE TABLE IF NOT EXISTS `logs`.`log` (
     ON DELETE NO ACTION
     ON UPDATE NO ACTION);
 
+CREATE INDEX `logs`.`log_event_time_idx` ON `log` (`event_time` ASC);
+
 
 -- -----------------------------------------------------
 -- Table `message`
@@ -594,12 +596,14 @@ CREATE TABLE IF NOT EXISTS `logs`.`message` (
     ON DELETE NO ACTION
     ON UPDATE NO ACTION);
 
+CREATE INDEX `logs`.`message_sent_idx` ON `message` (`sent` ASC);
+
 
 -- -----------------------------------------------------
 -- View `schema_version`
 -- -----------------------------------------------------
 DROP VIEW IF EXISTS `schema_version` ;
-CREATE VIEW schema_version (major, minor, patch) AS SELECT 0, 0, 16;
+CREATE VIEW schema_version (major, minor, patch) AS SELECT 0, 0, 17;
 
 -- -----------------------------------------------------
 -- Data for table `data_category`
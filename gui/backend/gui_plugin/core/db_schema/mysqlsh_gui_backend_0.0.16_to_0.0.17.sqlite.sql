@@ -0,0 +1,86 @@
+/*
+ * Copyright (c) 2024, Oracle and/or its affiliates.
+ *
+ * This program is free software; you can redistribute it and/or modify
+ * it under the terms of the GNU General Public License, version 2.0,
+ * as published by the Free Software Foundation.
+ *
+ * This program is designed to work with certain software (including
+ * but not limited to OpenSSL) that is licensed under separate terms, as
+ * designated in a particular file or component or in included license
+ * documentation.  The authors of MySQL hereby grant you an additional
+ * permission to link the program and your derivative works with the
+ * separately licensed software that they have either included with
+ * the program or referenced in the documentation.
+ *
+ * This program is distributed in the hope that it will be useful,  but
+ * WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See
+ * the GNU General Public License, version 2.0, for more details.
+ *
+ * You should have received a copy of the GNU General Public License
+ * along with this program; if not, write to the Free Software Foundation, Inc.,
+ * 51 Franklin St, Fifth Floor, Boston, MA 02110-1301 USA
+ */
+
+
+PRAGMA foreign_keys = OFF;
+
+-- -----------------------------------------------------
+-- Schema gui_backend_log
+-- -----------------------------------------------------
+ATTACH DATABASE 'mysqlsh_gui_backend_log.sqlite3' as logs;
+
+-- -----------------------------------------------------
+-- Table `log`
+-- -----------------------------------------------------
+CREATE TABLE IF NOT EXISTS `logs`.`log` (
+  `id` INTEGER NOT NULL,
+  `session_id` INTEGER NULL,
+  `user_id` INTEGER NULL,
+  `event_time` DATETIME NULL,
+  `event_type` VARCHAR(45) NULL,
+  `message` TEXT NULL,
+  PRIMARY KEY (`id`),
+  CONSTRAINT `fk_log_user1`
+    FOREIGN KEY (`user_id`)
+    REFERENCES `user` (`id`)
+    ON DELETE NO ACTION
+    ON UPDATE NO ACTION,
+  CONSTRAINT `fk_log_session1`
+    FOREIGN KEY (`session_id`)
+    REFERENCES `session` (`id`)
+    ON DELETE NO ACTION
+    ON UPDATE NO ACTION);
+
+CREATE INDEX IF NOT EXISTS `logs`.`log_event_time_idx` ON `log` (`event_time` ASC);
+
+-- -----------------------------------------------------
+-- Table `message`
+-- -----------------------------------------------------
+CREATE TABLE IF NOT EXISTS `logs`.`message` (
+  `id` INTEGER NOT NULL,
+  `session_id` INTEGER NOT NULL,
+  `request_id` BLOB(16) NULL,
+  `is_response` TINYINT NULL,
+  `message` TEXT NULL,
+  `sent` DATETIME NULL,
+  PRIMARY KEY (`id`),
+  CONSTRAINT `fk_message_session1`
+    FOREIGN KEY (`session_id`)
+    REFERENCES `session` (`id`)
+    ON DELETE NO ACTION
+    ON UPDATE NO ACTION);
+
+CREATE INDEX IF NOT EXISTS `logs`.`message_sent_idx` ON `message` (`sent` ASC);
+
+DETACH DATABASE logs;
+
+-- -----------------------------------------------------
+-- View `schema_version`
+-- -----------------------------------------------------
+DROP VIEW IF EXISTS `schema_version` ;
+CREATE VIEW schema_version (major, minor, patch) AS SELECT 0, 0, 17;
+
+
+PRAGMA foreign_keys = ON;
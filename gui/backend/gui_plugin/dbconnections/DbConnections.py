@@ -22,16 +22,19 @@
 # 51 Franklin St, Fifth Floor, Boston, MA 02110-1301 USA
 
 import json
+import os
 
 from mysqlsh.plugin_manager import \
     plugin_function  # pylint: disable=no-name-in-module
 
 import gui_plugin.core.Error as Error
 from gui_plugin.core.backenddb import dbconnections
+from gui_plugin.core.Context import get_context
 from gui_plugin.core.Db import BackendDatabase, BackendTransaction
 from gui_plugin.core.dbms import DbSessionFactory
 from gui_plugin.core.Error import MSGException
 from gui_plugin.core.modules.DbModuleSession import DbModuleSession
+from . import backend
 
 
 @plugin_function('gui.dbconnections.addDbConnection', shell=False, web=True)
@@ -320,6 +323,92 @@ def test_connection(connection, password=None):
         new_session.close()
 
 
+def get_sqlite_file_path(path, web_handler):
+    """Resolves the database file of a Sqlite connection the way
+    DbModuleSession does, returns None if it must not be accessed."""
+    if os.path.isabs(path):
+        if web_handler is not None and not web_handler.is_local_session:
+            return None
+        return path
+
+    if web_handler is None:
+        return None
+
+    import mysqlsh
+
+    user_dir = os.path.abspath(mysqlsh.plugin_manager.general.get_shell_user_dir(
+        'plugin_data', 'gui_plugin', f'user_{web_handler.session_user_id}'))
+    path = os.path.abspath(os.path.join(user_dir, path))
+
+    return path if path.startswith(user_dir) else None
+
+
+@plugin_function('gui.dbconnections.checkConnections', shell=False, web=True)
+def check_connections(connection_ids, max_parallel=backend.HEALTH_CHECK_MAX_PARALLEL,
+                      timeout=backend.HEALTH_CHECK_TIMEOUT, send_gui_message=None, be_session=None):
+    """Checks concurrently which of the given db_connections are reachable
+
+    Only the network (or file) level is checked, no session is opened. The
+    result of each connection is sent as a PENDING response as soon as it
+    is known.
+
+    Args:
+        connection_ids (list): The ids of the db_connections
+        max_parallel (int): The number of connections checked at the same time
+        timeout (int): The seconds the check of a single connection may take
+        send_gui_message (object): The function to send a message to he GUI.
+        be_session (object):  A session to the GUI backend database
+            where the operation will be performed.
+
+    Returns:
+        list: The id, status (REACHABLE, UNREACHABLE or UNKNOWN), message
+            and seconds of each connection
+    """
+    results = {}
+
+    def status_fn(result):
+        results[result["id"]] = result
+        if send_gui_message is not None:
+            send_gui_message("data", result)
+
+    def not_checked(id, message):
+        status_fn({"id": id, "status": backend.UNKNOWN,
+                   "message": message, "seconds": 0})
+
+    if not connection_ids:
+        return []
+
+    with BackendDatabase(be_session) as db:
+        rows = db.select(f"""SELECT id, db_type, options FROM db_connection
+            WHERE id IN ({",".join("?" * len(connection_ids))})""",
+                         tuple(connection_ids), as_tuples=True)
+
+    context = get_context()
+    web_handler = context.web_handler if context else None
+
+    connections = []
+    for id, db_type, options in rows:
+        if not isinstance(options, dict):
+            not_checked(id, "The connection options are invalid.")
+            continue
+        if db_type == "Sqlite":
+            path = get_sqlite_file_path(options.get("db_file", ""), web_handler)
+            if path is None:
+                not_checked(id, "The database file cannot be accessed.")
+                continue
+            options = {**options, "db_file": path}
+        connections.append((id, db_type, options))
+
+    found = {row[0] for row in rows}
+    for id in connection_ids:
+        if id not in found:
+            not_checked(id, f"There is no db_connection with the id {id}.")
+
+    backend.check_connections(connections, status_fn, max_parallel, timeout)
+
+    return [results[id] for id in connection_ids]
+
+
 @plugin_function('gui.dbconnections.moveConnection', shell=False, web=True)
 def move_connection(profile_id, folder_path, connection_id_to_move, connection_id_offset, before=False, be_session=None):
     """Updates the connections sort order for the given profile
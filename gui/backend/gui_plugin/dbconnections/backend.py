@@ -0,0 +1,211 @@
+# Copyright (c) 2024, Oracle and/or its affiliates.
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License, version 2.0,
+# as published by the Free Software Foundation.
+#
+# This program is designed to work with certain software (including
+# but not limited to OpenSSL) that is licensed under separate terms, as
+# designated in a particular file or component or in included license
+# documentation.  The authors of MySQL hereby grant you an additional
+# permission to link the program and your derivative works with the
+# separately licensed software that they have either included with
+# the program or referenced in the documentation.
+#
+# This program is distributed in the hope that it will be useful,  but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See
+# the GNU General Public License, version 2.0, for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software Foundation, Inc.,
+# 51 Franklin St, Fifth Floor, Boston, MA 02110-1301 USA
+
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import concurrent.futures
+import os
+import socket
+import time
+
+# The number of connections checked at the same time
+HEALTH_CHECK_MAX_PARALLEL = 16
+
+# The seconds a single connection check may take
+HEALTH_CHECK_TIMEOUT = 5
+
+DEFAULT_PORTS = {"mysql": 3306, "mysqlx": 33060}
+SSH_DEFAULT_PORT = 22
+
+REACHABLE = "REACHABLE"
+UNREACHABLE = "UNREACHABLE"
+UNKNOWN = "UNKNOWN"
+
+# socket.getaddrinfo() has no timeout, so the names are resolved on these
+# threads while the check waits for at most its remaining time
+_resolver = ThreadPoolExecutor(max_workers=HEALTH_CHECK_MAX_PARALLEL,
+                               thread_name_prefix="ConnectionCheckResolver")
+
+
+def get_probe_address(db_type, options):
+    """Returns the address to probe to see whether a connection is reachable.
+
+    Connections through an SSH tunnel are probed at the SSH host, as that is
+    the only hop the shell connects to directly.
+
+    Args:
+        db_type (str): The db type name
+        options (dict): The connection options, with the absolute path of
+            the database file for Sqlite
+
+    Returns:
+        A tuple of the address family and the address, None if the
+        connection cannot be probed without opening it, e.g. when going
+        through an OCI bastion.
+    """
+    if db_type == "Sqlite":
+        return ("file", options.get("db_file", ""))
+
+    if "mysql-db-system-id" in options:
+        return None
+
+    if "ssh" in options:
+        # user@host[:port]
+        host = options["ssh"].rsplit("@", 1)[-1]
+        port = SSH_DEFAULT_PORT
+        if host.startswith("["):
+            host, _, rest = host[1:].partition("]")
+            if rest.startswith(":"):
+                port = int(rest[1:])
+        elif host.count(":") == 1:
+            host, port = host.split(":")
+            port = int(port)
+        return ("tcp", (host, port))
+
+    if options.get("socket") and hasattr(socket, "AF_UNIX"):
+        return ("unix", options["socket"])
+
+    port = options.get("port") or DEFAULT_PORTS.get(
+        options.get("scheme"), DEFAULT_PORTS["mysql"])
+    return ("tcp", (options.get("host") or "localhost", int(port)))
+
+
+def probe_address(family, address, timeout):
+    """Checks whether something accepts connections at the given address.
+
+    Args:
+        family (str): ['tcp'|'unix'|'file']
+        address (object): The (host, port) tuple or the path
+        timeout (float): The seconds the whole check may take, including
+            the name resolution and trying every resolved address
+
+    Returns:
+        None if the address is reachable, the error message otherwise
+    """
+    if family == "file":
+        return None if os.path.isfile(address) else \
+            f"The database file {address} does not exist."
+
+    deadline = time.monotonic() + timeout
+    if family == "unix":
+        addresses = [(socket.AF_UNIX, socket.SOCK_STREAM, 0, "", address)]
+    else:
+        resolving = _resolver.submit(
+            socket.getaddrinfo, address[0], address[1],
+            type=socket.SOCK_STREAM)
+        try:
+            addresses = resolving.result(
+                timeout=max(0, deadline - time.monotonic()))
+        except concurrent.futures.TimeoutError:
+            resolving.cancel()
+            return (f"Timed out after {timeout} seconds resolving host "
+                    f"{address[0]}.")
+        except OSError as e:
+            return f"Cannot resolve host {address[0]}: {e}"
+
+    error = None
+    for af, sock_type, proto, _, sock_address in addresses:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return error or f"Timed out after {timeout} seconds."
+
+        try:
+            with socket.socket(af, sock_type, proto) as sock:
+                sock.settimeout(remaining)
+                sock.connect(sock_address)
+            return None
+        except socket.timeout:
+            error = f"Timed out after {timeout} seconds."
+        except OSError as e:
+            error = str(e)
+
+    return error
+
+
+def check_connection(db_type, options, timeout=HEALTH_CHECK_TIMEOUT):
+    """Checks whether a db_connection is reachable.
+
+    Only the network (or file) level is checked, no session is opened, so
+    no credentials are needed and no prompts can show up.
+
+    Args:
+        db_type (str): The db type name
+        options (dict): The connection options
+        timeout (float): The seconds the check may take
+
+    Returns:
+        A dict with the status, the message and the seconds it took.
+    """
+    start = time.monotonic()
+    probe = get_probe_address(db_type, options)
+    if probe is None:
+        status = UNKNOWN
+        message = "The connection cannot be checked without opening it."
+    else:
+        message = probe_address(*probe, timeout)
+        status = UNREACHABLE if message else REACHABLE
+
+    return {"status": status,
+            "message": message or "",
+            "seconds": round(time.monotonic() - start, 3)}
+
+
+def check_connections(connections, status_fn=None,
+                      max_parallel=HEALTH_CHECK_MAX_PARALLEL,
+                      timeout=HEALTH_CHECK_TIMEOUT):
+    """Checks several db_connections concurrently.
+
+    The status_fn is called from the calling thread as each check
+    completes, so the results can be streamed in the order they are known.
+
+    Args:
+        connections (list): The (id, db_type, options) tuples to check
+        status_fn (function): Called with the result of each connection
+        max_parallel (int): The number of connections checked at the same time
+        timeout (float): The seconds a single check may take
+
+    Returns:
+        The list of the results, in the order of connections
+    """
+    results = {}
+    if not connections:
+        return []
+
+    with ThreadPoolExecutor(
+            max_workers=max(1, min(max_parallel, len(connections)))) as executor:
+        futures = {executor.submit(check_connection, db_type, options,
+                                   timeout): id
+                   for id, db_type, options in connections}
+
+        for future in as_completed(futures):
+            id = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                result = {"status": UNKNOWN, "message": str(e), "seconds": 0}
+            result = {"id": id, **result}
+            results[id] = result
+
+            if status_fn is not None:
+                status_fn(result)
+
+    return [results[id] for id, _, _ in connections]
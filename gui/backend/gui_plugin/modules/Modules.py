@@ -106,17 +106,7 @@ def list_data(folder_id, data_category_id=None, be_session=None):
                     WHERE dfhd.data_folder_id=?"""
         args = (folder_id,)
         if data_category_id:
-            CATEGORIES_SQL = """WITH RECURSIVE
-                                categories(id) AS (
-                                    SELECT id FROM data_category
-                                        WHERE id=?
-                                    UNION ALL
-                                    SELECT dc.id
-                                        FROM categories c
-                                        JOIN data_category dc ON c.id=dc.parent_category_id
-                                )
-                                SELECT DISTINCT id FROM categories"""
-            sql += f" AND d.data_category_id in ({CATEGORIES_SQL})"
+            sql += f" AND d.data_category_id in ({backend.DATA_CATEGORIES_SQL})"
             args += (data_category_id,)
         return db.select(sql, args)
 
@@ -617,6 +607,57 @@ def get_profile_tree_identifiers(profile_id=None, be_session=None):
                             (profile_id if profile_id else context.web_handler.session_active_profile_id,))
 
 
+def check_move_parameters(tree_identifier, linked_to, source_path, target_path):
+    if linked_to not in ['profile', 'group']:
+        raise MSGException(Error.CORE_INVALID_PARAMETER,
+                           f"Parameter 'linked_to' can only take value 'profile' or 'group'.")
+
+    if tree_identifier.strip() == "":
+        raise MSGException(Error.CORE_INVALID_PARAMETER,
+                           f"Parameter 'tree_identifier' cannot be empty.")
+
+    if source_path.strip() == "" or source_path.strip() == "/":
+        source_path = None
+
+    if target_path.strip() == "" or target_path.strip() == "/":
+        target_path = None
+
+    if source_path == target_path:
+        raise MSGException(Error.CORE_INVALID_PARAMETER,
+                           f"Parameters 'source_path' and 'target_path' are the same.")
+
+    return source_path, target_path
+
+
+def get_move_root_folder_id(db, tree_identifier, linked_to, link_id):
+    root_folder_id = backend.get_root_folder_id(
+        db, tree_identifier, linked_to, link_id)
+
+    if root_folder_id is None:
+        raise MSGException(Error.CORE_INVALID_PARAMETER,
+                           f"Cannot find root folder id for the given 'tree_identifier'.")
+
+    return root_folder_id
+
+
+def get_move_folder_ids(db, root_folder_id, source_path, target_path):
+    # Both paths are resolved with a single query, None is the root folder
+    folder_ids = backend.get_folder_ids(
+        db, root_folder_id, [source_path or "", target_path or ""])
+
+    source_folder_id = folder_ids.get(source_path or "")
+    if source_folder_id is None:
+        raise MSGException(Error.CORE_INVALID_PARAMETER,
+                           f"Cannot find the given 'source_path'.")
+
+    target_folder_id = folder_ids.get(target_path or "")
+    if target_folder_id is None:
+        target_folder_id, _ = backend.create_folder(
+            db, target_path, root_folder_id)
+
+    return source_folder_id, target_folder_id
+
+
 @plugin_function("gui.modules.moveData", shell=False, web=True)
 def move_data(id, tree_identifier, linked_to, link_id, source_path, target_path, be_session=None):
     """Moves data from source path to target path.
@@ -634,45 +675,128 @@ def move_data(id, tree_identifier, linked_to, link_id, source_path, target_path,
     Returns:
         int: the id of the moved record.
     """
-    if linked_to not in ['profile', 'group']:
-        raise MSGException(Error.CORE_INVALID_PARAMETER,
-                           f"Parameter 'linked_to' can only take value 'profile' or 'group'.")
+    source_path, target_path = check_move_parameters(
+        tree_identifier, linked_to, source_path, target_path)
 
-    if tree_identifier.strip() == "":
-        raise MSGException(Error.CORE_INVALID_PARAMETER,
-                           f"Parameter 'tree_identifier' cannot be empty.")
+    with BackendDatabase(be_session) as db:
+        with BackendTransaction(db):
+            root_folder_id = get_move_root_folder_id(
+                db, tree_identifier, linked_to, link_id)
 
-    if source_path.strip() == "" or source_path.strip() == "/":
-        source_path = None
+            source_folder_id, target_folder_id = get_move_folder_ids(
+                db, root_folder_id, source_path, target_path)
 
-    if target_path.strip() == "" or target_path.strip() == "/":
-        target_path = None
+            backend.add_data_to_folder(db, id, target_folder_id, read_only=0)
 
-    if source_path == target_path:
-        raise MSGException(Error.CORE_INVALID_PARAMETER,
-                           f"Parameters 'source_path' and 'target_path' are the same.")
+            return backend.delete_data(db, id, source_folder_id)
+
+
+@plugin_function("gui.modules.moveDataItems", shell=False, web=True)
+def move_data_items(ids, tree_identifier, linked_to, link_id, source_path, target_path, be_session=None):
+    """Moves several data items from source path to target path in one transaction.
+
+    Args:
+        ids (list): The ids of the data
+        tree_identifier (str): The identifier of the tree
+        linked_to (str): ['profile'|'group']
+        link_id (int): The profile id or the group id (depending on linked_to)
+        source_path (str): The source folder path f.e. "/scripts/server1"
+        target_path (str): The target folder path f.e. "/scripts/server2"
+        be_session (object):  A session to the GUI backend database
+            where the operation will be performed.
+
+    Returns:
+        list: the ids of the moved records.
+    """
+    source_path, target_path = check_move_parameters(
+        tree_identifier, linked_to, source_path, target_path)
 
     with BackendDatabase(be_session) as db:
         with BackendTransaction(db):
-            root_folder_id = backend.get_root_folder_id(
+            context = get_context()
+            backend.check_tree_access(db, linked_to, link_id,
+                                      context.web_handler.session_user_id)
+
+            root_folder_id = get_move_root_folder_id(
                 db, tree_identifier, linked_to, link_id)
 
-            if root_folder_id is None:
-                raise MSGException(Error.CORE_INVALID_PARAMETER,
-                                   f"Cannot find root folder id for the given 'tree_identifier'.")
+            source_folder_id, target_folder_id = get_move_folder_ids(
+                db, root_folder_id, source_path, target_path)
 
-            source_folder_id = backend.get_folder_id(
-                db, root_folder_id, source_path)
-            if source_folder_id is None:
-                raise MSGException(Error.CORE_INVALID_PARAMETER,
-                                   f"Cannot find the given 'source_path'.")
-            target_folder_id = backend.get_folder_id(
-                db, root_folder_id, target_path)
+            for id in ids:
+                backend.add_data_to_folder(db, id, target_folder_id, read_only=0)
+                backend.delete_data(db, id, source_folder_id)
 
-            if target_folder_id is None:
-                target_folder_id, _ = backend.create_folder(
-                    db, target_path, root_folder_id)
+            return ids
 
-            backend.add_data_to_folder(db, id, target_folder_id, read_only=0)
 
-            return backend.delete_data(db, id, source_folder_id)
+@plugin_function("gui.modules.deleteDataItems", shell=False, web=True)
+def delete_data_items(ids, folder_id, be_session=None):
+    """Deletes several data items from a folder in one transaction.
+
+    If the user has no privileges for one of the items, none of them are
+    deleted.
+
+    Args:
+        ids (list): The ids of the data
+        folder_id (int): The id of the folder
+        be_session (object):  A session to the GUI backend database
+            where the operation will be performed.
+
+    Returns:
+        list: the ids of the deleted records.
+    """
+
+    with BackendDatabase(be_session) as db:
+        with BackendTransaction(db):
+            context = get_context()
+            for id in ids:
+                backend.get_user_privileges_for_data(db, id, context.web_handler.session_user_id)
+                backend.delete_data(db, id, folder_id)
+
+            return ids
+
+
+@plugin_function("gui.modules.getDataTree", shell=False, web=True)
+def get_data_tree(tree_identifier, linked_to='profile', link_id=None, folder_path=None, data_category_id=None, include_content=False, be_session=None):
+    """Gets a whole data tree or subtree with all folders and data at once.
+
+    Args:
+        tree_identifier (str): The identifier of the tree
+        linked_to (str): ['profile'|'group']
+        link_id (int): The profile id or the group id (depending on linked_to),
+            the active profile or the personal user group if not given
+        folder_path (str): The folder path to start at f.e. "/scripts/server1",
+            the root folder if not given
+        data_category_id (int): Only list data of this category and its
+            sub categories
+        include_content (bool): Whether the content of the data is included
+        be_session (object):  A session to the GUI backend database
+            where the operation will be performed.
+
+    Returns:
+        list: the folders, parents before children, each with its path and
+            the list of its data.
+    """
+    if linked_to not in ['profile', 'group']:
+        raise MSGException(Error.CORE_INVALID_PARAMETER,
+                           f"Parameter 'linked_to' can only take value 'profile' or 'group'.")
+
+    with BackendDatabase(be_session) as db:
+        context = get_context()
+        if link_id is None:
+            link_id = context.web_handler.session_active_profile_id if linked_to == 'profile' \
+                else context.web_handler.user_personal_group_id
+
+        # The tree is returned without checking the privileges of each item,
+        # so it has to be one of the user's own trees
+        backend.check_tree_access(db, linked_to, link_id,
+                                  context.web_handler.session_user_id)
+
+        root_folder_id = backend.get_root_folder_id(
+            db, tree_identifier, linked_to, link_id)
+        if root_folder_id is None:
+            return []
+
+        return backend.get_data_tree(db, root_folder_id, folder_path,
+                                     data_category_id, include_content)
@@ -23,6 +23,7 @@
 
 from gui_plugin.core.Error import MSGException
 import gui_plugin.core.Error as Error
+import json
 
 
 FOLDERS_TREE_SQL = """WITH RECURSIVE
@@ -36,6 +37,31 @@ FOLDERS_TREE_SQL = """WITH RECURSIVE
                       )
                       SELECT DISTINCT id, caption, parent_folder_id FROM folders"""
 
+# Walks the folder tree below the given folder and computes the path of each
+# folder, f.e. "/scripts/server1". The parameters are the path of the start
+# folder ("" for a root folder) and its id.
+FOLDER_PATHS_SQL = """WITH RECURSIVE
+                      folders(id, caption, parent_folder_id, path) AS (
+                        SELECT id, caption, parent_folder_id, ? FROM data_folder
+                            WHERE id=?
+                        UNION ALL
+                        SELECT df.id, df.caption, df.parent_folder_id,
+                               f.path || '/' || df.caption
+                            FROM folders f
+                            JOIN data_folder df ON f.id=df.parent_folder_id
+                      )"""
+
+DATA_CATEGORIES_SQL = """WITH RECURSIVE
+                         categories(id) AS (
+                             SELECT id FROM data_category
+                                 WHERE id=?
+                             UNION ALL
+                             SELECT dc.id
+                                 FROM categories c
+                                 JOIN data_category dc ON c.id=dc.parent_category_id
+                         )
+                         SELECT DISTINCT id FROM categories"""
+
 
 def create_folder(db, caption, parent_folder_id=None):
     """Creates folder structures for given path.
@@ -180,6 +206,32 @@ def get_profile_owner(db, profile_id):
     return owner_id
 
 
+def check_tree_access(db, linked_to, link_id, user_id):
+    """Checks that the profile or user group of a data tree belongs to the user.
+
+    Args:
+        db (object): The db object
+        linked_to (str): ['profile'|'group']
+        link_id (int): The profile id or the group id (depending on linked_to)
+        user_id (int): The id of the user
+
+    Returns:
+        None
+    """
+
+    if linked_to == 'profile':
+        has_access = get_profile_owner(db, link_id) == user_id
+    else:
+        has_access = db.execute("""SELECT user_id
+                                   FROM user_group_has_user
+                                   WHERE user_group_id = ? AND user_id = ?""",
+                                (link_id, user_id)).fetch_one() is not None
+
+    if not has_access:
+        raise MSGException(Error.MODULES_USER_HAVE_NO_PRIVILEGES,
+                           "User have no privileges to perform operation.")
+
+
 def get_root_folder_id(db, tree_identifier, linked_to, link_id):
     """Get id of the root folder for given data category and profile or user group
 
@@ -304,6 +356,45 @@ def create_profile_data_tree(db, tree_identifier, profile_id):
     return folder_id
 
 
+def normalize_folder_path(folder_path):
+    """Brings a folder path into the form used by FOLDER_PATHS_SQL.
+
+    Args:
+        folder_path (str): The folder path f.e. "/scripts/server1"
+
+    Returns:
+        The path with a leading and without a trailing slash, or "" for the
+        root folder
+    """
+    folder_path = (folder_path or "").strip().strip("/")
+
+    return f"/{folder_path}" if folder_path else ""
+
+
+def get_folder_ids(db, root_folder_id, folder_paths):
+    """Gets the ids of the leaf folders of several folder paths at once.
+
+    Args:
+        db (object): The db object
+        root_folder_id (int): The id of root folder
+        folder_paths (list): The folder paths f.e. ["/scripts/server1"]
+
+    Returns:
+        A dict mapping the given folder paths to the folder ids, paths that
+        do not exist are left out
+    """
+
+    paths = {normalize_folder_path(path): path for path in folder_paths}
+    placeholders = ",".join("?" * len(paths))
+    rows = db.execute(f"""{FOLDER_PATHS_SQL}
+                          SELECT path, MIN(id) FROM folders
+                          WHERE path IN ({placeholders})
+                          GROUP BY path""",
+                      ("", root_folder_id, *paths)).fetch_all()
+
+    return {paths[row[0]]: row[1] for row in rows}
+
+
 def get_folder_id(db, root_folder_id, folder_path):
     """Gets the id of leaf folder in folder path for the given root_folder_id.
 
@@ -316,30 +407,82 @@ def get_folder_id(db, root_folder_id, folder_path):
         The id of the leaf folder in folder path
     """
 
-    folder_id = None
-    sql = f"""{FOLDERS_TREE_SQL} WHERE caption=?"""
-    rows = db.execute(
-        sql, (root_folder_id, folder_path.split("/")[-1])).fetch_all()
-    if rows:
-        for row in rows:
-            res = db.execute("""WITH RECURSIVE
-                                path(id, parent_folder_id, caption) AS (
-                                    SELECT id, parent_folder_id, caption FROM data_folder
-                                        WHERE id=?
-                                    UNION ALL
-                                    SELECT df.id, df.parent_folder_id, df.caption
-                                        FROM path p
-                                        JOIN data_folder df ON df.id=p.parent_folder_id
-                                    )
-                                SELECT DISTINCT caption FROM path;""",
-                             (row['id'],)).fetch_all()
-            if res:
-                path = [r['caption'] for r in res][::-1][1:]
-                if path == folder_path.split("/"):
-                    folder_id = row['id']
-                    break
+    return get_folder_ids(db, root_folder_id, [folder_path]).get(folder_path)
 
-    return folder_id
+
+def get_data_tree(db, root_folder_id, folder_path=None, data_category_id=None,
+                  include_content=False):
+    """Gets a folder and everything below it with a single query.
+
+    Args:
+        db (object): The db object
+        root_folder_id (int): The id of root folder
+        folder_path (str): The path of the folder to start at, the root
+            folder if not given
+        data_category_id (int): Only list data of this category and its sub
+            categories
+        include_content (bool): Whether the content of the data is included
+
+    Returns:
+        The list of folders, parents before children, each with its path
+        and the list of its data.
+    """
+
+    folder_path = normalize_folder_path(folder_path)
+    if folder_path:
+        folder_id = get_folder_id(db, root_folder_id, folder_path)
+        if folder_id is None:
+            raise MSGException(Error.CORE_INVALID_PARAMETER,
+                               f"Cannot find the folder path '{folder_path}'.")
+    else:
+        folder_id = root_folder_id
+
+    data_filter = ""
+    args = (folder_path, folder_id)
+    if data_category_id:
+        data_filter = f"AND d.data_category_id IN ({DATA_CATEGORIES_SQL})"
+        args += (data_category_id,)
+
+    rows = db.select(f"""{FOLDER_PATHS_SQL}
+                         SELECT f.id, f.caption, f.parent_folder_id, f.path,
+                                d.id, d.data_category_id, d.caption,
+                                d.created, d.last_update, dfhd.read_only,
+                                {"d.content" if include_content else "NULL"}
+                         FROM folders f
+                         LEFT JOIN data_folder_has_data dfhd
+                            ON dfhd.data_folder_id=f.id
+                         LEFT JOIN data d
+                            ON d.id=dfhd.data_id {data_filter}
+                         ORDER BY f.path, f.id, d.caption, d.id""",
+                     args, json_columns=(), as_tuples=True)
+
+    folders = {}
+    for row in rows:
+        folder = folders.get(row[0])
+        if folder is None:
+            folder = folders[row[0]] = {"id": row[0],
+                                        "caption": row[1],
+                                        "parent_folder_id": row[2],
+                                        "path": row[3],
+                                        "data": []}
+        if row[4] is None:
+            continue
+
+        data = {"id": row[4],
+                "data_category_id": row[5],
+                "caption": row[6],
+                "created": row[7],
+                "last_update": row[8],
+                "read_only": row[9]}
+        if include_content and row[10] is not None:
+            try:
+                data["content"] = json.loads(row[10])
+            except Exception as e:
+                raise MSGException(Error.CORE_INVALID_DATA_FORMAT,
+                                   f"Error decoding data content: {str(e)}")
+        folder["data"].append(data)
+
+    return list(folders.values())
 
 
 def delete_data(db, id, folder_id):
@@ -0,0 +1,163 @@
+# Copyright (c) 2024, Oracle and/or its affiliates.
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License, version 2.0,
+# as published by the Free Software Foundation.
+#
+# This program is designed to work with certain software (including
+# but not limited to OpenSSL) that is licensed under separate terms, as
+# designated in a particular file or component or in included license
+# documentation.  The authors of MySQL hereby grant you an additional
+# permission to link the program and your derivative works with the
+# separately licensed software that they have either included with
+# the program or referenced in the documentation.
+#
+# This program is distributed in the hope that it will be useful,  but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See
+# the GNU General Public License, version 2.0, for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software Foundation, Inc.,
+# 51 Franklin St, Fifth Floor, Boston, MA 02110-1301 USA
+
+import time
+import types
+from queue import Queue
+import threading
+
+import pytest
+
+import gui_plugin.core.ShellGuiWebSocketHandler as handler_module
+from gui_plugin.core.CommandRegistry import CommandRegistry
+from gui_plugin.core.Db import GuiBackendDb
+from gui_plugin.core.ShellGuiWebSocketHandler import ShellGuiWebSocketHandler
+from gui_plugin.users import backend as user_handler
+
+
+def make_handler(db, user_id):
+    # Only the members used to process execute requests are set up, the
+    # handler is not connected to a socket
+    handler = ShellGuiWebSocketHandler.__new__(ShellGuiWebSocketHandler)
+    handler.server = types.SimpleNamespace(single_instance_token=None)
+    handler.session_uuid = "test_uuid_command_registry"
+    handler._db = db
+    handler._session_user_id = user_id
+    handler._active_profile_id = None
+    handler._module_sessions = {}
+    handler._requests = {}
+    handler._requests_mutex = threading.Lock()
+    handler._command_privilege = (None, None)
+    handler._response_queue = Queue()
+    return handler
+
+
+class FakeRequestHandler():
+    started = []
+
+    def __init__(self, request_id, func, kwargs, web_handler, lock_session=False):
+        self.func = func
+        self.kwargs = kwargs
+
+    def start(self):
+        FakeRequestHandler.started.append(self)
+
+
+def test_command_is_resolved_once():
+    registry = CommandRegistry.get_instance()
+
+    command = registry.get("gui.users.list_profiles")
+
+    assert command.is_gui
+    assert "user_id" in command.f_args
+    assert "be_session" in command.f_args
+    assert registry.get("gui.users.list_profiles") is command
+
+
+def test_invalid_commands_are_not_cached():
+    registry = CommandRegistry.get_instance()
+
+    with pytest.raises(Exception, match="is using wrong format"):
+        registry.get("gui")
+
+    with pytest.raises(Exception, match="has no member function named 'missing'"):
+        registry.get("gui.users.missing")
+
+    with pytest.raises(Exception, match="has no member named 'missing'"):
+        registry.get("gui.missing.list_profiles")
+
+    assert "gui.users.missing" not in registry._commands
+
+
+def test_privilege_pattern_is_cached_per_user(create_users):
+    db = GuiBackendDb()
+    try:
+        admin_id = user_handler.get_user_id(db, "admin1")
+        user_id = user_handler.get_user_id(db, "user1")
+        handler = make_handler(db, admin_id)
+
+        pattern = handler.get_command_privilege_pattern()
+        assert pattern is not None
+        assert handler.get_command_privilege_pattern() is pattern
+
+        handler._session_user_id = user_id
+        handler.get_command_privilege_pattern()
+        assert handler._command_privilege[0] == user_id
+    finally:
+        db.close()
+
+
+def test_privilege_pattern_is_reset_on_login(create_users):
+    db = GuiBackendDb()
+    try:
+        admin_id = user_handler.get_user_id(db, "admin1")
+        handler = make_handler(db, admin_id)
+        handler.get_command_privilege_pattern()
+        assert handler._command_privilege[0] == admin_id
+
+        handler.process_message({"request": "logout", "request_id": "1"})
+        assert handler._command_privilege == (None, None)
+
+        handler.authenticate_session({"request_id": "2", "username": "admin1",
+                                      "password": "admin1"})
+        assert handler.session_user_id == admin_id
+        assert handler._command_privilege == (None, None)
+
+        # Logging in again as the same user reads the privileges again
+        handler.get_command_privilege_pattern()
+        handler._command_privilege = (admin_id, None)
+        handler.authenticate_session({"request_id": "3", "username": "admin1",
+                                      "password": "admin1"})
+        assert handler.get_command_privilege_pattern() is not None
+    finally:
+        db.close()
+
+
+def test_process_message_benchmark(create_users, monkeypatch):
+    monkeypatch.setattr(handler_module, "RequestHandler", FakeRequestHandler)
+    FakeRequestHandler.started = []
+
+    db = GuiBackendDb()
+    try:
+        admin_id = user_handler.get_user_id(db, "admin1")
+        handler = make_handler(db, admin_id)
+
+        count = 5000
+        start = time.perf_counter()
+        for i in range(count):
+            handler.process_message({
+                "request": "execute",
+                "request_id": f"request_{i}",
+                "command": "gui.users.list_profiles",
+                "args": {"user_id": admin_id}
+            })
+        elapsed = time.perf_counter() - start
+
+        print(f"\nprocess_message: {count / elapsed:.0f} requests/s")
+
+        # No request failed and all of them were dispatched
+        assert handler._response_queue.empty()
+        assert len(FakeRequestHandler.started) == count
+        assert FakeRequestHandler.started[-1].kwargs["be_session"] is db
+    finally:
+        db.close()
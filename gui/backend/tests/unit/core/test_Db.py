@@ -23,10 +23,14 @@
 
 import shutil
 from gui_plugin.core.Db import GuiBackendDb, BackendSqliteDbManager, convert_workbench_sql_file_to_sqlite, convert_all_workbench_sql_files_to_sqlite
+from gui_plugin.core.GuiBackendDbManager import BackendDbPool
+from gui_plugin.modules.Modules import list_data
 import datetime
 import os
 import sqlite3
 import tempfile
+import threading
+import time
 import contextlib
 import difflib
 import pytest
@@ -129,6 +133,142 @@ def test_GuiBackendDb_select_rows():
     backend_db.close()
 
 
+def test_GuiBackendDb_pooled_sessions():
+    BackendDbPool.get_instance().clear()
+
+    backend_db = GuiBackendDb()
+    session = backend_db._db
+    backend_db.start_transaction()
+    backend_db.execute('''INSERT INTO log(event_time, event_type,
+            message) VALUES(?, ?, ?)''',
+                       (datetime.datetime.now(), 'INFO', '__TEST MESSAGE__'))
+    id = backend_db.get_last_row_id()
+    backend_db.close()
+    backend_db.close()
+
+    # The session is reused by the same thread, the pending transaction
+    # was rolled back
+    backend_db = GuiBackendDb()
+    assert backend_db._db is session
+    assert backend_db.select('''SELECT * FROM log WHERE id=?''', (id,)) == []
+
+    # Sessions in use are not handed out again
+    backend_db2 = GuiBackendDb()
+    assert backend_db2._db is not session
+
+    # Other threads get their own sessions
+    sessions = []
+    thread = threading.Thread(
+        target=lambda: sessions.append(GuiBackendDb()._db))
+    thread.start()
+    thread.join()
+    assert sessions[0] is not session
+
+    backend_db2.close()
+    backend_db.close()
+
+    # Sessions are not shared between web sessions
+    backend_db = GuiBackendDb(session_uuid="web-session-a")
+    session_a = backend_db._db
+    backend_db.close()
+
+    backend_db = GuiBackendDb(session_uuid="web-session-b")
+    assert backend_db._db is not session_a
+    assert backend_db._db is not session
+    backend_db.close()
+
+    backend_db = GuiBackendDb(session_uuid="web-session-a")
+    assert backend_db._db is session_a
+    backend_db.close()
+
+    # A thread keeps at most max_idle sessions across all web sessions, the
+    # least recently released ones are closed
+    pool = BackendDbPool.get_instance()
+    pool.clear()
+    backend_dbs = [GuiBackendDb(session_uuid=f"web-session-{i}")
+                   for i in range(pool.max_idle + 1)]
+    sessions = [backend_db._db for backend_db in backend_dbs]
+    for backend_db in backend_dbs:
+        backend_db.close()
+
+    assert [db for _, db in pool._get_idle_sessions()] == sessions[1:]
+    with pytest.raises(sqlite3.ProgrammingError):
+        sessions[0].conn.execute("SELECT 1")
+    pool.clear()
+
+
+def test_GuiBackendDb_select_json_columns():
+    backend_db = GuiBackendDb()
+    try:
+        backend_db.execute('''CREATE TEMP TABLE json_test(id INTEGER, caption TEXT, options TEXT)''')
+        backend_db.execute('''INSERT INTO json_test VALUES(1, '{"a": 1}', '{"b": 2}')''')
+
+        # Only the known JSON columns are decoded
+        rows = backend_db.select('''SELECT * FROM json_test''')
+        assert rows == [{"id": 1, "caption": '{"a": 1}', "options": {"b": 2}}]
+
+        rows = backend_db.select('''SELECT * FROM json_test''', json_columns=["caption"])
+        assert rows == [{"id": 1, "caption": {"a": 1}, "options": '{"b": 2}'}]
+
+        rows = backend_db.select('''SELECT * FROM json_test''', as_tuples=True)
+        assert rows == [(1, '{"a": 1}', {"b": 2})]
+        assert rows[0].caption == '{"a": 1}'
+        assert rows[0].options == {"b": 2}
+
+        # The first column of a given name wins
+        rows = backend_db.select('''SELECT id, caption AS id FROM json_test''')
+        assert rows == [{"id": 1}]
+    finally:
+        backend_db.execute('''DROP TABLE temp.json_test''')
+        backend_db.close()
+
+
+def test_GuiBackendDb_select_benchmark():
+    count = 50000
+    backend_db = GuiBackendDb()
+    try:
+        backend_db.execute('''CREATE TEMP TABLE select_test(id INTEGER, caption TEXT, options TEXT)''')
+        backend_db.start_transaction()
+        for i in range(count):
+            backend_db.execute('''INSERT INTO select_test VALUES(?, ?, ?)''',
+                               (i, f'{{caption {i}}}', '{"host": "localhost", "port": 3306}'))
+        backend_db.commit()
+
+        for as_tuples in [False, True]:
+            start = time.perf_counter()
+            rows = backend_db.select('''SELECT id, caption FROM select_test''', as_tuples=as_tuples)
+            elapsed = time.perf_counter() - start
+            assert len(rows) == count
+            print(f"\nselect {count} rows {'as tuples' if as_tuples else 'as dicts'}: {elapsed * 1000:.1f} ms")
+
+        start = time.perf_counter()
+        rows = backend_db.select('''SELECT id, caption, options FROM select_test''')
+        elapsed = time.perf_counter() - start
+        assert rows[0]["options"]["port"] == 3306
+        print(f"select {count} rows with a JSON column: {elapsed * 1000:.1f} ms")
+    finally:
+        backend_db.execute('''DROP TABLE temp.select_test''')
+        backend_db.close()
+
+
+def test_list_data_benchmark():
+    count = 500
+    pool = BackendDbPool.get_instance()
+    pool.clear()
+    expected = list_data(1)
+    idle_sessions = list(pool._get_idle_sessions())
+    start = time.perf_counter()
+    for _ in range(count):
+        assert list_data(1) == expected
+    elapsed = time.perf_counter() - start
+
+    # Every call reuses the pooled session of this thread
+    assert len(idle_sessions) == 1
+    assert pool._get_idle_sessions() == idle_sessions
+
+    print(f"\ngui.modules.listData: {elapsed / count * 1000:.3f} ms")
+
+
 def test_GuiBackendDb_check_for_previous_version_and_upgrade():
     backend_db = BackendSqliteDbManager()
 
@@ -300,3 +440,78 @@ def test_backup_logs():
 
         os.chdir(current_dir)
         assert os.path.exists(backup_file)
+
+
+def test_backup_logs_large():
+    current_dir = os.getcwd()
+    current_create_script = os.path.join(
+        current_dir, 'gui_plugin', 'core', 'db_schema', f'mysqlsh_gui_backend.sqlite.sql')
+
+    old_rows = 200000
+    new_rows = 1000
+    today = datetime.datetime.now(datetime.timezone.utc).replace(
+        tzinfo=None, hour=0, minute=0, second=1, microsecond=0)
+
+    with tempfile.TemporaryDirectory() as tmpdirname:
+        os.chdir(tmpdirname)
+        try:
+            conn = sqlite3.connect(os.path.join(tmpdirname, "mysqlsh_gui_backend.sqlite3"))
+            with open(current_create_script, 'r') as sql_file:
+                conn.executescript(sql_file.read())
+            conn.close()
+
+            # Synthetic log spanning the last 10 days
+            log_file = os.path.join(tmpdirname, 'mysqlsh_gui_backend_log.sqlite3')
+            conn = sqlite3.connect(log_file)
+            rows = [(str(today - datetime.timedelta(seconds=4.32 * (old_rows - i))), 'INFO', f'message {i}')
+                    for i in range(old_rows)]
+            rows += [(str(today + datetime.timedelta(seconds=i)), 'INFO', f'message {i}')
+                     for i in range(new_rows)]
+            conn.executemany('''INSERT INTO log(event_time, event_type, message) VALUES(?, ?, ?)''', rows)
+            conn.executemany('''INSERT INTO message(session_id, is_response, message, sent) VALUES(1, 0, ?, ?)''',
+                             [(row[2], row[0]) for row in rows])
+            conn.commit()
+            conn.close()
+
+            connection_options = {"db_dir": tmpdirname,
+                                  "database_name": "main",
+                                  "db_file": os.path.join(tmpdirname, f'mysqlsh_gui_backend.sqlite3'),
+                                  "attach": [
+                                      {
+                                          "database_name": "gui_log",
+                                          "db_file": log_file
+                                      }]}
+            db_manager = BackendSqliteDbManager(log_rotation=False,
+                                                session_uuid=None,
+                                                connection_options=connection_options)
+
+            db = db_manager.open_database()
+            try:
+                # The check is an index lookup, not a scan of the log
+                plan = db.execute('''EXPLAIN QUERY PLAN
+                    SELECT 1 FROM `gui_log`.`log` WHERE `event_time` < ?''', ('2000-01-01',)).fetch_all()
+                assert 'log_event_time_idx' in plan[0][3]
+
+                assert db_manager.check_if_logs_need_rotation(db)
+
+                start = time.perf_counter()
+                db_manager.backup_logs(db)
+                elapsed = time.perf_counter() - start
+
+                assert not db_manager.check_if_logs_need_rotation(db)
+                for table in ['log', 'message']:
+                    res = db.execute(f'''SELECT COUNT(*) FROM `gui_log`.`{table}`''').fetch_one()
+                    assert res[0] == new_rows
+            finally:
+                db.close()
+
+            print(f"\nbackup_logs: {old_rows} rows per table in {elapsed:.2f} s")
+
+            backup_file = os.path.join(tmpdirname,
+                                       f"mysqlsh_gui_backend_log_{datetime.date.today().strftime('%Y.%m.%d')}.sqlite3")
+            conn = sqlite3.connect(backup_file)
+            for table in ['log', 'message']:
+                assert conn.execute(f'''SELECT COUNT(*) FROM {table}''').fetchone()[0] == old_rows
+            conn.close()
+        finally:
+            os.chdir(current_dir)
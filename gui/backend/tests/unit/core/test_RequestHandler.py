@@ -0,0 +1,225 @@
+# Copyright (c) 2024, Oracle and/or its affiliates.
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License, version 2.0,
+# as published by the Free Software Foundation.
+#
+# This program is designed to work with certain software (including
+# but not limited to OpenSSL) that is licensed under separate terms, as
+# designated in a particular file or component or in included license
+# documentation.  The authors of MySQL hereby grant you an additional
+# permission to link the program and your derivative works with the
+# separately licensed software that they have either included with
+# the program or referenced in the documentation.
+#
+# This program is distributed in the hope that it will be useful,  but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See
+# the GNU General Public License, version 2.0, for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software Foundation, Inc.,
+# 51 Franklin St, Fifth Floor, Boston, MA 02110-1301 USA
+
+import threading
+import time
+
+import pytest
+
+from gui_plugin.core.RequestHandler import RequestHandler, RequestWorkerPool
+
+
+class FakeWebHandler():
+    def __init__(self, session_uuid):
+        self.session_uuid = session_uuid
+        self.responses = []
+        self.done = threading.Event()
+        self.done_count = 0
+        self.prompts = []
+        self._lock = threading.Lock()
+
+    def send_command_response(self, request_id, values):
+        with self._lock:
+            self.responses.append((request_id, values))
+
+    def send_command_done(self, request_id):
+        with self._lock:
+            self.done_count += 1
+        self.done.set()
+
+    def send_prompt_response(self, request_id, options, request):
+        with self._lock:
+            self.prompts.append((request_id, request))
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    def create(**kwargs):
+        monkeypatch.setattr(
+            RequestWorkerPool, "_RequestWorkerPool__instance", None)
+        return RequestWorkerPool(**kwargs)
+    yield create
+    monkeypatch.setattr(RequestWorkerPool, "_RequestWorkerPool__instance", None)
+
+
+def wait_for(condition, timeout=5):
+    end = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < end
+        time.sleep(0.01)
+
+
+def test_requests_are_executed_by_workers(pool):
+    pool = pool(max_workers=2)
+    web_handler = FakeWebHandler("session_1")
+    threads = []
+
+    def func():
+        threads.append(threading.current_thread())
+        return 42
+
+    for request_id in range(10):
+        RequestHandler(str(request_id), func, {}, web_handler).start()
+
+    wait_for(lambda: web_handler.done_count == 10)
+
+    assert len(web_handler.responses) == 10
+    assert web_handler.responses[0][1]["result"] == 42
+    assert len(set(threads)) <= 2
+
+    metrics = pool.get_metrics()
+    assert metrics["requests"] == 10
+    assert metrics["workers"] <= 2
+    assert metrics["queued"] == 0
+    assert metrics["run_time_max"] >= metrics["run_time_avg"] >= 0
+    assert metrics["wait_time_max"] >= metrics["wait_time_avg"] >= 0
+
+
+def test_shell_context_is_reused_per_session(pool):
+    pool(max_workers=1)
+    contexts = []
+    web_handler = FakeWebHandler("session_1")
+
+    def func():
+        contexts.append(threading.current_thread()._shell_ctx)
+
+    for request_id in range(3):
+        web_handler.done.clear()
+        RequestHandler(str(request_id), func, {}, web_handler).start()
+        assert web_handler.done.wait(5)
+
+    other_handler = FakeWebHandler("session_2")
+    RequestHandler("3", func, {}, other_handler).start()
+    assert other_handler.done.wait(5)
+
+    assert contexts[0] is contexts[1] is contexts[2]
+    assert contexts[3] is not contexts[0]
+
+
+def test_sessions_are_served_round_robin(pool):
+    pool = pool(max_workers=1)
+    release = threading.Event()
+    order = []
+    session_1 = FakeWebHandler("session_1")
+    session_2 = FakeWebHandler("session_2")
+
+    def func(name):
+        order.append(name)
+
+    RequestHandler("blocker", release.wait, {}, session_1).start()
+    wait_for(lambda: pool.get_metrics()["queued"] == 0)
+
+    for request_id in ["a1", "a2", "a3"]:
+        RequestHandler(request_id, func, {"name": request_id},
+                       session_1).start()
+    RequestHandler("b1", func, {"name": "b1"}, session_2).start()
+
+    release.set()
+    wait_for(lambda: len(order) == 4)
+
+    assert order == ["a1", "b1", "a2", "a3"]
+
+
+def test_queue_depth_is_limited(pool):
+    pool = pool(max_workers=1, max_queue_depth=2)
+    release = threading.Event()
+    web_handler = FakeWebHandler("session_1")
+
+    RequestHandler("blocker", release.wait, {}, web_handler).start()
+    wait_for(lambda: pool.get_metrics()["queued"] == 0)
+
+    RequestHandler("1", lambda: None, {}, web_handler).start()
+    RequestHandler("2", lambda: None, {}, web_handler).start()
+    with pytest.raises(Exception, match="Too many requests"):
+        RequestHandler("3", lambda: None, {}, web_handler).start()
+
+    # Other sessions have their own queue
+    RequestHandler("4", lambda: None, {}, FakeWebHandler("session_2")).start()
+
+    release.set()
+    wait_for(lambda: pool.get_metrics()["requests"] == 4)
+    assert pool.get_metrics()["rejected"] == 1
+
+
+def test_running_requests_per_session_are_limited(pool):
+    pool = pool(max_workers=4, max_session_workers=2)
+    release = threading.Event()
+    running = []
+    session_1 = FakeWebHandler("session_1")
+    session_2 = FakeWebHandler("session_2")
+
+    def func():
+        running.append(threading.current_thread())
+        release.wait()
+
+    for request_id in range(4):
+        RequestHandler(str(request_id), func, {}, session_1).start()
+
+    wait_for(lambda: len(running) == 2)
+    assert pool.get_metrics()["queued"] == 2
+
+    # Another session is not held up by the queued requests
+    RequestHandler("b1", lambda: None, {}, session_2).start()
+    assert session_2.done.wait(5)
+    assert len(running) == 2
+
+    release.set()
+    wait_for(lambda: session_1.done_count == 4)
+
+
+def test_requests_blocked_on_prompts_release_their_worker(pool):
+    pool = pool(max_workers=1, max_session_workers=2)
+    replies = []
+    session_1 = FakeWebHandler("session_1")
+    session_2 = FakeWebHandler("session_2")
+
+    def prompt():
+        replies.append(
+            threading.current_thread().request.on_shell_prompt("Password:", {}))
+
+    RequestHandler("p1", prompt, {}, session_1).start()
+    RequestHandler("p2", prompt, {}, session_1).start()
+    RequestHandler("p3", prompt, {}, session_1).start()
+    wait_for(lambda: len(session_1.prompts) == 2)
+    assert pool.get_metrics()["blocked_workers"] == 2
+
+    # Both blocked requests wait for a reply, yet the other session's request
+    # is executed
+    RequestHandler("b1", lambda: None, {}, session_2).start()
+    assert session_2.done.wait(5)
+
+    for request_id, request in session_1.prompts[:2]:
+        request.process_prompt_reply(
+            {"request_id": request_id, "type": "OK", "reply": "secret"})
+
+    wait_for(lambda: len(session_1.prompts) == 3)
+    request_id, request = session_1.prompts[2]
+    request.process_prompt_reply(
+        {"request_id": request_id, "type": "CANCEL", "reply": ""})
+
+    wait_for(lambda: session_1.done_count == 3)
+    assert sorted(replies) == [[False, ""], [True, "secret"], [True, "secret"]]
+
+    # The workers started for the blocked requests are not kept
+    wait_for(lambda: pool.get_metrics()["blocked_workers"] == 0)
+    wait_for(lambda: pool.get_metrics()["workers"] <= 1)
@@ -21,9 +21,13 @@
 # along with this program; if not, write to the Free Software Foundation, Inc.,
 # 51 Franklin St, Fifth Floor, Boston, MA 02110-1301 USA
 from gui_plugin.dbconnections import DbConnections
+from gui_plugin.dbconnections import backend
 from gui_plugin.users import UserManagement
 import config
 import pytest
+import socket
+import threading
+import time
 
 
 def validate_response(response):
@@ -483,3 +487,88 @@ class TestDbConnectionMySQL:
                 if group_id != 1:
                     UserManagement.remove_user_group(group_id)
         UserManagement.delete_user(user_name)
+
+
+class TestCheckConnections:
+    def test_get_probe_address(self):
+        assert backend.get_probe_address("MySQL", {"scheme": "mysqlx", "host": "db1"}) == \
+            ("tcp", ("db1", 33060))
+        assert backend.get_probe_address("MySQL", {"scheme": "mysql", "host": "db1", "port": 3307}) == \
+            ("tcp", ("db1", 3307))
+        assert backend.get_probe_address("MySQL", {"host": "db1", "ssh": "me@jump:2222"}) == \
+            ("tcp", ("jump", 2222))
+        assert backend.get_probe_address("MySQL", {"host": "db1", "ssh": "me@[::1]"}) == \
+            ("tcp", ("::1", 22))
+        assert backend.get_probe_address("MySQL", {"mysql-db-system-id": "ocid1"}) is None
+
+    def test_probe_address_name_resolution_timeout(self, monkeypatch):
+        resolved = threading.Event()
+
+        def getaddrinfo(*args, **kwargs):
+            # A name server that does not answer in time
+            resolved.wait(5)
+            raise OSError("No answer")
+
+        monkeypatch.setattr(backend.socket, "getaddrinfo", getaddrinfo)
+        try:
+            start = time.monotonic()
+            message = backend.probe_address("tcp", ("db1", 3306), 0.2)
+
+            assert time.monotonic() - start < 2
+            assert message == "Timed out after 0.2 seconds resolving host db1."
+        finally:
+            resolved.set()
+
+    def test_check_connections(self, tmp_path):
+        listener = socket.socket()
+        listener.bind(("127.0.0.1", 0))
+        listener.listen()
+        open_port = listener.getsockname()[1]
+
+        closed = socket.socket()
+        closed.bind(("127.0.0.1", 0))
+        closed_port = closed.getsockname()[1]
+        closed.close()
+
+        db_file = tmp_path / "check.sqlite3"
+        db_file.write_bytes(b"")
+
+        connections = {
+            "open": {"db_type": "MySQL",
+                     "options": {"scheme": "mysql", "host": "127.0.0.1", "port": open_port}},
+            "closed": {"db_type": "MySQL",
+                       "options": {"scheme": "mysql", "host": "127.0.0.1", "port": closed_port}},
+            "bastion": {"db_type": "MySQL",
+                        "options": {"scheme": "mysql", "host": "10.0.0.1",
+                                    "mysql-db-system-id": "ocid1.mysqldbsystem"}},
+            "file": {"db_type": "Sqlite", "options": {"db_file": str(db_file)}},
+            "relative": {"db_type": "Sqlite", "options": {"db_file": "tests.sqlite3"}},
+        }
+        ids = {}
+        try:
+            for name, connection in connections.items():
+                ids[name] = DbConnections.add_db_connection(1, {
+                    "caption": f"Check {name}", "description": "", **connection}, 'tests')
+
+            messages = []
+            connection_ids = list(ids.values()) + [-1]
+            results = DbConnections.check_connections(
+                connection_ids, max_parallel=4, timeout=2,
+                send_gui_message=lambda type, data: messages.append((type, data)))
+
+            assert [r["id"] for r in results] == connection_ids
+            status = {name: results[i]["status"] for i, name in enumerate(ids)}
+            assert status == {"open": "REACHABLE",
+                              "closed": "UNREACHABLE",
+                              "bastion": "UNKNOWN",
+                              "file": "REACHABLE",
+                              "relative": "UNKNOWN"}
+            assert results[-1]["status"] == "UNKNOWN"
+
+            # Every result is streamed exactly once
+            assert all(type == "data" for type, _ in messages)
+            assert sorted(data["id"] for _, data in messages) == sorted(connection_ids)
+        finally:
+            listener.close()
+            for id in ids.values():
+                DbConnections.remove_db_connection(1, id)
@@ -0,0 +1,204 @@
+# Copyright (c) 2024, Oracle and/or its affiliates.
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License, version 2.0,
+# as published by the Free Software Foundation.
+#
+# This program is designed to work with certain software (including
+# but not limited to OpenSSL) that is licensed under separate terms, as
+# designated in a particular file or component or in included license
+# documentation.  The authors of MySQL hereby grant you an additional
+# permission to link the program and your derivative works with the
+# separately licensed software that they have either included with
+# the program or referenced in the documentation.
+#
+# This program is distributed in the hope that it will be useful,  but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See
+# the GNU General Public License, version 2.0, for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software Foundation, Inc.,
+# 51 Franklin St, Fifth Floor, Boston, MA 02110-1301 USA
+
+from gui_plugin.core.Db import GuiBackendDb
+from gui_plugin.core.Error import MSGException
+from gui_plugin.modules import backend
+from gui_plugin.modules.Modules import delete_data_items, get_data_tree, move_data_items
+import datetime
+import json
+import pytest
+import threading
+import types
+import uuid
+
+
+@pytest.fixture
+def session_user():
+    """Runs the test as the owner of profile 1, returns a function to
+    switch to another user"""
+    db = GuiBackendDb()
+    owner_id = backend.get_profile_owner(db, 1)
+    db.close()
+
+    context = types.SimpleNamespace(request_id=None)
+
+    def set_user(user_id):
+        context.web_handler = types.SimpleNamespace(
+            session_user_id=user_id, session_active_profile_id=1,
+            user_personal_group_id=None)
+
+    set_user(owner_id)
+    thread = threading.current_thread()
+    setattr(thread, "get_context", lambda: context)
+    yield set_user
+    delattr(thread, "get_context")
+
+
+@pytest.fixture
+def data_tree():
+    """Creates a profile data tree with the folders /a, /a/b and /c
+
+    The data is added to /a and /a/b and everything is removed afterwards.
+    """
+    db = GuiBackendDb()
+    tree_identifier = f"pytest_tree_{uuid.uuid4()}"
+
+    db.start_transaction()
+    root_id = backend.create_profile_data_tree(db, tree_identifier, 1)
+    a_id, _ = backend.create_folder(db, "/a", root_id)
+    b_id, _ = backend.create_folder(db, "b", a_id)
+    c_id, _ = backend.create_folder(db, "/c", root_id)
+
+    data_ids = []
+    for caption, folder_id, category_id in [("script1", a_id, 4),
+                                            ("script2", b_id, 4),
+                                            ("note", b_id, 1)]:
+        db.execute("""INSERT INTO data (data_category_id, caption, content,
+                        created, last_update)
+                      VALUES(?, ?, ?, ?, ?)""",
+                   (category_id, caption, json.dumps(f"{caption} content"),
+                    datetime.datetime.now(), datetime.datetime.now()))
+        data_ids.append(db.get_last_row_id())
+        backend.add_data_to_folder(db, data_ids[-1], folder_id, read_only=0)
+    db.commit()
+
+    folders = {"": root_id, "/a": a_id, "/a/b": b_id, "/c": c_id}
+    yield db, tree_identifier, folders, data_ids
+
+    db.start_transaction()
+    folder_ids = tuple(folders.values())
+    db.execute(f"""DELETE FROM data_folder_has_data
+                   WHERE data_folder_id IN ({",".join("?" * len(folder_ids))})""", folder_ids)
+    db.execute(f"""DELETE FROM data
+                   WHERE id IN ({",".join("?" * len(data_ids))})""", tuple(data_ids))
+    db.execute("DELETE FROM data_profile_tree WHERE tree_identifier=?",
+               (tree_identifier,))
+    db.execute(f"""DELETE FROM data_folder
+                   WHERE id IN ({",".join("?" * len(folder_ids))})""", folder_ids)
+    db.commit()
+    db.close()
+
+
+def test_get_folder_ids(data_tree):
+    db, _, folders, _ = data_tree
+
+    assert backend.get_folder_ids(db, folders[""], ["/a/b", "a", "/c/", "/x"]) == {
+        "/a/b": folders["/a/b"],
+        "a": folders["/a"],
+        "/c/": folders["/c"],
+    }
+    assert backend.get_folder_id(db, folders[""], "/a/b") == folders["/a/b"]
+    assert backend.get_folder_id(db, folders[""], "/b") is None
+
+
+def test_get_data_tree(data_tree):
+    db, _, folders, data_ids = data_tree
+
+    tree = backend.get_data_tree(db, folders[""])
+    assert [(f["id"], f["path"]) for f in tree] == [(folders[""], ""),
+                                                    (folders["/a"], "/a"),
+                                                    (folders["/a/b"], "/a/b"),
+                                                    (folders["/c"], "/c")]
+    assert [d["id"] for d in tree[1]["data"]] == [data_ids[0]]
+    assert [d["caption"] for d in tree[2]["data"]] == ["note", "script2"]
+    assert tree[0]["data"] == [] and tree[3]["data"] == []
+    assert "content" not in tree[1]["data"][0]
+
+    tree = backend.get_data_tree(db, folders[""], "/a", data_category_id=4,
+                                 include_content=True)
+    assert [f["path"] for f in tree] == ["/a", "/a/b"]
+    assert [(d["caption"], d["content"]) for f in tree for d in f["data"]] == [
+        ("script1", "script1 content"), ("script2", "script2 content")]
+
+    with pytest.raises(MSGException):
+        backend.get_data_tree(db, folders[""], "/x")
+
+
+def test_get_data_tree_privileges(data_tree, session_user):
+    db, tree_identifier, folders, data_ids = data_tree
+
+    tree = get_data_tree(tree_identifier, include_content=True, be_session=db)
+    assert [f["path"] for f in tree] == ["", "/a", "/a/b", "/c"]
+    assert tree[1]["data"][0]["content"] == "script1 content"
+
+    # The profile tree of another user cannot be read
+    session_user(-1)
+    with pytest.raises(MSGException):
+        get_data_tree(tree_identifier, "profile", 1, include_content=True,
+                      be_session=db)
+    with pytest.raises(MSGException):
+        move_data_items(data_ids, tree_identifier, "profile", 1,
+                        "/a/b", "/c", be_session=db)
+
+
+def test_move_data_items(data_tree, session_user):
+    db, tree_identifier, folders, data_ids = data_tree
+
+    moved = move_data_items(data_ids[1:], tree_identifier, "profile", 1,
+                            "/a/b", "/c/d", be_session=db)
+    assert moved == data_ids[1:]
+
+    tree = {f["path"]: f for f in backend.get_data_tree(db, folders[""])}
+    assert tree["/a/b"]["data"] == []
+    assert sorted(d["id"] for d in tree["/c/d"]["data"]) == data_ids[1:]
+    folders["/c/d"] = tree["/c/d"]["id"]
+
+    # Nothing is moved if one of the items is not in the source folder
+    with pytest.raises(MSGException):
+        move_data_items(data_ids, tree_identifier, "profile", 1,
+                        "/c/d", "/c", be_session=db)
+
+    tree = {f["path"]: f for f in backend.get_data_tree(db, folders[""])}
+    assert sorted(d["id"] for d in tree["/c/d"]["data"]) == data_ids[1:]
+    assert tree["/c"]["data"] == []
+
+
+def test_delete_data_items(data_tree, session_user):
+    db, _, folders, data_ids = data_tree
+
+    # Data the user has no privileges for, as it is in none of their trees
+    db.execute("""INSERT INTO data (data_category_id, caption, content,
+                    created, last_update)
+                  VALUES(?, ?, ?, ?, ?)""",
+               (4, "foreign", json.dumps("foreign content"),
+                datetime.datetime.now(), datetime.datetime.now()))
+    foreign_id = db.get_last_row_id()
+
+    try:
+        # Nothing is deleted if the user lacks privileges for one of the items
+        with pytest.raises(MSGException):
+            delete_data_items([data_ids[1], foreign_id], folders["/a/b"],
+                              be_session=db)
+
+        tree = {f["path"]: f for f in backend.get_data_tree(db, folders[""])}
+        assert sorted(d["id"] for d in tree["/a/b"]["data"]) == data_ids[1:]
+
+        assert delete_data_items(data_ids[1:], folders["/a/b"],
+                                 be_session=db) == data_ids[1:]
+
+        tree = {f["path"]: f for f in backend.get_data_tree(db, folders[""])}
+        assert tree["/a/b"]["data"] == []
+        assert [d["id"] for d in tree["/a"]["data"]] == [data_ids[0]]
+    finally:
+        db.execute("DELETE FROM data WHERE id=?", (foreign_id,))
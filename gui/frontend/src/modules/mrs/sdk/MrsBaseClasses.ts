@@ -31,6 +31,18 @@ export class NotFoundError extends Error {
     }
 }
 
+/** Raised when a request failed because of a temporary condition and can be submitted again. */
+export class MrsTransientError extends Error {
+    /**
+     * @param msg The error message.
+     * @param unprocessed Whether the request is known not to have been processed, because it was rejected (429, 503)
+     * or the connection was refused, so submitting it again cannot apply it twice.
+     */
+    public constructor(public msg: string, public unprocessed = false) {
+        super(msg);
+    }
+}
+
 export interface IMrsFetchData {
     [key: string]: unknown,
 }
@@ -87,6 +99,12 @@ declare const mrsLoginResult: IMrsLoginResult | undefined;
  * The session also supports authentication via MRS AuthApps.
  */
 export class MrsBaseSession {
+    /** HTTP status codes of responses that are considered as temporary server-side conditions. */
+    public static readonly transientStatusCodes = [408, 429, 500, 502, 503, 504];
+
+    /** HTTP status codes of responses to requests that were rejected without being processed. */
+    public static readonly unprocessedStatusCodes = [429, 503];
+
     public accessToken?: string;
     public authApp?: string;
     public gtid?: string;
@@ -149,13 +167,23 @@ export class MrsBaseSession {
                 signal: controller.signal,
             });
         } catch (e) {
-            throw new Error(`${errorMsg}\n\nPlease check if MySQL Router is running and the REST endpoint ` +
-                `${this.serviceUrl ?? ""}${input} does exist.\n\n${(e instanceof Error) ? e.message : String(e)}`);
+            const cause = (e as { cause?: { code?: string; }; }).cause;
+
+            throw new MrsTransientError(`${errorMsg}\n\nPlease check if MySQL Router is running and the REST ` +
+                `endpoint ${this.serviceUrl ?? ""}${input} does exist.\n\n` +
+                `${(e instanceof Error) ? e.message : String(e)}`, cause?.code === "ECONNREFUSED");
         } finally {
             clearTimeout(timeoutTimer);
         }
 
         if (!response.ok && autoResponseCheck) {
+            // Temporary server-side conditions can be retried by the caller, e.g. by the bulk commands
+            const failure = (msg: string): Error => {
+                return MrsBaseSession.transientStatusCodes.includes(response.status)
+                    ? new MrsTransientError(msg, MrsBaseSession.unprocessedStatusCodes.includes(response.status))
+                    : new Error(msg);
+            };
+
             // Check if the current session has expired
             if (response.status === 401) {
                 /* this.setState({ restarting: true });
@@ -170,13 +198,13 @@ export class MrsBaseSession {
             try {
                 errorInfo = await response.json();
             } catch (e) {
-                throw new Error(`${response.status}. ${errorMsg} (${response.statusText})`);
+                throw failure(`${response.status}. ${errorMsg} (${response.statusText})`);
             }
             // If there is a message, throw with that message
             if (typeof errorInfo.message === "string") {
-                throw new Error(String(errorInfo.message));
+                throw failure(String(errorInfo.message));
             } else {
-                throw new Error(`${response.status}. ${errorMsg} (${response.statusText})` +
+                throw failure(`${response.status}. ${errorMsg} (${response.statusText})` +
                     `${(errorInfo !== undefined) ? ("\n\n" + JSON.stringify(errorInfo, null, 4) + "\n") : ""}`);
             }
         }
@@ -887,6 +915,37 @@ export type UpdateMatch<Type, PrimaryKeys extends Array<keyof Type>> = {
     [ColumnName in keyof Pick<Type, PrimaryKeys[number]>]-?: Type[ColumnName]
 };
 
+// Bulk API (createMany(), updateMany(), createBatch(), updateBatch(), deleteBatch())
+
+// Records are submitted using a limited number of requests in flight. Records that fail because of a temporary
+// condition (e.g. the router is not reachable or the server is overloaded) are submitted again after a delay that
+// doubles on every attempt.
+export interface IBatchOptions {
+    /** Maximum number of requests in flight at any given time (default: 8). */
+    concurrency?: number;
+    /** Number of times a record is submitted again after a transient failure (default: 3). */
+    retries?: number;
+    /** Delay in milliseconds before the first retry (default: 500). */
+    backoff?: number;
+    /**
+     * Whether records of non-idempotent commands (createMany(), createBatch()) are also submitted again after failures
+     * that may occur once the record has been processed (e.g. 500, 504 or a timeout), which may create duplicates.
+     * Otherwise, such records are only submitted again if the request was rejected (429, 503) or the connection was
+     * refused (default: false).
+     */
+    retryNonIdempotent?: boolean;
+}
+
+// The outcome of each individual record in a bulk operation.
+export interface IMrsBatchResult<Type> {
+    /** Position of the record in the list given to the bulk command. */
+    index: number;
+    ok: boolean;
+    result?: Type;
+    error?: unknown;
+    attempts: number;
+}
+
 export type MrsRequestFilter<Filterable> = {
     $orderby?: ColumnOrder<Filterable>, $asof?: string } & { [key: string]: unknown };
 
@@ -1331,6 +1390,86 @@ export class MrsBaseObjectUpdate<Item extends object, Filterable, PrimaryKeys ex
     };
 }
 
+/** Raised by createMany() and updateMany() when one or more records could not be processed. */
+export class MrsBatchError<T> extends Error {
+    public constructor(public results: Array<IMrsBatchResult<T>>) {
+        super(`${results.filter((result) => { return !result.ok; }).length} of ${results.length} records failed.`);
+    }
+}
+
+/**
+ * Implements the core logic utilized by the bulk commands. A fixed number of workers picks up the records one by one,
+ * so the number of requests in flight is bounded no matter how many records are processed. Records of non-idempotent
+ * commands (idempotent = false) are only retried if they were not processed, unless retryNonIdempotent is set.
+ */
+export class MrsBaseObjectBatch<Input, Output> {
+    public constructor(
+        protected items: Input[],
+        protected submit: (item: Input) => Promise<Output>,
+        protected options: IBatchOptions = {},
+        protected idempotent = true) {
+    }
+
+    /**
+     * Returns the result of each record in the order the records were given or throws an error if any record failed.
+     *
+     * @param results The list returned by fetch().
+     *
+     * @returns The list of results.
+     */
+    public static unwrap = <T>(results: Array<IMrsBatchResult<T>>): T[] => {
+        if (results.some((result) => { return !result.ok; })) {
+            throw new MrsBatchError(results);
+        }
+
+        return results.map((result) => { return result.result as T; });
+    };
+
+    public fetch = async (): Promise<Array<IMrsBatchResult<Output>>> => {
+        const concurrency = Math.max(1, this.options.concurrency ?? 8);
+        const results: Array<IMrsBatchResult<Output>> = new Array(this.items.length);
+        let next = 0;
+
+        const worker = async (): Promise<void> => {
+            while (next < this.items.length) {
+                const index = next++;
+                results[index] = await this.process(index, this.items[index]);
+            }
+        };
+
+        const workers: Array<Promise<void>> = [];
+        for (let i = 0; i < Math.min(concurrency, this.items.length); ++i) {
+            workers.push(worker());
+        }
+        await Promise.all(workers);
+
+        return results;
+    };
+
+    private process = async (index: number, item: Input): Promise<IMrsBatchResult<Output>> => {
+        const retries = Math.max(0, this.options.retries ?? 3);
+        const backoff = this.options.backoff ?? 500;
+        const retryProcessed = this.idempotent || (this.options.retryNonIdempotent ?? false);
+
+        for (let attempts = 1; ; ++attempts) {
+            try {
+                const result = await this.submit(item);
+
+                return { index, ok: true, result, attempts };
+            } catch (error) {
+                if (attempts > retries || !(error instanceof MrsTransientError)
+                    || !(retryProcessed || error.unprocessed)) {
+                    return { index, ok: false, error, attempts };
+                }
+
+                await new Promise((resolve) => {
+                    setTimeout(resolve, backoff * 2 ** (attempts - 1));
+                });
+            }
+        }
+    };
+}
+
 class MrsBaseObjectCall<I, P extends IMrsFetchData> {
     protected constructor(
         protected schema: MrsBaseSchema,
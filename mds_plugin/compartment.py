@@ -23,9 +23,147 @@
 
 """Sub-Module for supporting OCI Compartments"""
 
+import threading
+import time
+
 from mysqlsh.plugin_manager import plugin_function
 from mds_plugin import core, configuration
 
+# The number of seconds after which a cached compartment tree is refreshed
+COMPARTMENT_TREE_TTL = 300
+
+_compartment_trees = {}
+_compartment_trees_lock = threading.Lock()
+
+
+class CompartmentTree:
+    """The compartment tree of a tenancy
+
+    Holds all compartments of the tenancy by id, the active sub-compartments
+    of each compartment and the ids of the active compartments by their lower
+    case path, so paths can be resolved without scanning the compartment list.
+    """
+
+    def __init__(self, tenancy_id, compartments):
+        self.tenancy_id = tenancy_id
+        self.loaded = time.monotonic()
+        self.nodes = {c.id: c for c in compartments}
+        self.children = {}
+        for c in compartments:
+            if c.lifecycle_state != "DELETED":
+                self.children.setdefault(c.compartment_id, []).append(c)
+
+        # Walk the active compartments from the tenancy down to build the paths
+        self.path_ids = {}
+        parents = [(tenancy_id, "")]
+        while parents:
+            parent_id, parent_path = parents.pop()
+            for c in self.children.get(parent_id, []):
+                path = f"{parent_path}/{c.name.lower()}"
+                self.path_ids[path] = c.id
+                parents.append((c.id, path))
+
+    def is_expired(self, ttl=COMPARTMENT_TREE_TTL):
+        return time.monotonic() - self.loaded > ttl
+
+    def get_by_path(self, compartment_path):
+        """Returns the active compartment with the given absolute path or None"""
+        compartment_id = self.path_ids.get(compartment_path.lower())
+        return None if compartment_id is None else self.nodes[compartment_id]
+
+    def get_child_by_name(self, parent_id, name):
+        """Returns the active sub-compartment with the given name or None"""
+        name = name.lower()
+        for c in self.children.get(parent_id, []):
+            if c.name.lower() == name:
+                return c
+
+    def get_descendants(self, compartment_id):
+        """Returns the active compartments below the given one, parents first"""
+        descendants = []
+        parents = [compartment_id]
+        while parents:
+            children = self.children.get(parents.pop(0), [])
+            descendants.extend(children)
+            parents.extend(c.id for c in children)
+
+        return descendants
+
+    def get_full_path(self, compartment_id):
+        """Returns the full display path of the compartment with the given id
+
+        Raises a KeyError if the compartment or one of its parents is unknown.
+        """
+        import re
+
+        full_path = ""
+        comp_id = compartment_id
+        # repeat until the tenancy is reached
+        while comp_id and comp_id != self.tenancy_id:
+            c = self.nodes[comp_id]
+            name = re.sub(r'[\n\r]', ' ',
+                          c.name[:22] + '..'
+                          if len(c.name) > 24
+                          else c.name)
+            full_path = f"/{name}{full_path}"
+            comp_id = c.compartment_id
+
+        return full_path
+
+
+def get_compartment_tree(config, refresh=False):
+    """Returns the compartment tree of the tenancy of the given config
+
+    The trees are cached per config profile and tenancy and are fetched again
+    once they are older than COMPARTMENT_TREE_TTL seconds.
+
+    Args:
+        config (dict): An OCI config object.
+        refresh (bool): Whether to fetch the tree even if it is cached.
+
+    Returns:
+        The CompartmentTree
+    """
+    key = (config.get('profile'), config.get('tenancy'))
+
+    with _compartment_trees_lock:
+        tree = _compartment_trees.get(key)
+    if tree is not None and not refresh and not tree.is_expired():
+        return tree
+
+    # Initialize the identity client
+    identity = core.get_oci_identity_client(config=config)
+
+    # Get the full compartment tree item list of the tenancy, from all pages
+    comp_list = list(core.iter_oci_list(
+        identity.list_compartments,
+        compartment_id=config.get('tenancy'),
+        compartment_id_in_subtree=True))
+
+    tree = CompartmentTree(config.get('tenancy'), comp_list)
+    with _compartment_trees_lock:
+        _compartment_trees[key] = tree
+
+    return tree
+
+
+def clear_compartment_tree_cache(config=None):
+    """Removes cached compartment trees
+
+    Args:
+        config (dict): If given, only the tree of this config's profile and
+            tenancy is removed, otherwise all trees are removed.
+
+    Returns:
+        None
+    """
+    with _compartment_trees_lock:
+        if config is None:
+            _compartment_trees.clear()
+        else:
+            _compartment_trees.pop(
+                (config.get('profile'), config.get('tenancy')), None)
+
 
 def get_compartment_by_id(compartment_id, config, interactive=True):
     """Returns a compartment object for the given id
@@ -120,9 +258,6 @@ def get_compartment_by_path(compartment_path, compartment_id=None,
             return get_compartment_by_id(
                 compartment_id=compartment_id, config=config)
 
-        # Initialize the identity client
-        identity = core.get_oci_identity_client(config=config)
-
         # If .. was given, return the parent compartment's or the tenancy itself
         # if the current compartment is the tenancy
         if compartment_path == '..':
@@ -134,47 +269,22 @@ def get_compartment_by_path(compartment_path, compartment_id=None,
                 return get_compartment_by_id(
                     compartment_id=comp.compartment_id, config=config)
         elif compartment_path.startswith("/"):
-            # Lookup full path in the full compartment tree list
-            data = identity.list_compartments(
-                compartment_id=config.get("tenancy"),
-                compartment_id_in_subtree=True).data
-
-            # Filter out all deleted compartments
-            data = [c for c in data if c.lifecycle_state != "DELETED"]
-
-            path_items = compartment_path[1:].lower().split("/")
-            full_path = ""
-            i = 0
-            parent_id = config.get("tenancy")
-            # Walk the given compartment_path and try to find matching path
-            while i < len(path_items):
-                for c in data:
-                    if c.compartment_id == parent_id and \
-                            c.name.lower() == path_items[i]:
-                        full_path = f"{full_path}/{c.name.lower()}"
-
-                        if full_path == compartment_path.lower():
-                            return c
-
-                        parent_id = c.id
-
-                        break
-                i += 1
+            # Lookup full path in the compartment tree, refreshing it once in
+            # case the compartment was created after the tree was cached
+            comp = get_compartment_tree(config).get_by_path(compartment_path)
+            if comp is None:
+                comp = get_compartment_tree(
+                    config, refresh=True).get_by_path(compartment_path)
+            return comp
         else:
             # Lookup name in the current compartment's list of sub-compartments
-
-            # List the compartments. If no compartment_id was given, take the id
-            # from the tenancy and display full subtree of compartments
-            data = identity.list_compartments(
-                compartment_id=compartment_id,
-                compartment_id_in_subtree=False).data
-
-            # Filter out all deleted compartments
-            data = [c for c in data if c.lifecycle_state != "DELETED"]
-
-            for c in data:
-                if c.name.lower() == compartment_path.lower():
-                    return c
+            tree = get_compartment_tree(config)
+            comp = tree.get_child_by_name(compartment_id, compartment_path)
+            if comp is None:
+                comp = get_compartment_tree(
+                    config, refresh=True).get_child_by_name(
+                        compartment_id, compartment_path)
+            return comp
 
         return None
     except oci.exceptions.ServiceError as e:
@@ -227,59 +337,35 @@ def get_compartment_full_path(compartment_id, config, interactive=True):
         The full path of the compartment
     """
     import oci.identity
-    import re
 
     # If the given compartment_id is the OCID of the tenancy return /
     if not compartment_id or compartment_id == config.get('tenancy'):
         return "/"
     else:
-        # Initialize the identity client
-        identity = core.get_oci_identity_client(config=config)
-
-        # Get the full compartment tree item list of the tenancy
+        # Get the compartment tree of the tenancy
         try:
-            comp_list = identity.list_compartments(
-                compartment_id=config.get('tenancy'),
-                compartment_id_in_subtree=True).data
+            tree = get_compartment_tree(config)
+            try:
+                return tree.get_full_path(compartment_id)
+            except KeyError:
+                # The compartment might have been created after the tree was
+                # cached
+                return get_compartment_tree(
+                    config, refresh=True).get_full_path(compartment_id)
+        except KeyError as e:
+            if not interactive:
+                raise ValueError(
+                    f"Compartment with id {e.args[0]} not found.")
+            print(f"ERROR: Compartment with id {e.args[0]} not found.")
         except oci.exceptions.ServiceError as e:
             if not interactive:
                 raise
             print("Could not list all compartments.\n"
                   f'ERROR: {e.message}. (Code: {e.code}; Status: {e.status})')
-            return
         except Exception as e:
             if not interactive:
                 raise
             print(f'ERROR: {e}')
-            return
-
-        full_path = ""
-        comp_id = compartment_id
-        # repeat until the tenancy is reached
-        while comp_id and comp_id != config.get('tenancy'):
-            # look through complete tree item list
-            id_not_found = True
-            for c in comp_list:
-                # if comp_id is found, insert comp into full_path and set
-                # comp_id to parent
-                if c.id == comp_id:
-                    name = re.sub(r'[\n\r]', ' ',
-                                  c.name[:22] + '..'
-                                  if len(c.name) > 24
-                                  else c.name)
-                    full_path = f"/{name}{full_path}"
-                    comp_id = c.compartment_id
-                    id_not_found = False
-                    break
-
-            if id_not_found:
-                if not interactive:
-                    raise ValueError(
-                        f"Compartment with id {comp_id} not found.")
-                print(f"ERROR: Compartment with id {comp_id} not found.")
-                break
-
-        return full_path
 
 
 def format_compartment_listing(data, current_compartment_id=None):
@@ -481,6 +567,25 @@ def get_availability_domain(**kwargs):
               f'compartment.\nERROR: {str(e)}')
 
 
+def iter_compartments(identity, compartment_id, subtree=False, limit=None):
+    """Lazily yields the compartments that are not deleted
+
+    Args:
+        identity (object): An identity client
+        compartment_id (str): OCID of the parent compartment
+        subtree (bool): Whether to list the full subtree of the compartment
+        limit (int): The maximum number of compartments to yield
+
+    Returns:
+        A generator of Compartment objects
+    """
+    return core.iter_oci_list(
+        identity.list_compartments, limit=limit,
+        predicate=lambda c: c.lifecycle_state != "DELETED",
+        compartment_id=compartment_id, access_level="ANY",
+        compartment_id_in_subtree=subtree)
+
+
 @plugin_function('mds.list.compartments', shell=True, cli=True, web=True)
 def list_compartments(**kwargs):
     """Lists compartments
@@ -495,6 +600,7 @@ def list_compartments(**kwargs):
     Keyword Args:
         compartment_id (str): OCID of the parent compartment
         include_tenancy (bool): Whether to include the tenancy as compartment
+        limit (int): The maximum number of compartments to list
         config (dict): An OCI config object or None
         config_profile (str): The name of an OCI config profile
         interactive (bool): Indicates whether to execute in interactive mode
@@ -507,6 +613,7 @@ def list_compartments(**kwargs):
 
     compartment_id = kwargs.get("compartment_id")
     include_tenancy = kwargs.get("include_tenancy", compartment_id is None)
+    limit = kwargs.get("limit")
 
     config = kwargs.get("config")
     config_profile = kwargs.get("config_profile")
@@ -522,7 +629,6 @@ def list_compartments(**kwargs):
 
         import oci.identity
         import oci.util
-        import oci.pagination
 
         # If no compartment_id is given, return full subtree of the tenancy
         if compartment_id is None:
@@ -534,20 +640,13 @@ def list_compartments(**kwargs):
         # Initialize the identity client
         identity = core.get_oci_identity_client(config=config)
 
-        # List the compartments
-        data = oci.pagination.list_call_get_all_results(
-            identity.list_compartments,
-            compartment_id=compartment_id,
-            access_level="ANY",
-            compartment_id_in_subtree=full_subtree,
-            limit=1000).data
+        # List the compartments that are not deleted
+        data = list(iter_compartments(
+            identity, compartment_id, subtree=full_subtree, limit=limit))
 
         current_compartment_id = configuration.get_current_compartment_id(
             profile_name=config_profile)
 
-        # Filter out all deleted compartments
-        data = [c for c in data if c.lifecycle_state != "DELETED"]
-
         if include_tenancy:
             tenancy = oci.identity.models.Compartment(
                 id=config["tenancy"],
@@ -883,6 +982,7 @@ def create_compartment(**kwargs):
 
         # Create the compartment
         compartment = identity.create_compartment(compartment_details).data
+        clear_compartment_tree_cache(config)
 
         print(f"Compartment {name} is being created.\n")
 
@@ -951,6 +1051,7 @@ def delete_compartment(compartment_path=None, **kwargs):
                 return False
 
         identity.delete_compartment(compartment.id)
+        clear_compartment_tree_cache(config)
 
         print(f"Compartment {compartment.name} is being deleted.")
 
@@ -1040,6 +1141,7 @@ def update_compartment(compartment_path=None, **kwargs):
             description=description
         )
         identity.update_compartment(compartment.id, update_details)
+        clear_compartment_tree_cache(config)
 
         print(f"Compartment {compartment.name} is being updated.")
     except oci.exceptions.ServiceError as e:
@@ -687,6 +687,27 @@ def format_shapes(items) -> str:
     return out
 
 
+def iter_instances(compute, compartment_id, limit=None, display_name=None):
+    """Lazily yields the instances that are not deleted or terminated
+
+    Args:
+        compute (object): A compute client
+        compartment_id (str): OCID of the parent compartment
+        limit (int): The maximum number of instances to yield
+        display_name (str): If given, only instances with this exact name are
+            listed, filtered by the service
+
+    Returns:
+        A generator of Instance objects
+    """
+    kwargs = {} if display_name is None else {"display_name": display_name}
+
+    return core.iter_oci_list(
+        compute.list_instances, limit=limit,
+        predicate=lambda i: i.lifecycle_state not in ["DELETED", "TERMINATED"],
+        compartment_id=compartment_id, **kwargs)
+
+
 @plugin_function('mds.list.computeInstances', shell=True, cli=True, web=True)
 def list_instances(**kwargs):
     """Lists instances
@@ -699,6 +720,7 @@ def list_instances(**kwargs):
 
     Keyword Args:
         compartment_id (str): OCID of the parent compartment.
+        limit (int): The maximum number of instances to list
         config (object): An OCI config object or None.
         config_profile (str): The name of an OCI config profile
         interactive (bool): Indicates whether to execute in interactive mode
@@ -710,6 +732,7 @@ def list_instances(**kwargs):
     """
 
     compartment_id = kwargs.get("compartment_id")
+    limit = kwargs.get("limit")
     config = kwargs.get("config")
     config_profile = kwargs.get("config_profile")
 
@@ -733,13 +756,8 @@ def list_instances(**kwargs):
         # Initialize the identity client
         compute = core.get_oci_compute_client(config=config)
 
-        # List the compute instances
-        instances = compute.list_instances(
-            compartment_id=compartment_id).data
-
-        # Filter out all deleted compartments
-        instances = [c for c in instances if c.lifecycle_state != "DELETED" and
-                     c.lifecycle_state != "TERMINATED"]
+        # List the compute instances that are not deleted or terminated
+        instances = list(iter_instances(compute, compartment_id, limit=limit))
 
         if return_formatted:
             # Get all VNICs of the compartment
@@ -38,6 +38,17 @@
 from mysqlsh.plugin_manager import plugin_function
 from mds_plugin import core
 from os import getenv
+import threading
+
+# Seconds before its token expires that a cached signer is recreated
+SIGNER_EXPIRY_MARGIN = 300
+
+# Configs loaded from OCI config files and parsed CLI rc files, each stored
+# with the signature of the files they were read from
+_config_cache = {}
+_cli_rc_cache = {}
+_instance_principal_signer = None
+_config_cache_lock = threading.Lock()
 
 OCI_REGION_LIST = [
     {"name": "Australia East (Sydney)", "id": "ap-sydney-1", "location": "Sydney, Australia",
@@ -98,6 +109,147 @@ def get_default_config_file_path():
     return config_file_path
 
 
+def get_file_signature(*file_paths):
+    """Returns the modification time and size of the given files
+
+    Files that do not exist are represented by None, so creating them
+    changes the signature as well.
+
+    Args:
+        *file_paths (str): The paths of the files
+
+    Returns:
+        A tuple that changes whenever one of the files changes
+    """
+    import os
+
+    signature = []
+    for file_path in file_paths:
+        try:
+            stat = os.stat(os.path.expanduser(file_path))
+            signature.append((stat.st_mtime_ns, stat.st_size))
+        except (OSError, TypeError):
+            signature.append(None)
+
+    return tuple(signature)
+
+
+def get_cli_rc_file_path(cli_rc_file_path=None):
+    """Returns the absolute path of the OCI CLI rc file
+
+    Args:
+        cli_rc_file_path (str): The location of the OCI CLI config file. If
+            not given, the MYSQLSH_OCI_RC_FILE env_var or the default is used
+
+    Returns:
+        The absolute file path
+    """
+    import os.path
+
+    if cli_rc_file_path is None:
+        cli_rc_file_path = getenv("MYSQLSH_OCI_RC_FILE")
+        if cli_rc_file_path is None:
+            cli_rc_file_path = "~/.oci/oci_cli_rc"
+
+    # Convert Unix path to Windows
+    return os.path.abspath(os.path.expanduser(cli_rc_file_path))
+
+
+def get_cli_rc_config(cli_rc_file_path=None):
+    """Returns the parsed OCI CLI rc file
+
+    The file is only parsed again after it has been changed. The returned
+    parser is shared and must not be modified.
+
+    Args:
+        cli_rc_file_path (str): The location of the OCI CLI config file
+
+    Returns:
+        A configparser.ConfigParser() instance
+    """
+    import configparser
+
+    cli_rc_file_path = get_cli_rc_file_path(cli_rc_file_path)
+    signature = get_file_signature(cli_rc_file_path)
+
+    with _config_cache_lock:
+        cached = _cli_rc_cache.get(cli_rc_file_path)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+
+    config = configparser.ConfigParser()
+    if signature[0] is not None:
+        config.read(cli_rc_file_path)
+
+    with _config_cache_lock:
+        _cli_rc_cache[cli_rc_file_path] = (signature, config)
+
+    return config
+
+
+def get_instance_principal_signer():
+    """Returns an Instance Principals signer
+
+    Creating the signer requires several requests to the instance metadata
+    and auth services, so it is reused until its token is about to expire.
+
+    Returns:
+        The oci.auth.signers.InstancePrincipalsSecurityTokenSigner
+    """
+    import oci.auth
+
+    global _instance_principal_signer
+
+    with _config_cache_lock:
+        signer = _instance_principal_signer
+        if signer is not None:
+            token = getattr(signer.federation_client, "security_token", None)
+            if token is not None and token.valid_with_jitter(
+                    SIGNER_EXPIRY_MARGIN):
+                return signer
+
+        signer = oci.auth.signers.InstancePrincipalsSecurityTokenSigner()
+        _instance_principal_signer = signer
+
+    return signer
+
+
+def forget_cached_file(file_path):
+    """Drops the cached contents of a config or CLI rc file
+
+    Called after writing a file, as the modification time of quickly
+    repeated writes might not change on file systems with coarse timestamps.
+
+    Args:
+        file_path (str): The path of the written file
+
+    Returns:
+        None
+    """
+    import os.path
+
+    file_path = os.path.abspath(os.path.expanduser(file_path))
+
+    with _config_cache_lock:
+        _cli_rc_cache.pop(file_path, None)
+        for key in [key for key in _config_cache if key[0] == file_path]:
+            del _config_cache[key]
+
+
+def clear_config_cache():
+    """Drops all cached configs, CLI rc files and signers
+
+    Returns:
+        None
+    """
+    global _instance_principal_signer
+
+    with _config_cache_lock:
+        _config_cache.clear()
+        _cli_rc_cache.clear()
+        _instance_principal_signer = None
+
+
 @plugin_function('mds.get.regions', shell=True, cli=True, web=True)
 def get_regions():
     """Returns the list of available OCI regions
@@ -129,6 +281,7 @@ def get_config(profile_name=None, config_file_path=None,
     import oci.auth
     import oci.signer
     import oci.exceptions
+    import os.path
     import mysqlsh
 
     # If no profile is given, look it up in the CLI config file
@@ -146,14 +299,30 @@ def get_config(profile_name=None, config_file_path=None,
     # If the profile_name matches instanceprincipal, use an Instance Principals
     # instead of an actual config
     set_global_config = False
+    cache_key = (os.path.abspath(os.path.expanduser(config_file_path)),
+                 profile_name)
+    with _config_cache_lock:
+        cached = _config_cache.get(cache_key)
+
     if profile_name.lower() == "instanceprincipal":
-        signer = oci.auth.signers.InstancePrincipalsSecurityTokenSigner()
+        signer = get_instance_principal_signer()
         config = {
             "signer": signer,
             "tenancy": signer.tenancy_id,
             "region": signer.initialize_and_return_region()}
+    elif cached is not None and cached["signature"] == get_file_signature(
+            config_file_path, cached["config"].get("key_file")):
+        # Neither the config file nor the key file changed since the profile
+        # was loaded, so reuse it together with its signer
+        config = dict(cached["config"])
+
+        # If running in interactive mode and there is no global
+        # config set yet, ensure it gets set
+        if interactive and not 'mds_config' in dir(mysqlsh.globals):
+            set_global_config = True
     else:
         # Load config from file
+        loaded_from_file = False
         try:
             config = oci.config.from_file(
                 file_location=config_file_path, profile_name=profile_name)
@@ -163,6 +332,7 @@ def get_config(profile_name=None, config_file_path=None,
                 raise oci.exceptions.ProfileNotFound()
 
             oci.config.validate_config(config)
+            loaded_from_file = True
 
             # If running in interactive mode and there is no global
             # config set yet, ensure it gets set
@@ -230,6 +400,15 @@ def get_config(profile_name=None, config_file_path=None,
                 print("No or invalid passphrase for API key.")
                 return None
 
+        # Cache the profile read from the file, including the passphrase
+        # that might have been entered
+        if loaded_from_file:
+            with _config_cache_lock:
+                _config_cache[cache_key] = {
+                    "signature": get_file_signature(
+                        config_file_path, config.get("key_file")),
+                    "config": dict(config)}
+
     # Set additional config values like profile and current objects
 
     # Add profile name to the config so it can be used later
@@ -688,6 +867,7 @@ def create_config(**kwargs):
     # Write the change to disk
     with open(config_file_path, 'w') as configfile:
         parser.write(configfile)
+    forget_cached_file(config_file_path)
 
     # Add profile name and default values
     config["profile"] = profile_name
@@ -809,6 +989,9 @@ def load_profile_as_current(profile_name=None, config_file_path=None,
         except:
             pass
 
+        # Drop the OCI clients created for the previous profile
+        core.clear_oci_client_cache()
+
         # Try to load config with the given profile name
         config = get_config(
             profile_name=profile_name, config_file_path=config_file_path,
@@ -1119,6 +1302,7 @@ def set_default_profile(profile_name=None,
     # Write the change to disk
     with open(cli_rc_file_path, 'w') as config_file:
         cli_config.write(config_file)
+    forget_cached_file(cli_rc_file_path)
 
     # Print out that the current compartment was changed
     print(f"Default profile changed to '{profile_name}'.\n")
@@ -1134,26 +1318,11 @@ def get_default_profile(cli_rc_file_path=None):
     Returns:
         None
     """
-    import configparser
-    import os.path
-
     # If the MYSQLSH_OCI_PROFILE env_var has been set, use this as default
     if getenv("MYSQLSH_OCI_PROFILE"):
         return getenv("MYSQLSH_OCI_PROFILE")
 
-    # If no cli_rc_file_path is given, first check the MYSQLSH_OCI_RC_FILE env_var and only then fall back to default
-    if cli_rc_file_path is None:
-        cli_rc_file_path = getenv("MYSQLSH_OCI_RC_FILE")
-        if cli_rc_file_path is None:
-            cli_rc_file_path = "~/.oci/oci_cli_rc"
-
-    # Convert Unix path to Windows
-    cli_rc_file_path = os.path.abspath(
-        os.path.expanduser(cli_rc_file_path))
-
-    config = configparser.ConfigParser()
-    if os.path.exists(cli_rc_file_path):
-        config.read(cli_rc_file_path)
+    config = get_cli_rc_config(cli_rc_file_path)
 
     if "DEFAULT" in config and "profile" in config["DEFAULT"]:
         return config["DEFAULT"]["profile"]
@@ -1201,8 +1370,6 @@ def get_current_value(
     Returns:
         The current value
     """
-    import configparser
-    import os.path
     import mysqlsh
 
     # If passthrough_value is specified, returned it instead of the current
@@ -1221,18 +1388,7 @@ def get_current_value(
         if config and value_name in config:
             return config[value_name]
 
-    # If no cli_rc_file_path is given, first check the MYSQLSH_OCI_RC_FILE env_var and only then fall back to default
-    if cli_rc_file_path is None:
-        cli_rc_file_path = getenv("MYSQLSH_OCI_RC_FILE")
-        if cli_rc_file_path is None:
-            cli_rc_file_path = "~/.oci/oci_cli_rc"
-
-    # Convert Unix path to Windows
-    cli_rc_file_path = os.path.abspath(os.path.expanduser(cli_rc_file_path))
-
-    config = configparser.ConfigParser()
-    if os.path.exists(cli_rc_file_path):
-        config.read(cli_rc_file_path)
+    config = get_cli_rc_config(cli_rc_file_path)
 
     # Get the current profile_name
     profile_name = get_current_profile(profile_name=profile_name)
@@ -1292,6 +1448,7 @@ def set_current_value(value_name, value, profile_name=None,
 
     with open(cli_rc_file_path, 'w') as configfile:
         cli_config.write(configfile)
+    forget_cached_file(cli_rc_file_path)
 
     # Update the global config
     if 'mds_config' in dir(mysqlsh.globals):
@@ -1861,6 +2018,9 @@ def set_current_endpoint(endpoint='', **kwargs):
             value_name="endpoint", value=endpoint,
             profile_name=profile_name, cli_rc_file_path=cli_rc_file_path)
 
+        # Drop the OCI clients created for the previous endpoint
+        core.clear_oci_client_cache()
+
         # Print out that the current DB System was changed
         if interactive:
             if endpoint != "":
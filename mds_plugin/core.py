@@ -23,6 +23,9 @@
 
 """Sub-Module for core functions"""
 
+from collections import OrderedDict
+import threading
+
 from mysqlsh.plugin_manager import plugin_function
 import mysqlsh
 
@@ -190,171 +193,198 @@ def prompt(message, options=None):
     return mysqlsh.globals.shell.prompt(message, options)
 
 
-def get_oci_compute_client(config):
-    import oci.core
+# The maximum number of OCI clients kept by get_oci_client
+OCI_CLIENT_CACHE_SIZE = 64
 
-    compute = oci.core.ComputeClient(
-        config=config, retry_strategy=oci.retry.DEFAULT_RETRY_STRATEGY,
-        signer=config.get("signer"))
+_oci_clients = OrderedDict()
+_oci_clients_lock = threading.Lock()
 
-    # Set a custom endpoint if given
-    endpoint = config.get("endpoint")
-    if endpoint:
-        compute.base_client.endpoint = endpoint
 
-    return compute
+def get_oci_client_cache_key(client_class, config):
+    """Returns the key of an OCI client in the client cache
 
+    The key is made of the client type, the identity of the config profile,
+    the endpoint and the signer, so a client is never shared between
+    different credentials or endpoints.
 
-def get_oci_identity_client(config):
-    import oci.identity
+    Args:
+        client_class (class): The OCI client class
+        config (dict): The OCI config dict
 
-    identity = oci.identity.IdentityClient(
-        config=config, retry_strategy=oci.retry.DEFAULT_RETRY_STRATEGY,
-        signer=config.get("signer"))
+    Returns:
+        A tuple
+    """
+    return (client_class, config.get("profile"), config.get("tenancy"),
+            config.get("user"), config.get("fingerprint"),
+            config.get("region"), config.get("endpoint"),
+            config.get("signer"))
 
-    # Set a custom endpoint if given
-    endpoint = config.get("endpoint")
-    if endpoint:
-        identity.base_client.endpoint = endpoint
 
-    return identity
+def get_oci_client(client_class, config):
+    """Returns an OCI client of the given class for the given config
 
+    Creating an OCI client sets up its signer and HTTP session, so the clients
+    are cached and shared by all calls using the same config. The cache is
+    thread-safe and keeps at most OCI_CLIENT_CACHE_SIZE clients.
 
-def get_oci_object_storage_client(config):
-    import oci.mysql
+    Args:
+        client_class (class): The OCI client class, e.g. oci.core.ComputeClient
+        config (dict): The OCI config dict
 
-    os_client = oci.object_storage.ObjectStorageClient(
+    Returns:
+        The OCI client
+    """
+    import oci.retry
+
+    key = get_oci_client_cache_key(client_class, config)
+
+    with _oci_clients_lock:
+        client = _oci_clients.get(key)
+        if client is not None:
+            _oci_clients.move_to_end(key)
+            return client
+
+    client = client_class(
         config=config, retry_strategy=oci.retry.DEFAULT_RETRY_STRATEGY,
         signer=config.get("signer"))
 
     # Set a custom endpoint if given
     endpoint = config.get("endpoint")
     if endpoint:
-        os_client.base_client.endpoint = endpoint
+        client.base_client.endpoint = endpoint
 
-    return os_client
+    with _oci_clients_lock:
+        # Another thread might have created the same client in the meantime
+        client = _oci_clients.setdefault(key, client)
+        _oci_clients.move_to_end(key)
+        while len(_oci_clients) > OCI_CLIENT_CACHE_SIZE:
+            _oci_clients.popitem(last=False)
 
+    return client
 
-def get_oci_virtual_network_client(config):
-    import oci.core
 
-    virtual_network = oci.core.VirtualNetworkClient(
-        config=config, retry_strategy=oci.retry.DEFAULT_RETRY_STRATEGY,
-        signer=config.get("signer"))
+def clear_oci_client_cache(profile_name=None):
+    """Removes OCI clients from the client cache
 
-    # Set a custom endpoint if given
-    endpoint = config.get("endpoint")
-    if endpoint:
-        virtual_network.base_client.endpoint = endpoint
+    Args:
+        profile_name (str): If given, only the clients of this profile are
+            removed, otherwise all clients are removed
 
-    return virtual_network
+    Returns:
+        None
+    """
+    with _oci_clients_lock:
+        if profile_name is None:
+            _oci_clients.clear()
+            return
 
+        for key in [key for key in _oci_clients if key[1] == profile_name]:
+            del _oci_clients[key]
 
-def get_oci_load_balancer_client(config):
-    import oci.load_balancer
 
-    load_balancer_cl = oci.load_balancer.LoadBalancerClient(
-        config=config, retry_strategy=oci.retry.DEFAULT_RETRY_STRATEGY,
-        signer=config.get("signer"))
+def get_oci_compute_client(config):
+    import oci.core
 
-    # Set a custom endpoint if given
-    endpoint = config.get("endpoint")
-    if endpoint:
-        load_balancer_cl.base_client.endpoint = endpoint
+    return get_oci_client(oci.core.ComputeClient, config)
 
-    return load_balancer_cl
 
+def get_oci_identity_client(config):
+    import oci.identity
 
-def get_oci_mds_client(config):
-    import oci.mysql
+    return get_oci_client(oci.identity.IdentityClient, config)
 
-    # cSpell:ignore Mysqlaas
-    mds_client = oci.mysql.MysqlaasClient(
-        config=config, retry_strategy=oci.retry.DEFAULT_RETRY_STRATEGY,
-        signer=config.get("signer"))
 
-    # Set a custom endpoint if given
-    endpoint = config.get("endpoint")
-    if endpoint:
-        mds_client.base_client.endpoint = endpoint
+def get_oci_object_storage_client(config):
+    import oci.object_storage
 
-    return mds_client
+    return get_oci_client(oci.object_storage.ObjectStorageClient, config)
 
 
-def get_oci_db_system_client(config):
-    import oci.mysql
+def get_oci_virtual_network_client(config):
+    import oci.core
 
-    db_sys = oci.mysql.DbSystemClient(
-        config=config, retry_strategy=oci.retry.DEFAULT_RETRY_STRATEGY,
-        signer=config.get("signer"))
+    return get_oci_client(oci.core.VirtualNetworkClient, config)
 
-    # Set a custom endpoint if given
-    endpoint = config.get("endpoint")
-    if endpoint:
-        db_sys.base_client.endpoint = endpoint
 
-    return db_sys
+def get_oci_load_balancer_client(config):
+    import oci.load_balancer
+
+    return get_oci_client(oci.load_balancer.LoadBalancerClient, config)
 
 
-def get_oci_work_requests_client(config):
+def get_oci_mds_client(config):
     import oci.mysql
 
-    req_client = oci.mysql.WorkRequestsClient(
-        config=config, retry_strategy=oci.retry.DEFAULT_RETRY_STRATEGY,
-        signer=config.get("signer"))
+    # cSpell:ignore Mysqlaas
+    return get_oci_client(oci.mysql.MysqlaasClient, config)
 
-    # Set a custom endpoint if given
-    endpoint = config.get("endpoint")
-    if endpoint:
-        req_client.base_client.endpoint = endpoint
 
-    return req_client
+def get_oci_db_system_client(config):
+    import oci.mysql
 
+    return get_oci_client(oci.mysql.DbSystemClient, config)
 
 
-def get_oci_bastion_client(config):
-    import oci.bastion
+def get_oci_work_requests_client(config):
+    import oci.mysql
 
-    bastion_client = oci.bastion.BastionClient(
-        config=config, retry_strategy=oci.retry.DEFAULT_RETRY_STRATEGY,
-        signer=config.get("signer"))
+    return get_oci_client(oci.mysql.WorkRequestsClient, config)
 
-    # Set a custom endpoint if given
-    endpoint = config.get("endpoint")
-    if endpoint:
-        bastion_client.base_client.endpoint = endpoint
 
-    return bastion_client
+def get_oci_bastion_client(config):
+    import oci.bastion
+
+    return get_oci_client(oci.bastion.BastionClient, config)
 
 
 def get_oci_instance_agent_client(config):
     import oci.compute_instance_agent
 
-    instance_agent_client = oci.compute_instance_agent.PluginClient(
-        config=config, retry_strategy=oci.retry.DEFAULT_RETRY_STRATEGY,
-        signer=config.get("signer"))
+    return get_oci_client(oci.compute_instance_agent.PluginClient, config)
 
-    # Set a custom endpoint if given
-    endpoint = config.get("endpoint")
-    if endpoint:
-        instance_agent_client.base_client.endpoint = endpoint
 
-    return instance_agent_client
+# The number of items requested per page by iter_oci_list
+OCI_LIST_PAGE_SIZE = 1000
 
 
-def get_oci_instance_agent_client(config):
-    import oci.compute_instance_agent
+def iter_oci_list(list_method, limit=None, predicate=None,
+                  page_size=OCI_LIST_PAGE_SIZE, **kwargs):
+    """Lazily yields the items of a paginated OCI list call
 
-    instance_agent_client = oci.compute_instance_agent.PluginClient(
-        config=config, retry_strategy=oci.retry.DEFAULT_RETRY_STRATEGY,
-        signer=config.get("signer"))
+    A page is only fetched once all items of the previous page have been
+    consumed, so callers can stop iterating early without listing everything.
 
-    # Set a custom endpoint if given
-    endpoint = config.get("endpoint")
-    if endpoint:
-        instance_agent_client.base_client.endpoint = endpoint
+    Args:
+        list_method (function): The OCI list method, e.g. compute.list_instances
+        limit (int): The maximum number of items to yield, None for all
+        predicate (function): If given, only items it returns True for are
+            yielded
+        page_size (int): The number of items requested per page
+        **kwargs: The arguments passed to the list method
 
-    return instance_agent_client
+    Returns:
+        A generator of the listed items
+    """
+    import oci.pagination
+
+    if limit is not None:
+        if limit <= 0:
+            return
+        # Do not fetch a full page if only a few items are needed
+        if predicate is None:
+            page_size = min(page_size, limit)
+
+    count = 0
+    for item in oci.pagination.list_call_get_all_results_generator(
+            list_method, "record", limit=page_size, **kwargs):
+        if predicate is not None and not predicate(item):
+            continue
+
+        yield item
+
+        count += 1
+        if limit is not None and count >= limit:
+            return
 
 
 def return_oci_object(oci_object, return_formatted=False,
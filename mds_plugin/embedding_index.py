@@ -0,0 +1,239 @@
+# Copyright (c) 2024, Oracle and/or its affiliates.
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License, version 2.0,
+# as published by the Free Software Foundation.
+#
+# This program is designed to work with certain software (including
+# but not limited to OpenSSL) that is licensed under separate terms, as
+# designated in a particular file or component or in included license
+# documentation.  The authors of MySQL hereby grant you an additional
+# permission to link the program and your derivative works with the
+# separately licensed software that they have either included with
+# the program or referenced in the documentation.
+#
+# This program is distributed in the hope that it will be useful,  but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See
+# the GNU General Public License, version 2.0, for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software Foundation, Inc.,
+# 51 Franklin St, Fifth Floor, Boston, MA 02110-1301 USA
+
+"""Local, memory-mapped index of the embeddings of vector store tables"""
+
+import base64
+import hashlib
+import json
+import os
+import pickle
+import threading
+import time
+
+import numpy as np
+
+# The directory of the index files, relative to the shell user dir
+EMBEDDING_INDEX_DIR = ("plugin_data", "mds_plugin", "embedding_index")
+
+# The seconds an index is used without checking the checksum of its table
+SIGNATURE_CHECK_TTL = 60
+
+# The version of the index files, older files are rebuilt
+INDEX_FORMAT_VERSION = 2
+
+
+def quote_identifier(name):
+    return "`" + name.replace("`", "``") + "`"
+
+
+def get_table_signature(session, schema_name, table_name):
+    """Returns the checksum of the table, None if it cannot be computed
+
+    The checksum is computed by the server, the embeddings are not
+    transferred to detect changes of the table.
+    """
+    try:
+        row = session.run_sql(
+            f"CHECKSUM TABLE {quote_identifier(schema_name)}."
+            f"{quote_identifier(table_name)}").fetch_one()
+    except Exception:
+        return None
+
+    return None if row is None or row[1] is None else str(row[1])
+
+
+def get_primary_key_columns(session, schema_name, table_name):
+    """Returns the names of the primary key columns of the table"""
+    rows = session.run_sql(
+        """SELECT COLUMN_NAME FROM information_schema.STATISTICS
+        WHERE TABLE_SCHEMA = ? AND TABLE_NAME = ? AND INDEX_NAME = 'PRIMARY'
+        ORDER BY SEQ_IN_INDEX""", [schema_name, table_name]).fetch_all()
+
+    return [row[0] for row in rows]
+
+
+def encode_key_value(value):
+    """Returns the JSON representation of a primary key value"""
+    if isinstance(value, (bytes, bytearray)):
+        return {"base64": base64.b64encode(value).decode("ascii")}
+    if value is None or isinstance(value, (str, int, float)):
+        return value
+    # Dates, times and decimals are compared by the server as strings
+    return str(value)
+
+
+def decode_key_value(value):
+    """Returns the primary key value of the given JSON representation"""
+    if isinstance(value, dict):
+        return base64.b64decode(value["base64"])
+    return value
+
+
+class TableEmbeddingIndex:
+    """The embeddings of one table, keyed by the primary key of the rows
+
+    The embeddings are stored as a contiguous float32 matrix in a .npy file
+    that is memory-mapped when loaded. The row keys, the key columns and the
+    table checksum the index was built for are stored in a .json file next
+    to it.
+    """
+
+    def __init__(self, file_path, schema_name, table_name):
+        self.file_path = file_path
+        self.schema_name = schema_name
+        self.table_name = table_name
+        self.signature = None
+        self.checked_at = None
+        self.key_columns = []
+        self.keys = []
+        self.matrix = None
+
+    @property
+    def matrix_path(self):
+        return f"{self.file_path}.npy"
+
+    @property
+    def meta_path(self):
+        return f"{self.file_path}.json"
+
+    def load(self):
+        """Loads the index from disk, returns False if there is none"""
+        try:
+            with open(self.meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            matrix = np.load(self.matrix_path, mmap_mode="r")
+        except (OSError, ValueError):
+            return False
+
+        if meta.get("version") != INDEX_FORMAT_VERSION or \
+                len(meta.get("keys", [])) != matrix.shape[0]:
+            return False
+
+        self.signature = meta.get("signature")
+        self.key_columns = meta.get("key_columns", [])
+        self.keys = [tuple(decode_key_value(value) for value in key)
+                     for key in meta["keys"]]
+        self.matrix = matrix
+
+        return True
+
+    def build(self, session, signature, key_columns, embedding_column):
+        """Reads all embeddings of the table and stores the index on disk"""
+        columns = ", ".join(quote_identifier(column)
+                            for column in key_columns + [embedding_column])
+        rows = session.run_sql(
+            f"SELECT {columns} FROM {quote_identifier(self.schema_name)}."
+            f"{quote_identifier(self.table_name)}").fetch_all()
+
+        keys = [[encode_key_value(row[i]) for i in range(len(key_columns))]
+                for row in rows]
+        if rows:
+            matrix = np.vstack([np.asarray(pickle.loads(row[-1]), dtype=np.float32)
+                                for row in rows])
+        else:
+            matrix = np.empty((0, 0), dtype=np.float32)
+
+        os.makedirs(os.path.dirname(self.file_path), exist_ok=True)
+
+        # Both files are replaced atomically, the metadata last, so a
+        # partially written index is never loaded
+        with open(f"{self.matrix_path}.tmp", "wb") as f:
+            np.save(f, matrix)
+        os.replace(f"{self.matrix_path}.tmp", self.matrix_path)
+
+        with open(f"{self.meta_path}.tmp", "w", encoding="utf-8") as f:
+            json.dump({
+                "version": INDEX_FORMAT_VERSION,
+                "schema_name": self.schema_name,
+                "table_name": self.table_name,
+                "signature": signature,
+                "key_columns": key_columns,
+                "keys": keys,
+            }, f)
+        os.replace(f"{self.meta_path}.tmp", self.meta_path)
+
+        return self.load()
+
+    def get_rows(self, session, keys, columns):
+        """Fetches the given columns of the rows with the given keys"""
+        condition = " AND ".join(
+            f"{quote_identifier(column)} = ?" for column in self.key_columns)
+        sql = (f"SELECT {', '.join(quote_identifier(c) for c in columns)} "
+               f"FROM {quote_identifier(self.schema_name)}."
+               f"{quote_identifier(self.table_name)} WHERE {condition}")
+
+        return [session.run_sql(sql, list(key)).fetch_one() for key in keys]
+
+
+class EmbeddingIndex:
+    """Local embedding indexes of the tables of one or more servers
+
+    The index of a table is rebuilt when the checksum of the table changes.
+    As computing the checksum reads the whole table, it is checked at most
+    once every check_ttl seconds, changes made in between are picked up by
+    the next check. Tables without a primary key or whose checksum cannot be
+    computed are not indexed.
+    """
+
+    def __init__(self, index_dir, check_ttl=SIGNATURE_CHECK_TTL):
+        self.index_dir = index_dir
+        self.check_ttl = check_ttl
+        self._tables = {}
+        self._lock = threading.Lock()
+
+    def get_table_index(self, session, schema_name, table_name,
+                        embedding_column="segment_embedding"):
+        """Returns the up to date index of the table, None if not indexable"""
+        key = json.dumps([getattr(session, "uri", ""), schema_name, table_name])
+        with self._lock:
+            index = self._tables.get(key)
+            if index is None:
+                index = TableEmbeddingIndex(
+                    os.path.join(self.index_dir,
+                                 hashlib.sha256(key.encode("utf-8")).hexdigest()),
+                    schema_name, table_name)
+                index.load()
+                self._tables[key] = index
+
+            now = time.monotonic()
+            if index.matrix is not None and index.checked_at is not None and \
+                    now - index.checked_at < self.check_ttl:
+                return index
+
+            signature = get_table_signature(session, schema_name, table_name)
+            if signature is None:
+                return None
+
+            if index.signature != signature or index.matrix is None:
+                key_columns = get_primary_key_columns(
+                    session, schema_name, table_name)
+                if not key_columns:
+                    return None
+
+                if not index.build(session, signature, key_columns,
+                                   embedding_column):
+                    return None
+
+            index.checked_at = now
+            return index
@@ -24,8 +24,32 @@
 from mysqlsh.plugin_manager import plugin_function
 from mysqlsh.plugin_manager.general import get_shell_user_dir
 from mds_plugin import languages
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
 import os
 import json
+import queue
+import threading
+import weakref
+
+# The model used for translations if none is given
+DEFAULT_TRANSLATION_MODEL_ID = "mistral-7b-instruct-v1"
+
+TRANSLATION_CACHE_FILE_NAME = "translation_cache.jsonl"
+
+# The number of strings translated by a single sys.ml_generate() query
+TRANSLATION_BATCH_SIZE = 20
+
+# Part of the message of the error sys.ml_generate() fails with if the model
+# is not loaded
+MODEL_NOT_LOADED_MESSAGE = "not loaded"
+
+_translation_cache = None
+_translation_cache_lock = threading.Lock()
+
+# The models loaded by sys.ml_model_load() on each session
+_loaded_models = weakref.WeakKeyDictionary()
+_loaded_models_lock = threading.Lock()
 
 
 def check_dependencies():
@@ -144,33 +168,285 @@ def configure_local_model_support(cohere_api_key: str = "", **kwargs):
                     return {"success": False, "error": error}
 
 
-def translate_string(session, text, target_language, model_id=None, source_language="English"):
+class TranslationCache:
+    """Persistent cache of translations
+
+    The translations are keyed by the text, both languages and the model and
+    stored in a JSON lines file that is only ever appended to, so the cache
+    survives restarts of the shell.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        self.translations = {}
+
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                        self.translations[entry["key"]] = entry["translation"]
+                    except (ValueError, KeyError):
+                        # Skip a line cut off by an interrupted write
+                        continue
+
+    @staticmethod
+    def get_key(text, source_language, target_language, model_id):
+        return hashlib.sha256(json.dumps(
+            [text, source_language, target_language, model_id]).encode(
+                "utf-8")).hexdigest()
+
+    def get(self, text, source_language, target_language, model_id):
+        return self.translations.get(self.get_key(
+            text, source_language, target_language, model_id))
+
+    def put(self, text, source_language, target_language, model_id,
+            translation):
+        key = self.get_key(text, source_language, target_language, model_id)
+        with self.lock:
+            if self.translations.get(key) == translation:
+                return
+            self.translations[key] = translation
+
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(
+                    {"key": key, "translation": translation}) + "\n")
+
+
+def get_translation_cache():
+    """Returns the translation cache stored in the shell user dir"""
+    global _translation_cache
+
+    with _translation_cache_lock:
+        if _translation_cache is None:
+            _translation_cache = TranslationCache(os.path.join(
+                get_shell_user_dir(), "plugin_data", "mds_plugin",
+                TRANSLATION_CACHE_FILE_NAME))
+
+        return _translation_cache
+
+
+def parse_translation(translation):
+    """Extracts the translated text from the text generated by the model"""
+    if '"' in translation:
+        return translation.split('"')[1].strip()
+    elif 'The answer' in translation and ':' in translation:
+        return translation.split(':', 1)[1].strip()
+    elif 'The translation of' in translation and ':' in translation:
+        return translation.split(':', 1)[1].strip()
+    else:
+        return translation.strip()
+
+
+def ensure_model_loaded(session, model_id, reload=False):
+    """Loads the model on the session unless it has been loaded before
+
+    Args:
+        session (object): The database session to use.
+        model_id (str): The model to load
+        reload (bool): Whether to load the model even if it is known to be
+            loaded, e.g. after it has been unloaded on the server
+    """
+    with _loaded_models_lock:
+        try:
+            models = _loaded_models.setdefault(session, set())
+        except TypeError:
+            # The session cannot be tracked, load the model every time
+            models = set()
+
+        if model_id in models and not reload:
+            return
+
+    session.run_sql('CALL sys.ml_model_load(?, NULL);', [model_id])
+
+    with _loaded_models_lock:
+        models.add(model_id)
+
+
+def generate_translations(session, texts, target_language, model_id,
+                          source_language):
+    """Translates a batch of strings with a single query
+
+    The strings are passed as a JSON array and turned into rows by
+    JSON_TABLE, so sys.ml_generate() runs once per string on the server but
+    the whole batch only takes one round trip.
+
+    Args:
+        session (object): The database session to use.
+        texts (list): The strings to translate
+        target_language (str): The language to translate to
+        model_id (str): The model to use
+        source_language (str): The language of the strings
+
+    Returns:
+        A dict mapping the strings to their translations
+    """
+    def generate():
+        return session.run_sql("""
+            SELECT t.i, sys.ml_generate(CONCAT(
+                'translate the following text from ', ?, ' to ', ?, ': ',
+                t.text), JSON_OBJECT("model_id", ?))
+            FROM JSON_TABLE(?, '$[*]' COLUMNS(
+                i FOR ORDINALITY, text LONGTEXT PATH '$')) AS t
+            ORDER BY t.i;
+        """, [source_language, target_language, model_id,
+              json.dumps(texts)]).fetch_all()
+
+    ensure_model_loaded(session, model_id)
+    try:
+        rows = generate()
+    except Exception as e:
+        # The model might have been unloaded on the server in the meantime,
+        # any other error is not retried
+        if MODEL_NOT_LOADED_MESSAGE not in str(e).lower():
+            raise
+        ensure_model_loaded(session, model_id, reload=True)
+        rows = generate()
+
+    translations = {}
+    for row in rows:
+        if row[1] is not None:
+            translations[texts[row[0] - 1]] = parse_translation(
+                json.loads(row[1]).get("text"))
+
+    return translations
+
+
+def translate_strings(session, texts, target_language, model_id=None,
+                      source_language="English", max_parallel=1,
+                      password=None):
+    """Translates a list of strings
+
+    Translations are looked up in the persistent translation cache first.
+    The model is only loaded if there is something left to translate and
+    it has not been loaded on the session before. Each distinct string is
+    only translated once, TRANSLATION_BATCH_SIZE strings per query, and
+    the batches can be spread over additional sessions. The given session is
+    only used on the calling thread.
+
+    Args:
+        session (object): The database session to use.
+        texts (list): The strings to translate
+        target_language (str): The language to translate to
+        model_id (str): The model to use
+        source_language (str): The language of the strings
+        max_parallel (int): The number of sessions translating at the same
+            time, including the given one
+        password (str): The password used to open the additional sessions
+
+    Returns:
+        The list of translated strings, in the order of texts
+    """
     if target_language == source_language:
-        return text
+        return list(texts)
 
     if model_id is None:
-        model_id = "mistral-7b-instruct-v1"
-    # Load the mistral language model
-    session.run_sql('CALL sys.ml_model_load(?, NULL);', [model_id])
+        model_id = DEFAULT_TRANSLATION_MODEL_ID
+
+    cache = get_translation_cache()
+    translations = {}
+    for text in texts:
+        if text not in translations:
+            translations[text] = cache.get(
+                text, source_language, target_language, model_id)
+
+    missing = [text for text, translation in translations.items()
+               if translation is None]
+    if not missing:
+        return [translations[text] for text in texts]
+
+    batches = queue.Queue()
+    for i in range(0, len(missing), TRANSLATION_BATCH_SIZE):
+        batches.put(missing[i:i + TRANSLATION_BATCH_SIZE])
+
+    def translate_batches(batch_session):
+        # Each session works through the batches one after another, so the
+        # model is only loaded once per session
+        while True:
+            try:
+                batch = batches.get_nowait()
+            except queue.Empty:
+                return
+
+            for text, translation in generate_translations(
+                    batch_session, batch, target_language, model_id,
+                    source_language).items():
+                translations[text] = translation
+                cache.put(text, source_language, target_language, model_id,
+                          translation)
+
+    # Open the sessions up front, so a password prompt happens here and not
+    # in one of the translation threads
+    sessions = []
+    try:
+        if max_parallel > 1 and batches.qsize() > 1:
+            import mysqlsh
 
-    res = session.run_sql(f"""
-        SELECT sys.ml_generate(CONCAT(
-            'translate the following text from ', ?, ' to ', ?, ': ', ?),
-            JSON_OBJECT("model_id", ?));
-    """, [source_language, target_language, text, model_id])
-    rows = res.fetch_all()
-    if len(rows) > 0:
-        translation = json.loads(rows[0][0]).get("text")
-        if '"' in translation:
-            return translation.split('"')[1].strip()
-        elif 'The answer' in translation and ':' in translation:
-            return translation.split(':', 1)[1].strip()
-        elif 'The translation of' in translation and ':' in translation:
-            return translation.split(':', 1)[1].strip()
+            for _ in range(min(max_parallel, batches.qsize()) - 1):
+                if password is not None:
+                    sessions.append(mysqlsh.globals.shell.open_session(
+                        session.uri, password))
+                else:
+                    sessions.append(
+                        mysqlsh.globals.shell.open_session(session.uri))
+
+        if sessions:
+            with ThreadPoolExecutor(max_workers=len(sessions)) as executor:
+                futures = [executor.submit(translate_batches, s)
+                           for s in sessions]
+                translate_batches(session)
+                for future in futures:
+                    future.result()
         else:
-            return translation.strip()
+            translate_batches(session)
+    finally:
+        for translation_session in sessions:
+            translation_session.close()
 
-    return text
+    # Strings the model did not return anything for are kept as they are
+    return [translations[text] or text for text in texts]
+
+
+def translate_string(session, text, target_language, model_id=None, source_language="English"):
+    return translate_strings(
+        session, [text], target_language=target_language, model_id=model_id,
+        source_language=source_language)[0]
+
+
+@plugin_function("mds.genai.translate", shell=True, cli=True, web=True)
+def translate(texts, target_language, **kwargs):
+    """Translates a list of strings
+
+    Args:
+        texts (list): The strings to translate
+        target_language (str): The language to translate to
+        **kwargs: Additional options
+
+    Keyword Args:
+        model_id (str): The model to use
+        source_language (str): The language of the strings
+        max_parallel (int): The number of sessions translating at the same
+            time, additional sessions are opened with the URI of the session
+        session (object): The database session to use.
+
+    Returns:
+        The list of translated strings, in the order of texts
+    """
+    from mysqlsh import globals
+
+    session = kwargs.get("session")
+    if not session:
+        session = globals.session
+        if not session:
+            raise Exception("No database session specified.")
+
+    return translate_strings(
+        session, texts, target_language=target_language,
+        model_id=kwargs.get("model_id"),
+        source_language=kwargs.get("source_language", "English"),
+        max_parallel=kwargs.get("max_parallel", 1))
 
 
 @plugin_function("mds.genai.chat", shell=True, cli=True, web=True)
@@ -235,6 +511,13 @@ def chat(prompt, **kwargs):
         lang_opts = options.pop("language_options", {})
         language = lang_opts.get("language")
 
+        # The response is translated once it is complete, so only the
+        # untranslated response can be forwarded while it is generated
+        translate_response = language is not None and \
+            lang_opts.get("translate_response") is not False and \
+            language != model_language_name
+        stream = options.get("stream", False) and not translate_response
+
         # If a language has been selected for translation, do the translation
         if language is not None and lang_opts.get("translate_user_prompt") is not False and \
             language != model_language_name:
@@ -269,11 +552,12 @@ def chat(prompt, **kwargs):
             if len(cols) > 0 and cols[0] == "chat_options" and len(rows[0]) > 0:
                 options = json.loads(rows[0][0])
                 send_gui_message("data", options)
-            # Note: For now the last response is ignored since we fetch the @chat_options session var instead
-            # or "response" for the final response that contains all tokens at once
-            # elif len(cols) > 0 and cols[0] == "response" and len(rows[0]) > 0:
-            #     options = { "token": json.loads(rows[0][0]) }
-            #     send_gui_message("data", options)
+            # or "response" for the generated tokens, which are forwarded as
+            # soon as they arrive when streaming. Otherwise they are ignored
+            # since the @chat_options session var holds the full response
+            elif stream and len(cols) > 0 and cols[0] == "response" and len(rows[0]) > 0:
+                for row in rows:
+                    send_gui_message("data", {"token": json.loads(row[0])})
 
             next_result = res.next_result()
 
@@ -282,8 +566,7 @@ def chat(prompt, **kwargs):
         if len(rows) > 0:
             options = json.loads(rows[0][0])
 
-            if language is not None and lang_opts.get("translate_response") is not False and \
-                language != model_language_name:
+            if translate_response:
                 send_gui_message(
                     "data", {"info": f"Translating response from {model_language_name} to {language} ..."})
 
@@ -0,0 +1,286 @@
+# Copyright (c) 2024, Oracle and/or its affiliates.
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License, version 2.0,
+# as published by the Free Software Foundation.
+#
+# This program is designed to work with certain software (including
+# but not limited to OpenSSL) that is licensed under separate terms, as
+# designated in a particular file or component or in included license
+# documentation.  The authors of MySQL hereby grant you an additional
+# permission to link the program and your derivative works with the
+# separately licensed software that they have either included with
+# the program or referenced in the documentation.
+#
+# This program is distributed in the hope that it will be useful,  but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See
+# the GNU General Public License, version 2.0, for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software Foundation, Inc.,
+# 51 Franklin St, Fifth Floor, Boston, MA 02110-1301 USA
+
+"""Parallel loading of schemas into a HeatWave Cluster
+
+A single sys.heatwave_load() call loads the schemas passed to it one after
+another. The HeatWaveLoadScheduler instead issues one call per schema on a
+pool of sessions, running at most one load per session at a time, and
+follows the loaded tables in performance_schema to report their throughput.
+The status of the loads is reported on the thread calling load().
+"""
+
+from concurrent.futures import ThreadPoolExecutor, wait
+import queue
+import time
+
+from mds_plugin import core
+
+# The default number of schemas loaded at the same time
+HEATWAVE_LOAD_MAX_PARALLEL = 4
+
+# The number of seconds between two queries of the table load progress
+PROGRESS_POLL_INTERVAL = 2
+
+# The LOAD_STATUS of a table that has been loaded completely
+TABLE_LOADED_STATUS = "AVAIL_RPDGSTABSTATE"
+
+TABLE_PROGRESS_SQL = """
+    SELECT i.SCHEMA_NAME, i.TABLE_NAME, t.LOAD_STATUS, t.LOAD_PROGRESS,
+        t.NROWS, t.SIZE_BYTES,
+        TIMESTAMPDIFF(MICROSECOND, t.LOAD_START_TIMESTAMP,
+            IFNULL(t.LOAD_END_TIMESTAMP, NOW(6))) / 1000000
+    FROM performance_schema.rpd_tables t
+        JOIN performance_schema.rpd_table_id i ON i.ID = t.ID
+    WHERE i.SCHEMA_NAME IN ({placeholders})
+    """
+
+
+def get_heat_wave_load_sql(schemas, options_json):
+    """Returns the call of sys.heatwave_load() for the given schemas
+
+    Args:
+        schemas (list): The list of schemas
+        options_json (str): The SQL expression of the options JSON object
+
+    Returns:
+        The SQL string
+    """
+    schemas_json = "JSON_ARRAY(" + \
+        ', '.join(f'"{s}"' for s in schemas) + ")"
+
+    return f"CALL sys.heatwave_load({schemas_json}, {options_json})"
+
+
+def format_results(res):
+    """Fetches all result sets of a statement and formats them as tables
+
+    Args:
+        res (object): The result of session.run_sql()
+
+    Returns:
+        A list with one formatted string per non-empty result set
+    """
+    results = []
+    next_result = True
+    while next_result:
+        rows = res.fetch_all()
+        if len(rows) > 0:
+            results.append(
+                core.format_result_set(res, rows, addFooter=False))
+
+        next_result = res.next_result()
+
+    return results
+
+
+def format_table_load(table):
+    """Returns a line describing the load of a table and its throughput
+
+    Args:
+        table (dict): The table info as reported by the scheduler
+
+    Returns:
+        The formatted string
+    """
+    from mds_plugin.object_store import sizeof_fmt
+
+    line = (f"{table['schema']}.{table['table']}: {table['rows']} rows, "
+            f"{sizeof_fmt(table['size_bytes'])} in {table['seconds']:.1f}s")
+    if table.get("rows_per_second") is not None:
+        line += (f" ({table['rows_per_second']:.0f} rows/s, "
+                 f"{sizeof_fmt(int(table['bytes_per_second']))}/s)")
+
+    return line
+
+
+class HeatWaveLoadScheduler:
+    """Loads schemas into a HeatWave Cluster in parallel
+
+    Each schema is loaded by its own sys.heatwave_load() call, so the memory
+    check of the load options only covers the schema of that call.
+    """
+
+    def __init__(self, sessions, status_fn, progress_session=None,
+                 poll_interval=PROGRESS_POLL_INTERVAL) -> None:
+        """
+        sessions: the sessions the loads are run on, one load per session
+            at a time
+        status_fn: callback(status_data)
+        progress_session: the session used to query the table progress, must
+            not be one of the sessions, None disables the progress tracking
+        poll_interval: the number of seconds between two progress queries
+
+        status_data may be one of:
+            {"status": "BEGIN", "schema": schema}
+            {"status": "END", "schema": schema, "results": formatted_results, "seconds": seconds}
+            {"status": "ERROR", "schema": schema, "error": exception}
+            {"status": "PROGRESS"} | table
+
+        where table is {"schema": ..., "table": ..., "load_status": ...,
+        "load_progress": ..., "rows": ..., "size_bytes": ..., "seconds": ...}
+        with "rows_per_second" and "bytes_per_second" added once the table is
+        loaded.
+        """
+        self.sessions = sessions
+        self.status_fn = status_fn
+        self.progress_session = progress_session
+        self.poll_interval = poll_interval
+        self.tables = {}
+        # The status of the loads, passed to status_fn by load()
+        self.status_queue = queue.Queue()
+
+    def _load_schema(self, schema, options_json, session_pool):
+        session = session_pool.get()
+        try:
+            self.status_queue.put({"status": "BEGIN", "schema": schema})
+            start = time.monotonic()
+
+            res = session.run_sql(
+                get_heat_wave_load_sql([schema], options_json))
+            results = format_results(res)
+
+            self.status_queue.put({
+                "status": "END", "schema": schema, "results": results,
+                "seconds": time.monotonic() - start})
+
+            return results
+        except Exception as e:
+            self.status_queue.put(
+                {"status": "ERROR", "schema": schema, "error": e})
+            raise
+        finally:
+            session_pool.put(session)
+
+    def _process_status(self, timeout):
+        """Passes the queued status to status_fn
+
+        Waits up to timeout seconds for a status to be queued, a timeout of
+        None does not wait.
+        """
+        try:
+            while True:
+                if timeout is None:
+                    status = self.status_queue.get(block=False)
+                else:
+                    status = self.status_queue.get(timeout=timeout)
+                    timeout = None
+                self.status_fn(status)
+        except queue.Empty:
+            pass
+
+    def _poll_progress(self, schemas):
+        if self.progress_session is None:
+            return
+
+        try:
+            res = self.progress_session.run_sql(
+                TABLE_PROGRESS_SQL.format(
+                    placeholders=", ".join("?" * len(schemas))),
+                list(schemas))
+            rows = res.fetch_all()
+        except Exception:
+            # The progress is not available, e.g. without a HeatWave Cluster
+            self.progress_session = None
+            return
+
+        for row in rows:
+            table = {
+                "schema": row[0],
+                "table": row[1],
+                "load_status": row[2],
+                "load_progress": float(row[3] or 0),
+                "rows": int(row[4] or 0),
+                "size_bytes": int(row[5] or 0),
+                "seconds": float(row[6] or 0)}
+            if table["load_status"] == TABLE_LOADED_STATUS and \
+                    table["seconds"] > 0:
+                table["rows_per_second"] = table["rows"] / table["seconds"]
+                table["bytes_per_second"] = \
+                    table["size_bytes"] / table["seconds"]
+
+            key = (table["schema"], table["table"])
+            previous = self.tables.get(key)
+            self.tables[key] = table
+            if previous is None or \
+                    previous["load_status"] != table["load_status"] or \
+                    previous["load_progress"] != table["load_progress"]:
+                self.status_fn({"status": "PROGRESS"} | table)
+
+    def load(self, schemas, options_json):
+        """Loads the given schemas
+
+        Args:
+            schemas (list): The list of schemas
+            options_json (str): The SQL expression of the options JSON object
+
+        Returns:
+            A dict mapping each schema to the list of its formatted results
+            or to the exception its load failed with
+        """
+        session_pool = queue.Queue()
+        for session in self.sessions:
+            session_pool.put(session)
+
+        with ThreadPoolExecutor(max_workers=len(self.sessions)) as executor:
+            futures = {
+                executor.submit(
+                    self._load_schema, schema, options_json, session_pool):
+                schema for schema in schemas}
+
+            pending = set(futures)
+            next_poll = time.monotonic() + self.poll_interval
+            while pending:
+                self._process_status(max(0, next_poll - time.monotonic()))
+                _, pending = wait(pending, timeout=0)
+
+                if time.monotonic() >= next_poll or not pending:
+                    self._poll_progress(schemas)
+                    next_poll = time.monotonic() + self.poll_interval
+
+        # The status of the last loads
+        self._process_status(None)
+
+        results = {}
+        for future, schema in futures.items():
+            error = future.exception()
+            results[schema] = error if error is not None else future.result()
+
+        return results
+
+
+def parallel_heat_wave_load(schemas, options_json, sessions, status_fn,
+                            progress_session=None,
+                            poll_interval=PROGRESS_POLL_INTERVAL):
+    """Loads the given schemas into a HeatWave Cluster in parallel
+
+    See HeatWaveLoadScheduler for the arguments and status_data.
+
+    Returns:
+        A tuple of the results per schema and the list of loaded tables
+    """
+    scheduler = HeatWaveLoadScheduler(
+        sessions, status_fn, progress_session, poll_interval)
+    results = scheduler.load(schemas, options_json)
+
+    return results, list(scheduler.tables.values())
@@ -52,6 +52,7 @@ class mds():
         from mds_plugin import core, general, compartment, compute
         from mds_plugin import configuration, mysql_database_service, network
         from mds_plugin import object_store, user, bastion, util, genai
+        from mds_plugin import inventory
 
     class create():
         """Used to create OCI objects.
@@ -0,0 +1,260 @@
+# Copyright (c) 2024, Oracle and/or its affiliates.
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License, version 2.0,
+# as published by the Free Software Foundation.
+#
+# This program is designed to work with certain software (including
+# but not limited to OpenSSL) that is licensed under separate terms, as
+# designated in a particular file or component or in included license
+# documentation.  The authors of MySQL hereby grant you an additional
+# permission to link the program and your derivative works with the
+# separately licensed software that they have either included with
+# the program or referenced in the documentation.
+#
+# This program is distributed in the hope that it will be useful,  but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See
+# the GNU General Public License, version 2.0, for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software Foundation, Inc.,
+# 51 Franklin St, Fifth Floor, Boston, MA 02110-1301 USA
+
+"""Sub-Module to take an inventory of the OCI resources of a tenancy
+
+The list calls for all compartments and resource types are fanned out onto a
+bounded thread pool, throttled by a shared rate limiter and merged into a
+single InventorySnapshot.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+import datetime
+import threading
+import time
+
+from mysqlsh.plugin_manager import plugin_function
+from mds_plugin import core, configuration
+
+# The default number of concurrent list calls
+INVENTORY_MAX_WORKERS = 8
+
+# The default number of list calls per second, OCI throttles with 429 errors
+# well above that
+INVENTORY_REQUESTS_PER_SECOND = 10
+
+# The resource types of the inventory with the function returning their
+# client, the name of their list method and the lifecycle states to skip
+INVENTORY_RESOURCE_TYPES = {
+    "dbSystems": (core.get_oci_db_system_client, "list_db_systems",
+                  ["DELETED"]),
+    "computeInstances": (core.get_oci_compute_client, "list_instances",
+                         ["DELETED", "TERMINATED"]),
+    "networks": (core.get_oci_virtual_network_client, "list_vcns",
+                 ["TERMINATED"]),
+    "bastions": (core.get_oci_bastion_client, "list_bastions", ["DELETED"]),
+}
+
+
+class RateLimiter:
+    """A thread-safe token bucket allowing rate calls per second on average
+    and bursts of up to burst calls"""
+
+    def __init__(self, rate, burst=None):
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1, rate)
+        self.tokens = self.burst
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """Blocks until a call is allowed"""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(
+                    self.burst, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                delay = (1 - self.tokens) / self.rate
+            time.sleep(delay)
+
+    def wrap(self, fn):
+        """Returns fn throttled by this rate limiter"""
+        def throttled(*args, **kwargs):
+            self.acquire()
+            return fn(*args, **kwargs)
+
+        return throttled
+
+
+class InventoryError:
+    """A list call of the inventory that failed"""
+
+    def __init__(self, resource_type, compartment_id, error):
+        self.resource_type = resource_type
+        self.compartment_id = compartment_id
+        self.error = error
+
+    def to_dict(self):
+        return {
+            "resource_type": self.resource_type,
+            "compartment_id": self.compartment_id,
+            "error": str(self.error),
+        }
+
+
+class InventorySnapshot:
+    """The resources of a set of compartments at a point in time
+
+    resources maps each resource type to the list of its OCI model objects,
+    compartments holds the listed compartments and errors the failed list
+    calls, so a partial snapshot is returned instead of failing entirely.
+    """
+
+    def __init__(self, compartments, resources, errors, taken):
+        self.compartments = compartments
+        self.resources = resources
+        self.errors = errors
+        self.taken = taken
+
+    def to_dict(self):
+        import oci.util
+
+        return {
+            "taken": self.taken.isoformat(),
+            "compartments": oci.util.to_dict(self.compartments),
+            "resources": {
+                resource_type: oci.util.to_dict(items)
+                for resource_type, items in self.resources.items()},
+            "errors": [e.to_dict() for e in self.errors],
+        }
+
+
+def take_inventory(config, compartment_id=None, resource_types=None,
+                   max_workers=INVENTORY_MAX_WORKERS,
+                   requests_per_second=INVENTORY_REQUESTS_PER_SECOND):
+    """Lists the resources of a compartment and all its sub-compartments
+
+    Args:
+        config (dict): An OCI config object
+        compartment_id (str): OCID of the root compartment, the tenancy if
+            None
+        resource_types (list): The keys of INVENTORY_RESOURCE_TYPES to list,
+            all if None
+        max_workers (int): The maximum number of concurrent list calls
+        requests_per_second (float): The maximum average number of list calls
+            per second
+
+    Returns:
+        An InventorySnapshot
+    """
+    from mds_plugin import compartment
+
+    if compartment_id is None:
+        compartment_id = config.get("tenancy")
+    if resource_types is None:
+        resource_types = list(INVENTORY_RESOURCE_TYPES.keys())
+
+    for resource_type in resource_types:
+        if resource_type not in INVENTORY_RESOURCE_TYPES:
+            raise ValueError(f"Unknown resource type {resource_type}.")
+
+    limiter = RateLimiter(requests_per_second)
+    taken = datetime.datetime.now(datetime.timezone.utc)
+
+    compartments = compartment.get_compartment_tree(config).get_descendants(
+        compartment_id)
+
+    # Make the list methods of all resource types throttled by the limiter
+    list_methods = {}
+    for resource_type in resource_types:
+        get_client, list_method_name, _ = INVENTORY_RESOURCE_TYPES[
+            resource_type]
+        list_methods[resource_type] = limiter.wrap(
+            getattr(get_client(config), list_method_name))
+
+    def list_resources(resource_type, comp_id):
+        skipped_states = INVENTORY_RESOURCE_TYPES[resource_type][2]
+        return list(core.iter_oci_list(
+            list_methods[resource_type],
+            predicate=lambda r: r.lifecycle_state not in skipped_states,
+            compartment_id=comp_id))
+
+    tasks = [(resource_type, comp_id)
+             for comp_id in [compartment_id] + [c.id for c in compartments]
+             for resource_type in resource_types]
+
+    resources = {resource_type: [] for resource_type in resource_types}
+    errors = []
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [(task, executor.submit(list_resources, *task))
+                   for task in tasks]
+
+        # Merge the results in task order to get a deterministic snapshot
+        for (resource_type, comp_id), future in futures:
+            try:
+                resources[resource_type].extend(future.result())
+            except Exception as e:
+                errors.append(InventoryError(resource_type, comp_id, e))
+
+    return InventorySnapshot(compartments, resources, errors, taken)
+
+
+@plugin_function('mds.list.inventory', shell=True, cli=True, web=True)
+def list_inventory(**kwargs):
+    """Lists the resources of a compartment and all its sub-compartments
+
+    The list calls for all compartments and resource types run concurrently.
+
+    Args:
+        **kwargs: Optional parameters
+
+    Keyword Args:
+        compartment_id (str): OCID of the root compartment, the tenancy if
+            not given.
+        resource_types (list): The resource types to list, one or more of
+            dbSystems, computeInstances, networks and bastions.
+        max_workers (int): The maximum number of concurrent list calls.
+        requests_per_second (float): The maximum number of list calls per second.
+        config (object): An OCI config object or None.
+        config_profile (str): The name of an OCI config profile
+        interactive (bool): Indicates whether to execute in interactive mode
+        raise_exceptions (bool): If set to true exceptions are raised
+
+    Returns:
+        A dict with the compartments, the resources by type and the errors
+    """
+    compartment_id = kwargs.get("compartment_id")
+    resource_types = kwargs.get("resource_types")
+    max_workers = kwargs.get("max_workers", INVENTORY_MAX_WORKERS)
+    requests_per_second = kwargs.get(
+        "requests_per_second", INVENTORY_REQUESTS_PER_SECOND)
+
+    config = kwargs.get("config")
+    config_profile = kwargs.get("config_profile")
+
+    interactive = kwargs.get("interactive", core.get_interactive_default())
+    raise_exceptions = kwargs.get("raise_exceptions", not interactive)
+
+    import oci.exceptions
+
+    try:
+        config = configuration.get_current_config(
+            config=config, config_profile=config_profile,
+            interactive=interactive)
+
+        return take_inventory(
+            config, compartment_id=compartment_id,
+            resource_types=resource_types, max_workers=max_workers,
+            requests_per_second=requests_per_second).to_dict()
+    except oci.exceptions.ServiceError as e:
+        if raise_exceptions:
+            raise
+        print(f'ERROR: {e.message}. (Code: {e.code}; Status: {e.status})')
+    except Exception as e:
+        if raise_exceptions:
+            raise
+        print(f'ERROR: {e}')
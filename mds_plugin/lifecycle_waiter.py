@@ -0,0 +1,282 @@
+# Copyright (c) 2024, Oracle and/or its affiliates.
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License, version 2.0,
+# as published by the Free Software Foundation.
+#
+# This program is designed to work with certain software (including
+# but not limited to OpenSSL) that is licensed under separate terms, as
+# designated in a particular file or component or in included license
+# documentation.  The authors of MySQL hereby grant you an additional
+# permission to link the program and your derivative works with the
+# separately licensed software that they have either included with
+# the program or referenced in the documentation.
+#
+# This program is distributed in the hope that it will be useful,  but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See
+# the GNU General Public License, version 2.0, for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software Foundation, Inc.,
+# 51 Franklin St, Fifth Floor, Boston, MA 02110-1301 USA
+
+"""Shared waiter for OCI resources to reach a lifecycle state
+
+Instead of blocking one thread per resource with a fixed interval polling
+loop, all pending waits are multiplexed onto a single poller thread. Each
+wait backs off exponentially with jitter, and the waits that are due for
+resources of the same compartment are served by a single list call.
+The progress of a wait is passed to the waiting thread through a queue, so
+no caller code runs on the poller thread.
+"""
+
+from concurrent.futures import Future, InvalidStateError
+import heapq
+import itertools
+import random
+import threading
+import time
+
+from mds_plugin import core
+
+# The first and the maximum number of seconds between two polls of a resource
+MIN_POLL_INTERVAL = 2
+MAX_POLL_INTERVAL = 30
+
+# The factor the poll interval grows by after each poll
+POLL_BACKOFF = 1.5
+
+# The relative random variation applied to each poll interval
+POLL_JITTER = 0.2
+
+_waiter = None
+_waiter_lock = threading.Lock()
+
+
+class LifecycleWait:
+    """A pending wait for a resource to satisfy a predicate"""
+
+    def __init__(self, resource_id, compartment_id, get_fn, list_fn,
+                 predicate, deadline, progress_queue):
+        self.resource_id = resource_id
+        self.compartment_id = compartment_id
+        self.get_fn = get_fn
+        self.list_fn = list_fn
+        self.predicate = predicate
+        self.deadline = deadline
+        self.progress_queue = progress_queue
+        self.interval = MIN_POLL_INTERVAL
+        self.polls = 0
+        self.future = Future()
+
+    @property
+    def group(self):
+        """The key of the waits that can be served by the same list call"""
+        if self.list_fn is None or self.compartment_id is None:
+            return (self,)
+        return (self.list_fn, self.compartment_id)
+
+
+class LifecycleWaiter:
+    """Multiplexes lifecycle waits onto a single poller thread
+
+    Use wait() to register a wait and get a concurrent.futures.Future that
+    is resolved with the resource once the predicate is satisfied, or fails
+    with a TimeoutError once the timeout has passed.
+    """
+
+    def __init__(self):
+        self._lock = threading.Condition()
+        self._due = []
+        self._sequence = itertools.count()
+        self._thread = None
+
+    def wait(self, resource_id, get_fn, predicate, timeout, list_fn=None,
+             compartment_id=None, progress_queue=None):
+        """Registers a wait for a resource
+
+        Args:
+            resource_id (str): The OCID of the resource
+            get_fn (function): Called with the OCID, returns a response with
+                the resource as data, e.g. db_sys.get_db_system
+            predicate (function): Called with the resource, returns True once
+                the wait is over
+            timeout (float): The number of seconds to wait at most
+            list_fn (function): If given with compartment_id, called with the
+                compartment_id to fetch the resources of all the waits for the
+                same compartment at once, e.g. db_sys.list_db_systems
+            compartment_id (str): The OCID of the compartment of the resource
+            progress_queue (queue.Queue): If given, a tuple of the resource
+                and the number of polls is put on it each time the predicate
+                is not satisfied yet, and None once the future is done, see
+                process_progress()
+
+        Returns:
+            A concurrent.futures.Future
+        """
+        wait = LifecycleWait(
+            resource_id, compartment_id, get_fn, list_fn, predicate,
+            time.monotonic() + timeout, progress_queue)
+        if progress_queue is not None:
+            wait.future.add_done_callback(lambda _: progress_queue.put(None))
+
+        with self._lock:
+            self._schedule(wait, time.monotonic())
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._poll, name="LifecycleWaiter", daemon=True)
+                self._thread.start()
+            self._lock.notify()
+
+        return wait.future
+
+    def _schedule(self, wait, due):
+        heapq.heappush(self._due, (due, next(self._sequence), wait))
+
+    def _next_interval(self, wait):
+        interval = wait.interval * random.uniform(
+            1 - POLL_JITTER, 1 + POLL_JITTER)
+        wait.interval = min(MAX_POLL_INTERVAL, wait.interval * POLL_BACKOFF)
+        return interval
+
+    def _take_due_waits(self):
+        """Blocks until waits are due and returns them"""
+        with self._lock:
+            while True:
+                now = time.monotonic()
+                if self._due and self._due[0][0] <= now:
+                    break
+                self._lock.wait(
+                    timeout=self._due[0][0] - now if self._due else None)
+
+            waits = []
+            while self._due and self._due[0][0] <= now:
+                waits.append(heapq.heappop(self._due)[2])
+
+            # The list call of a group is made anyway, so the waits of the
+            # same group that are not due yet are polled along for free
+            groups = {w.group for w in waits if w.group != (w,)}
+            if groups:
+                pending = []
+                for entry in self._due:
+                    if entry[2].group in groups:
+                        waits.append(entry[2])
+                    else:
+                        pending.append(entry)
+                heapq.heapify(pending)
+                self._due = pending
+
+        return waits
+
+    @staticmethod
+    def _fetch(waits):
+        """Returns the current resources of the given waits of one group"""
+        if len(waits) == 1 or waits[0].list_fn is None:
+            return {w.resource_id: w.get_fn(w.resource_id).data for w in waits}
+
+        resources = {
+            r.id: r for r in core.iter_oci_list(
+                waits[0].list_fn, compartment_id=waits[0].compartment_id)}
+
+        # Resources missing from the listing are fetched one by one
+        for w in waits:
+            if w.resource_id not in resources:
+                resources[w.resource_id] = w.get_fn(w.resource_id).data
+
+        return resources
+
+    @staticmethod
+    def _is_transient(e):
+        status = getattr(e, "status", None)
+        return status is not None and (status == 429 or status >= 500)
+
+    def _poll(self):
+        while True:
+            groups = {}
+            for wait in self._take_due_waits():
+                if not wait.future.cancelled():
+                    groups.setdefault(wait.group, []).append(wait)
+
+            for waits in groups.values():
+                resources, error = None, None
+                try:
+                    resources = self._fetch(waits)
+                except Exception as e:
+                    error = e
+
+                for wait in waits:
+                    self._update(wait, resources, error)
+
+    @staticmethod
+    def _complete(wait, result=None, error=None):
+        """Completes the future of the wait unless it is done already"""
+        # The caller can cancel the future at any time, even while it is
+        # polled, which must not end the poller thread
+        try:
+            if error is not None:
+                wait.future.set_exception(error)
+            else:
+                wait.future.set_result(result)
+        except InvalidStateError:
+            pass
+
+    def _update(self, wait, resources, error):
+        now = time.monotonic()
+        wait.polls += 1
+
+        if wait.future.done():
+            return
+
+        if error is not None and not self._is_transient(error):
+            self._complete(wait, error=error)
+            return
+
+        resource = None if resources is None else resources.get(wait.resource_id)
+        try:
+            reached = resource is not None and wait.predicate(resource)
+        except Exception as e:
+            self._complete(wait, error=e)
+            return
+
+        if reached:
+            self._complete(wait, result=resource)
+            return
+
+        if now >= wait.deadline:
+            self._complete(wait, error=TimeoutError(
+                f"The resource {wait.resource_id} did not reach the "
+                "expected state in time."))
+            return
+
+        if resource is not None and wait.progress_queue is not None:
+            wait.progress_queue.put((resource, wait.polls))
+
+        with self._lock:
+            self._schedule(wait, min(
+                now + self._next_interval(wait), wait.deadline))
+
+
+def process_progress(progress_queue, progress_fn):
+    """Passes the progress of a wait to progress_fn until the wait is done
+
+    Args:
+        progress_queue (queue.Queue): The progress_queue given to wait()
+        progress_fn (function): Called with the resource and the number of
+            polls on the calling thread
+    """
+    while True:
+        progress = progress_queue.get()
+        if progress is None:
+            return
+        progress_fn(*progress)
+
+
+def get_lifecycle_waiter():
+    """Returns the LifecycleWaiter shared by all mds_plugin modules"""
+    global _waiter
+
+    with _waiter_lock:
+        if _waiter is None:
+            _waiter = LifecycleWaiter()
+        return _waiter
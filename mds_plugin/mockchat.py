@@ -22,6 +22,8 @@
 import numpy as np
 import pickle
 import json
+import os
+from collections import OrderedDict
 from typing import Callable, Tuple
 
 from sentence_transformers import SentenceTransformer
@@ -31,11 +33,56 @@ import cohere
 
 import threading
 import mysqlsh
+from mysqlsh.plugin_manager.general import get_shell_user_dir
+
+from mds_plugin.embedding_index import EMBEDDING_INDEX_DIR, EmbeddingIndex
 
 DATA_TYPE_INFO = "info"
 DATA_TYPE_TOKEN = "token"
 DATA_TYPE_OPTIONS = "options"
 
+# The number of query embeddings kept for repeated prompts
+QUERY_EMBEDDING_CACHE_SIZE = 256
+
+
+def top_k_by_distance(query_emb, embeddings, k):
+    """Finds the k embeddings closest to the query embedding
+
+    The euclidean distances are computed in one matrix operation and the k
+    nearest are selected with argpartition instead of sorting all of them.
+
+    Args:
+        query_emb: The query embedding
+        embeddings: The document embeddings, a matrix or a list of vectors
+        k (int): The number of embeddings to return
+
+    Returns:
+        A tuple with the indexes of the k nearest embeddings and their
+        distances, ordered by distance
+    """
+    matrix = np.asarray(embeddings) if isinstance(
+        embeddings, np.ndarray) else np.vstack(embeddings)
+    query_emb = np.asarray(query_emb, dtype=matrix.dtype)
+
+    k = min(k, matrix.shape[0])
+    if k <= 0:
+        return np.empty(0, dtype=np.intp), np.empty(0, dtype=matrix.dtype)
+
+    # |a - q|^2 = |a|^2 - 2 a.q + |q|^2, without allocating a - q
+    distances = np.einsum("ij,ij->i", matrix, matrix)
+    distances -= 2 * (matrix @ query_emb)
+    distances += query_emb @ query_emb
+    np.maximum(distances, 0, out=distances)
+    np.sqrt(distances, out=distances)
+
+    if k < distances.shape[0]:
+        indexes = np.argpartition(distances, k - 1)[:k]
+    else:
+        indexes = np.arange(distances.shape[0])
+    indexes = indexes[np.argsort(distances[indexes], kind="stable")]
+
+    return indexes, distances[indexes]
+
 
 def interactive_mode_set():
     """Checks the current status of interactive mode
@@ -53,6 +100,43 @@ def interactive_mode_set():
 g_cohere_api_key = None
 g_chat = None
 g_embedding_model = None
+g_embedding_index = None
+g_query_embeddings = OrderedDict()
+g_query_embeddings_model = None
+g_query_embeddings_lock = threading.Lock()
+
+
+def encode_query(model, text):
+    """Returns the embedding of the text, cached for repeated prompts"""
+    global g_query_embeddings_model
+    with g_query_embeddings_lock:
+        if g_query_embeddings_model is not model:
+            g_query_embeddings.clear()
+            g_query_embeddings_model = model
+
+        embedding = g_query_embeddings.get(text)
+        if embedding is not None:
+            g_query_embeddings.move_to_end(text)
+            return embedding
+
+    embedding = model.encode(text)
+
+    with g_query_embeddings_lock:
+        if g_query_embeddings_model is model:
+            g_query_embeddings[text] = embedding
+            while len(g_query_embeddings) > QUERY_EMBEDDING_CACHE_SIZE:
+                g_query_embeddings.popitem(last=False)
+
+    return embedding
+
+
+def get_embedding_index():
+    """Returns the embedding index stored in the shell user dir"""
+    global g_embedding_index
+    if g_embedding_index is None:
+        g_embedding_index = EmbeddingIndex(os.path.join(
+            get_shell_user_dir(), *EMBEDDING_INDEX_DIR))
+    return g_embedding_index
 
 # template types:
 #  - find documents
@@ -89,6 +173,9 @@ class Template:
     def __init__(self) -> None:
         pass
 
+    def prepare(self, session):
+        pass
+
     def _query_topk(self, session, k, max_dist):
         raise NotImplemented()
 
@@ -123,6 +210,22 @@ class GenericDocumentTableTemplate(Template):
             "segment_embedding",
         ]
         self._model = g_embedding_model
+        self._index = get_embedding_index()
+        self._indexed_tables = {}
+
+    def prepare(self, session):
+        # Brings the local embedding index of the source tables up to date,
+        # the tables that cannot be indexed are read on every search
+        self._indexed_tables = {}
+        for table in self.source_tables:
+            try:
+                index = self._index.get_table_index(
+                    session, table["schema_name"], table["table_name"])
+            except Exception:
+                index = None
+            if index is not None and index.matrix.shape[0] > 0:
+                self._indexed_tables[(table["schema_name"],
+                                      table["table_name"])] = index
 
     def make_create_context_table(self):
         return f"create temporary table {self.context_table} (id varchar(256), dist double, metadata json, segment longtext)"
@@ -135,27 +238,53 @@ class GenericDocumentTableTemplate(Template):
 
     def make_select(self, text: str, params: dict) -> Tuple[str, list, str]:
         columns = ", ".join(self.table_columns)
+        # The tables covered by the embedding index are not read
         query = " UNION ".join(
-            [f"""SELECT {columns} FROM `{table.schema_name}`.`{table.table_name}`""" for table in self.source_tables]
+            [f"""SELECT {columns} FROM `{table["schema_name"]}`.`{table["table_name"]}`"""
+             for table in self.source_tables
+             if (table["schema_name"], table["table_name"]) not in self._indexed_tables]
         )
         return (
-            query,
+            query or None,
             [],
             # NOTE: in the real version, query_emb should be kept as a uservar and doesn't need to be fetched and passed around
-            self._model.encode(text),
+            encode_query(self._model, text),
         )
 
     def make_inserter(self, query_emb):
-        def insert_one(session, row):
-            row_embedding = pickle.loads(row[-1])
-
-            distance = np.linalg.norm(query_emb - row_embedding)
-            session.run_sql(
-                f"""INSERT INTO {self.context_table} (id, dist, segment) VALUES (?, ?, ?)""",
-                [row[0], float(distance), row[1]],
-            )
-
-        return insert_one
+        def insert_topk(session, rows):
+            k = self.default_limit
+
+            # Candidates as (distance, index or None, row or key)
+            candidates = []
+            if rows:
+                embeddings = [pickle.loads(row[-1]) for row in rows]
+                indexes, distances = top_k_by_distance(
+                    query_emb, embeddings, k)
+                candidates += [(float(distance), None, rows[i])
+                               for i, distance in zip(indexes, distances)]
+
+            for index in self._indexed_tables.values():
+                indexes, distances = top_k_by_distance(
+                    query_emb, index.matrix, k)
+                candidates += [(float(distance), index, index.keys[i])
+                               for i, distance in zip(indexes, distances)]
+
+            candidates.sort(key=lambda candidate: candidate[0])
+
+            # Only the rows that can make it into the context are inserted,
+            # the segments of indexed rows are fetched by their key
+            for distance, index, row in candidates[:k]:
+                if index is not None:
+                    row = index.get_rows(session, [row], self.table_columns[:2])[0]
+                    if row is None:
+                        continue
+                session.run_sql(
+                    f"""INSERT INTO {self.context_table} (id, dist, segment) VALUES (?, ?, ?)""",
+                    [row[0], distance, row[1]],
+                )
+
+        return insert_topk
 
 
 class CohereTemplate(GenericDocumentTableTemplate):
@@ -194,13 +323,13 @@ class ContextManager:
     def __build_context_table(self, query: str, args: list, query_emb):
         self.session.run_sql(self.template.make_create_context_table())
 
-        res = self.session.run_sql(query, args).fetch_all()
+        res = self.session.run_sql(query, args).fetch_all() if query else []
         inserter = self.template.make_inserter(query_emb)
-        for row in res:
-            inserter(self.session, row)
+        inserter(self.session, res)
 
     def search(self, text: str, params: dict = {}):
         self.reset()
+        self.template.prepare(self.session)
         query, args, query_emb = self.template.make_select(text, params)
 
         self.__build_context_table(query, args, query_emb)
@@ -397,9 +526,12 @@ def chat(prompt, options: dict = {}, session=None, send_gui_message=None):
         g_embedding_model = SentenceTransformer(
             "sentence-transformers/all-MiniLM-L12-v2"
         )
-    if not g_chat:
+    if not g_chat or g_chat.session is not session:
         g_chat = Chat(session, CohereTemplate(
             g_cohere_api_key), send_gui_message)
+    else:
+        # Stream the tokens to the request that is currently processed
+        g_chat.send_gui_message = send_gui_message
     return g_chat.run(prompt, options or {})
 
 
@@ -560,6 +560,27 @@ def get_db_system_shape(**kwargs):
         print(f'ERROR: {str(e)}')
 
 
+def iter_db_systems(db_sys, compartment_id, limit=None, display_name=None):
+    """Lazily yields the DB Systems that are not deleted
+
+    Args:
+        db_sys (object): A DbSystem client
+        compartment_id (str): OCID of the parent compartment
+        limit (int): The maximum number of DB Systems to yield
+        display_name (str): If given, only DB Systems with this exact name are
+            listed, filtered by the service
+
+    Returns:
+        A generator of DbSystemSummary objects
+    """
+    kwargs = {} if display_name is None else {"display_name": display_name}
+
+    return core.iter_oci_list(
+        db_sys.list_db_systems, limit=limit,
+        predicate=lambda d: d.lifecycle_state != "DELETED",
+        compartment_id=compartment_id, **kwargs)
+
+
 @plugin_function('mds.list.dbSystems', shell=True, cli=True, web=True)
 def list_db_systems(**kwargs):
     """Lists MySQL DB Systems
@@ -571,6 +592,7 @@ def list_db_systems(**kwargs):
 
     Keyword Args:
         compartment_id (str): OCID of the parent compartment.
+        limit (int): The maximum number of DB Systems to list
         config (object): An OCI config object or None.
         config_profile (str): The name of an OCI config profile
         interactive (bool): Indicates whether to execute in interactive mode
@@ -583,6 +605,7 @@ def list_db_systems(**kwargs):
     """
 
     compartment_id = kwargs.get("compartment_id")
+    limit = kwargs.get("limit")
     config = kwargs.get("config")
     config_profile = kwargs.get("config_profile")
 
@@ -614,11 +637,8 @@ def list_db_systems(**kwargs):
         # Initialize the DbSystem client
         db_sys = core.get_oci_db_system_client(config=config)
 
-        # List the DbSystems of the current compartment
-        data = db_sys.list_db_systems(compartment_id=compartment_id).data
-
-        # Filter out all deleted db_systems
-        data = [d for d in data if d.lifecycle_state != "DELETED"]
+        # List the DbSystems of the current compartment that are not deleted
+        data = list(iter_db_systems(db_sys, compartment_id, limit=limit))
 
         # Add supported HW flags
         for d in data:
@@ -1788,6 +1808,70 @@ def change_lifecycle_state(**kwargs):
         print(f'ERROR: {e}')
 
 
+def wait_for_db_system(db_system_id, predicate, timeout, config,
+                       progress_caption=None, work_request_id=None,
+                       progress_end='\r'):
+    """Waits for the db_system to satisfy the given predicate
+
+    The wait is handled by the shared lifecycle waiter, so concurrent waits
+    for DB Systems of the same compartment share their polls.
+
+    Args:
+        db_system_id (str): OCID of the DbSystem.
+        predicate (function): Called with the DbSystem, returns True once the
+            wait is over
+        timeout (float): The number of seconds to wait at most
+        config (dict): An OCI config object
+        progress_caption (str): If given, the progress is printed with it
+        work_request_id (str): The id of the work request of the action
+        progress_end (str): The string printed after each progress line
+
+    Returns:
+       The DbSystem or None if the timeout was reached
+    """
+    import queue
+
+    from mds_plugin import lifecycle_waiter
+
+    db_sys = core.get_oci_db_system_client(config=config)
+
+    db_system = db_sys.get_db_system(db_system_id=db_system_id).data
+    if predicate(db_system):
+        return db_system
+
+    def progress(db_system, polls):
+        s = "." * polls
+        try:
+            if work_request_id:
+                req_client = core.get_oci_work_requests_client(config=config)
+                req = req_client.get_work_request(
+                    work_request_id=work_request_id).data
+                s = f" {req.percent_complete:.0f}% completed."
+        except:
+            pass
+
+        print(f'{progress_caption}{s}', end=progress_end)
+
+    progress_queue = queue.Queue() if progress_caption else None
+    future = lifecycle_waiter.get_lifecycle_waiter().wait(
+        resource_id=db_system_id, get_fn=db_sys.get_db_system,
+        predicate=predicate, timeout=timeout,
+        list_fn=db_sys.list_db_systems,
+        compartment_id=db_system.compartment_id,
+        progress_queue=progress_queue)
+
+    try:
+        # The progress is printed on this thread, not on the poller thread
+        if progress_queue is not None:
+            lifecycle_waiter.process_progress(progress_queue, progress)
+        return future.result()
+    except TimeoutError:
+        return None
+    finally:
+        if progress_caption:
+            print("")
+
+
 def await_lifecycle_state(db_system_id, action_state, action_name, config, interactive, work_request_id):
     """Waits of the db_system to reach the desired lifecycle state
 
@@ -1802,40 +1886,14 @@ def await_lifecycle_state(db_system_id, action_state, action_name, config, inter
     Returns:
        None
     """
-    import time
-
-    # Get DbSystem Client
-    db_sys = core.get_oci_db_system_client(config=config)
-
-    # Get WorkRequest Client
-    req_client = core.get_oci_work_requests_client(config=config)
-
-    # Wait for the lifecycle to reach desired state
-    cycles = 0
-    while cycles < 120:
-        db_system = db_sys.get_db_system(
-            db_system_id=db_system_id).data
-
-        if db_system.lifecycle_state == action_state:
-            break
-        else:
-            if interactive:
-                s = "." * (cycles + 1)
-                try:
-                    if work_request_id:
-                        req = req_client.get_work_request(work_request_id=work_request_id).data
-                        s = f" {req.percent_complete:.0f}% completed."
-                except:
-                    pass
-
-                print(f'Waiting for DB System to {action_name}...{s}', end='\r')
-            time.sleep(5)
-        cycles += 1
-
-    if interactive:
-        print("")
-
-    if db_system.lifecycle_state != action_state:
+    db_system = wait_for_db_system(
+        db_system_id, lambda d: d.lifecycle_state == action_state,
+        timeout=600, config=config,
+        progress_caption=f'Waiting for DB System to {action_name}...'
+        if interactive else None,
+        work_request_id=work_request_id)
+
+    if db_system is None:
         raise Exception("The DB System did not reach the correct "
                         "state within 10 minutes.")
     if interactive:
@@ -1856,39 +1914,16 @@ def await_hw_cluster_lifecycle_state(db_system_id, action_state, action_name, co
     Returns:
        None
     """
-    import time
-
-    # Get DbSystem Client
-    db_sys = core.get_oci_db_system_client(config=config)
-
-    # Get WorkRequest Client
-    req_client = core.get_oci_work_requests_client(config=config)
-
-    # Wait for the lifecycle to reach desired state
-    cycles = 0
-    while cycles < 240:
-        db_system = db_sys.get_db_system(
-            db_system_id=db_system_id).data
-        if db_system.heat_wave_cluster and db_system.heat_wave_cluster.lifecycle_state == action_state:
-            break
-        else:
-            if interactive:
-                s = "." * (cycles + 1)
-                try:
-                    if work_request_id:
-                        req = req_client.get_work_request(work_request_id=work_request_id).data
-                        s = f" {req.percent_complete:.0f}% completed."
-                except:
-                    pass
-
-                print(f'Waiting for HeatWave Cluster to {action_name}...{s}')
-            time.sleep(5)
-        cycles += 1
-
-    if interactive:
-        print("")
-
-    if (not db_system.heat_wave_cluster) or db_system.heat_wave_cluster.lifecycle_state != action_state:
+    db_system = wait_for_db_system(
+        db_system_id,
+        lambda d: d.heat_wave_cluster is not None and
+        d.heat_wave_cluster.lifecycle_state == action_state,
+        timeout=1200, config=config,
+        progress_caption=f'Waiting for HeatWave Cluster to {action_name}...'
+        if interactive else None,
+        work_request_id=work_request_id, progress_end='\n')
+
+    if db_system is None:
         raise Exception("The HeatWave Cluster did not reach the correct "
                         "state within 20 minutes.")
     if interactive:
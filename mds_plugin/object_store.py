@@ -514,7 +514,6 @@ def delete_bucket_object(name=None, **kwargs):
 
         import oci.object_storage
         import mysqlsh
-        import re
 
         bucket = get_bucket(
             bucket_name=bucket_name, compartment_id=compartment_id,
@@ -532,23 +531,9 @@ def delete_bucket_object(name=None, **kwargs):
 
         # If the user specified * as name, delete all
         if name and (name == '*' or '*' in name):
-            # Get object list
-            objects = oci.pagination.list_call_get_all_results(
-                os_client.list_objects,
-                namespace_name=namespace_name,
-                bucket_name=bucket.name,
-                limit=1000).data.objects
-            # Filter list
-            if name != '*':
-                name = name.lower()
-                # Filter list if PARs
-                if '*' in name:
-                    name_pattern = '^' + name.replace('*', '.+')
-                    objects = [obj for obj in objects
-                               if re.search(name_pattern, obj.name.lower())]
-                else:
-                    objects = [obj for obj in objects
-                               if name == obj.name.lower()]
+            # Get the list of matching objects
+            objects = list(iter_bucket_objects(
+                os_client, namespace_name, bucket.name, name=name))
 
             # Get object count
             obj_count = len(objects)
@@ -900,6 +885,64 @@ def create_bucket_objects(file_paths, prefix, **kwargs):
               f'ERROR: {str(e)}')
 
 
+def get_object_name_filter(name):
+    """Returns the service side prefix and the predicate for an object name
+
+    Object names are matched case insensitively and * matches one or more
+    characters. The service only supports case sensitive prefixes, so the
+    literal start of the name is only used as service side prefix if it does
+    not contain any cased characters.
+
+    Args:
+        name (str): The name of the bucket object, can include *
+
+    Returns:
+        A tuple with the prefix (or None) and the predicate (or None)
+    """
+    import re
+
+    if not name or name == '*':
+        return None, None
+
+    literal_start = name.split('*')[0]
+    prefix = literal_start \
+        if literal_start and literal_start.lower() == literal_start.upper() \
+        else None
+
+    name = name.lower()
+    if '*' in name:
+        name_pattern = re.compile('^' + name.replace('*', '.+'))
+        return prefix, lambda obj: name_pattern.search(obj.name.lower())
+
+    return prefix, lambda obj: name == obj.name.lower()
+
+
+def iter_bucket_objects(os_client, namespace_name, bucket_name, name=None,
+                        prefix=None, limit=None,
+                        fields="name,size,timeModified"):
+    """Lazily yields the objects of a bucket
+
+    Args:
+        os_client (object): An Object Store client
+        namespace_name (str): The Object Store namespace of the tenancy
+        bucket_name (str): The name of the bucket
+        name (str): The name of the bucket object, can include * to match
+            multiple objects
+        prefix (str): Only objects starting with this prefix are listed
+        limit (int): The maximum number of objects to yield
+        fields (str): The object fields to fetch
+
+    Returns:
+        A generator of ObjectSummary objects
+    """
+    name_prefix, predicate = get_object_name_filter(name)
+
+    return core.iter_oci_list(
+        os_client.list_objects, limit=limit, predicate=predicate,
+        namespace_name=namespace_name, bucket_name=bucket_name,
+        prefix=prefix if prefix is not None else name_prefix, fields=fields)
+
+
 @plugin_function('mds.list.bucketObjects', shell=True, cli=True, web=True)
 def list_bucket_objects(**kwargs):
     """Lists bucket object
@@ -920,6 +963,7 @@ def list_bucket_objects(**kwargs):
             Scanned objects whose names contain the delimiter have the part of their name up to the first occurrence
             of the delimiter (including the optional prefix) returned as a set of prefixes. Note that only "/" is a
             supported delimiter character at this time.
+        limit (int): The maximum number of bucket objects to list
         compartment_id (str): OCID of the parent compartment.
         config (object): An OCI config object or None.
         config_profile (str): The name of an OCI config profile
@@ -935,6 +979,7 @@ def list_bucket_objects(**kwargs):
 
     prefix = kwargs.get('prefix')
     delimiter = kwargs.get('delimiter')
+    limit = kwargs.get('limit')
 
     compartment_id = kwargs.get('compartment_id')
 
@@ -958,7 +1003,6 @@ def list_bucket_objects(**kwargs):
 
         import oci.object_storage
         import oci.util
-        import re
 
         bucket = get_bucket(
             bucket_name=bucket_name, compartment_id=compartment_id, config=config,
@@ -979,28 +1023,32 @@ def list_bucket_objects(**kwargs):
         #     bucket_name=bucket.name,
         #     fields="name,size,timeModified").data.objects
 
-        bucket_list_objects = oci.pagination.list_call_get_all_results(
-            os_client.list_objects,
-            namespace_name=namespace_name,
-            bucket_name=bucket.name,
-            prefix=prefix,
-            delimiter=delimiter,
-            fields="name,size,timeModified",
-            limit=1000).data
-        # Filter list if PARs
-        if name and name != '*':
-            name = name.lower()
-            # Filter list if PARs
-            if '*' in name:
-                name_pattern = '^' + name.replace('*', '.+')
-                bucket_list_objects.objects = [obj for obj in bucket_list_objects.objects
-                                               if re.search(name_pattern, obj.name.lower())]
-            else:
-                bucket_list_objects.objects = [obj for obj in bucket_list_objects.objects
-                                               if name == obj.name.lower()]
+        name_prefix, predicate = get_object_name_filter(name)
+        if prefix is None:
+            prefix = name_prefix
+
+        # Fetch the pages lazily and stop as soon as the limit is reached
+        bucket_list_objects = oci.object_storage.models.ListObjects(
+            objects=[], prefixes=[])
+        for response in oci.pagination.list_call_get_all_results_generator(
+                os_client.list_objects, "response",
+                namespace_name=namespace_name,
+                bucket_name=bucket.name,
+                prefix=prefix,
+                delimiter=delimiter,
+                fields="name,size,timeModified",
+                limit=1000):
+            bucket_list_objects.prefixes.extend(response.data.prefixes or [])
+            bucket_list_objects.objects.extend(
+                obj for obj in response.data.objects
+                if predicate is None or predicate(obj))
+            if limit is not None and len(bucket_list_objects.objects) >= limit:
+                del bucket_list_objects.objects[limit:]
+                break
 
         if len(bucket_list_objects.prefixes) + len(bucket_list_objects.objects) < 1 and interactive:
             if name:
+                name = name.lower()
                 print(f"The bucket {bucket.name} contains no objects matching "
                       f"the object name {name}.")
             else:
@@ -1026,12 +1074,17 @@ def list_bucket_objects(**kwargs):
 @plugin_function('mds.get.bucketObject')
 def get_bucket_object(name=None, file_name=None, bucket_name=None,
                       compartment_id=None, config=None,
-                      no_error_on_not_found=False):
+                      no_error_on_not_found=False, num_workers=1,
+                      part_size=None):
     """Get a bucket object by name
 
     This function will either save the file to disk, if file_name is given
     or return the contents as a string
 
+    If num_workers is greater than 1, the file is downloaded in ranged parts
+    of part_size bytes over num_workers connections. An interrupted parallel
+    download is resumed when the function is called again for the same file.
+
     Args:
         name (str): If set to JSON, output is formatted that way.
         file_name (str): The name of the file that should be created.
@@ -1039,6 +1092,8 @@ def get_bucket_object(name=None, file_name=None, bucket_name=None,
         compartment_id (str): The OCID of the compartment
         config (object): An OCI config object or None.
         no_error_on_not_found (bool): Whether to print out an error on 404
+        num_workers (int): The number of parts downloaded in parallel
+        part_size (int): The size of the downloaded parts in bytes
 
     Returns:
         A list of dicts representing the bucket objects or a string
@@ -1093,6 +1148,39 @@ def get_bucket_object(name=None, file_name=None, bucket_name=None,
                 return
             name = obj_summary.name
 
+        if file_name is not None and num_workers > 1:
+            from mds_plugin.object_store_downloader import (
+                parallel_bucket_download)
+
+            file_name = os.path.abspath(
+                os.path.expanduser(file_name))
+
+            errors = []
+
+            def download_status(data):
+                if data["status"] == "BEGIN":
+                    print(f"Downloading {data['object_name']} "
+                          f"({sizeof_fmt(data['file_size'])}) ...")
+                elif data["status"] == "ERROR":
+                    errors.append(data["error"])
+
+            parallel_bucket_download(
+                object_name=name,
+                file_path=file_name,
+                status_fn=download_status,
+                os_client=os_client,
+                namespace=namespace_name,
+                bucket_name=bucket.name,
+                part_size=part_size or
+                oci.object_storage.transfer.constants.DEFAULT_PART_SIZE,
+                num_workers=num_workers)
+
+            if errors:
+                raise errors[0]
+
+            print(f"File {file_name} was written to disk.")
+            return
+
         # Look up the object by name
         obj = os_client.get_object(
             namespace_name=namespace_name, bucket_name=bucket.name,
@@ -1199,39 +1287,6 @@ def bucket_dir_object_upload_progress_callback(bytes_uploaded):
         print(".")
 
 
-def upload_file_from_list_to_bucket(index, upload_manager, files,
-                                    namespace_name, bucket_name,
-                                    object_name_prefix):
-    """Uploads a file from a file list
-
-    Args:
-        index (int): The thread index, specifying which files from the list to
-            upload
-        upload_manager (object): An oci upload_manager instance
-        files (list): The list of filenames as strings
-        namespace_name (str): The OCI object store namespace of the tenancy
-        bucket_name (str): The name of the bucket to upload to
-
-    Returns:
-       None
-    """
-    import os.path
-
-    if object_name_prefix is None:
-        object_name_prefix = ""
-
-    for file_name in files:
-        if hash(file_name) % NTHREAD == index:
-            file_size = sizeof_fmt(os.path.getsize(file_name))
-            object_name = object_name_prefix + os.path.basename(file_name)
-            print(f"{object_name} ({file_size}) ...")
-
-            upload_manager.upload_file(
-                namespace_name=namespace_name, bucket_name=bucket_name,
-                object_name=object_name,
-                file_path=file_name)
-
-
 def create_bucket_objects_from_local_dir(local_dir_path=None, bucket_name=None,
                                          object_name_prefix=None,
                                          compartment_id=None, config=None,
@@ -1259,12 +1314,12 @@ def create_bucket_objects_from_local_dir(local_dir_path=None, bucket_name=None,
         print(f"ERROR: {str(e)}")
         return
 
-    import oci.mysql
-    from pathlib import Path
-    from os import listdir
+    import oci.object_storage
     import os.path
-    import datetime
     import mysqlsh
+    from mysqlsh.plugin_manager.general import get_shell_user_dir
+    from mds_plugin.object_store_uploader import (
+        parallel_bucket_upload, get_upload_manifest_path, UPLOAD_MANIFEST_DIR)
 
     # Get a local_dir_path
     if local_dir_path is None and interactive:
@@ -1322,37 +1377,48 @@ def create_bucket_objects_from_local_dir(local_dir_path=None, bucket_name=None,
     namespace_name = get_object_store_namespace(config)
 
     try:
-        upload_manager = oci.object_storage.UploadManager(
-            object_storage_client=os_client,
-            allow_parallel_uploads=True, parallel_process_count=3)
-
         print(f"\nUploading files to bucket {bucket.name}...")
 
-        import threading
-
-        ths = [threading.Thread(
-            target=upload_file_from_list_to_bucket, args=(
-                i, upload_manager, file_list, namespace_name, bucket_name,
-                object_name_prefix))
-               for i in range(NTHREAD)]
-        for th in ths:
-            th.daemon = True
-            th.start()
-        for th in ths:
-            th.join()
-
-        # for file_name in file_list:
-        #     file_size = sizeof_fmt(os.path.getsize(file_name))
-        #     print(f"{os.path.basename(file_name)} ({file_size}) ...", end='')
-
-        #     upload_manager.upload_file(
-        #         namespace_name=namespace_name, bucket_name=bucket.name,
-        #         object_name=os.path.basename(file_name),
-        #         file_path=file_name,
-        #         progress_callback=bucket_dir_object_upload_progress_callback,
-        #         part_size=1024*1024*1024*128)
-
-        #     print("")
+        failed_files = []
+
+        def upload_status(data):
+            if data["status"] == "BEGIN":
+                print(f"{data['object_name']} "
+                      f"({sizeof_fmt(data['file_size'])}) ...")
+            elif data["status"] == "SKIPPED":
+                print(f"{data['object_name']} already uploaded, skipped.")
+            elif data["status"] == "ERROR":
+                failed_files.append(data["file_path"])
+                print(f"{data['object_name']} - ERROR: {data['error']}")
+
+        # Interrupted uploads are resumed from the manifest of the directory
+        # and bucket when this function is called again
+        parallel_bucket_upload(
+            files=[
+                {
+                    "object_name": (object_name_prefix or "")
+                    + os.path.basename(file_name),
+                    "file_path": file_name,
+                }
+                for file_name in file_list
+            ],
+            status_fn=upload_status,
+            os_client=os_client,
+            namespace=namespace_name,
+            bucket_name=bucket.name,
+            processes_per_file=3,
+            part_size=oci.object_storage.transfer.constants.DEFAULT_PART_SIZE,
+            num_workers=min(NTHREAD, len(file_list)),
+            manifest_path=get_upload_manifest_path(
+                os.path.join(get_shell_user_dir(), UPLOAD_MANIFEST_DIR),
+                local_dir_path,
+                namespace_name, bucket.name),
+        )
+
+        if failed_files:
+            raise Exception(
+                f"{len(failed_files)} file{'s' if len(failed_files) > 1 else ''}"
+                " could not be uploaded.")
     except Exception as e:
         print(f"Could not upload all files successfully.\n"
               f"ERROR: {str(e)}")
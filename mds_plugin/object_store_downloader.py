@@ -0,0 +1,294 @@
+# Copyright (c) 2024, Oracle and/or its affiliates.
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License, version 2.0,
+# as published by the Free Software Foundation.
+#
+# This program is designed to work with certain software (including
+# but not limited to OpenSSL) that is licensed under separate terms, as
+# designated in a particular file or component or in included license
+# documentation.  The authors of MySQL hereby grant you an additional
+# permission to link the program and your derivative works with the
+# separately licensed software that they have either included with
+# the program or referenced in the documentation.
+#
+# This program is distributed in the hope that it will be useful,  but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See
+# the GNU General Public License, version 2.0, for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software Foundation, Inc.,
+# 51 Franklin St, Fifth Floor, Boston, MA 02110-1301 USA
+
+import base64
+import hashlib
+import json
+import os
+import queue
+import threading
+
+# The number of times the download of a part is attempted
+PART_ATTEMPTS = 3
+
+# The size of the chunks read from a part's response stream
+STREAM_CHUNK_SIZE = 1024 * 1024
+
+
+def get_file_md5(file_path, offset=0, size=None):
+    """Returns the base64 encoded MD5 of (a range of) a file"""
+    md5 = hashlib.md5()
+    with open(file_path, "rb") as f:
+        f.seek(offset)
+        remaining = size
+        while remaining is None or remaining > 0:
+            block = f.read(STREAM_CHUNK_SIZE if remaining is None
+                           else min(remaining, STREAM_CHUNK_SIZE))
+            if not block:
+                break
+            md5.update(block)
+            if remaining is not None:
+                remaining -= len(block)
+
+    return base64.b64encode(md5.digest()).decode("utf-8")
+
+
+class DownloadManifest:
+    """Local record of the parts of a BucketDownloader download
+
+    The manifest is a JSON lines journal next to the downloaded file. Its
+    first line identifies the object version (etag and size) and the part
+    size, each further line records a downloaded part and its MD5. It is only
+    used to resume if the object and the part size did not change.
+    """
+
+    def __init__(self, path, header):
+        self.path = path
+        self.lock = threading.Lock()
+        self.parts = {}
+
+        if os.path.exists(path):
+            with open(path) as f:
+                lines = f.read().splitlines()
+            try:
+                if lines and json.loads(lines[0]) == header:
+                    for line in lines[1:]:
+                        part = json.loads(line)
+                        self.parts[part["part"]] = part["md5"]
+            except ValueError:
+                # Ignore a line that was cut off by an interrupted run
+                pass
+
+            if not self.parts:
+                os.remove(path)
+
+        if not os.path.exists(path):
+            with open(path, "w") as f:
+                f.write(json.dumps(header) + "\n")
+
+    def add(self, part, md5):
+        with self.lock:
+            self.parts[part] = md5
+            with open(self.path, "a") as f:
+                f.write(json.dumps({"part": part, "md5": md5}) + "\n")
+
+    def remove(self):
+        os.remove(self.path)
+
+
+class BucketDownloader:
+    """Downloads a bucket object in ranged parts over multiple connections
+
+    Parts already downloaded by an interrupted run are kept if they still
+    match the MD5 recorded in the manifest. All ranged requests are made
+    with the etag of the object, so a part of a newer version of the object
+    is never mixed in. Once all parts are downloaded, the file is verified
+    against the object's content-md5 if the object has one (objects uploaded
+    in multiple parts only have a multipart MD5, which depends on the upload
+    part size, so only their size can be verified).
+
+    The parts are downloaded by worker threads, their progress is queued and
+    passed to status_fn by the thread calling download_file().
+    """
+
+    def __init__(
+        self,
+        status_fn,
+        os_client,
+        namespace,
+        bucket_name,
+        part_size=128 * 1024 * 1024,
+    ) -> None:
+        self.status_fn = status_fn
+        self.part_size = part_size
+        self.os_client = os_client
+        self.namespace = namespace
+        self.bucket_name = bucket_name
+        self.progress_queue = queue.Queue()
+
+    def _download_part(self, file_info, part, etag, tmp_path):
+        offset = part * self.part_size
+        size = min(self.part_size, file_info["file_size"] - offset)
+
+        # The bytes of the part reported so far, a retry only reports the
+        # bytes beyond those of the previous attempts
+        reported = 0
+        for attempt in range(PART_ATTEMPTS):
+            md5 = hashlib.md5()
+            written = 0
+            try:
+                response = self.os_client.get_object(
+                    namespace_name=self.namespace,
+                    bucket_name=self.bucket_name,
+                    object_name=file_info["object_name"],
+                    range=f"bytes={offset}-{offset + size - 1}",
+                    if_match=etag)
+
+                with open(tmp_path, "r+b") as f:
+                    f.seek(offset)
+                    for chunk in response.data.raw.stream(
+                            STREAM_CHUNK_SIZE, decode_content=False):
+                        f.write(chunk)
+                        md5.update(chunk)
+                        written += len(chunk)
+                        if written > reported:
+                            self.progress_queue.put({
+                                "status": "PROGRESS",
+                                "bytes_downloaded": written - reported} |
+                                file_info)
+                            reported = written
+
+                if written != size:
+                    raise IOError(
+                        f"Part {part} of {file_info['object_name']} is "
+                        f"{written} instead of {size} bytes.")
+
+                return base64.b64encode(md5.digest()).decode("utf-8")
+            except Exception as e:
+                # Client errors like a changed etag are not retried
+                status = getattr(e, "status", None)
+                if (status is not None and 400 <= status < 500) or \
+                        attempt == PART_ATTEMPTS - 1:
+                    raise
+
+    def download_file(self, object_name, file_path, num_workers):
+        """Downloads the object to the given file path
+
+        Args:
+            object_name (str): The name of the bucket object
+            file_path (str): The path of the file to write
+            num_workers (int): The number of parts downloaded in parallel
+        """
+        file_info = {"object_name": object_name, "file_path": file_path}
+        try:
+            headers = self.os_client.head_object(
+                namespace_name=self.namespace,
+                bucket_name=self.bucket_name,
+                object_name=object_name).headers
+            file_info["file_size"] = int(headers["content-length"])
+            etag = headers.get("etag")
+
+            tmp_path = f"{file_path}.part"
+            manifest = DownloadManifest(f"{file_path}.manifest", {
+                "object_name": object_name,
+                "etag": etag,
+                "size": file_info["file_size"],
+                "part_size": self.part_size})
+
+            if not os.path.exists(tmp_path) or \
+                    os.path.getsize(tmp_path) != file_info["file_size"]:
+                manifest.parts.clear()
+                with open(tmp_path, "wb") as f:
+                    f.truncate(file_info["file_size"])
+
+            self.status_fn({"status": "BEGIN"} | file_info)
+
+            # Queue the parts missing or not matching their recorded MD5
+            num_parts = -(-file_info["file_size"] // self.part_size)
+            parts = queue.Queue()
+            for part in range(num_parts):
+                md5 = manifest.parts.get(part)
+                if md5 is not None and md5 == get_file_md5(
+                        tmp_path, part * self.part_size, self.part_size):
+                    continue
+                parts.put(part)
+
+            errors = []
+
+            def worker():
+                try:
+                    while not errors:
+                        try:
+                            part = parts.get_nowait()
+                        except queue.Empty:
+                            return
+                        try:
+                            manifest.add(part, self._download_part(
+                                file_info, part, etag, tmp_path))
+                        except Exception as e:
+                            errors.append(e)
+                finally:
+                    # Tells the calling thread this worker is done
+                    self.progress_queue.put(None)
+
+            workers = [threading.Thread(target=worker)
+                       for _ in range(min(num_workers, parts.qsize()))]
+            for w in workers:
+                w.start()
+
+            workers_done = 0
+            while workers_done < len(workers):
+                progress = self.progress_queue.get()
+                if progress is None:
+                    workers_done += 1
+                else:
+                    self.status_fn(progress)
+            for w in workers:
+                w.join()
+
+            if errors:
+                raise errors[0]
+
+            content_md5 = headers.get("content-md5")
+            if content_md5 and get_file_md5(tmp_path) != content_md5:
+                manifest.remove()
+                os.remove(tmp_path)
+                raise IOError(
+                    f"The MD5 of {object_name} does not match the download.")
+
+            os.replace(tmp_path, file_path)
+            manifest.remove()
+
+            self.status_fn({"status": "END"} | file_info)
+        except Exception as e:
+            self.status_fn({"status": "ERROR", "error": e} | file_info)
+
+
+def parallel_bucket_download(
+    object_name,
+    file_path,
+    status_fn,
+    os_client,
+    namespace,
+    bucket_name,
+    part_size,
+    num_workers,
+):
+    """
+    object_name: the name of the bucket object to download
+    file_path: the path of the file to write, file_path.part and
+        file_path.manifest are used while downloading to resume an
+        interrupted download
+    status_fn: callback(status_data)
+
+    status_data may be one of:
+        {"status": "BEGIN"} | file_info
+        {"status": "END"} | file_info
+        {"status": "PROGRESS", "bytes_downloaded": bytes_downloaded_since_last_call} | file_info
+        {"status": "ERROR", "error": exception} | file_info
+
+    where file_info is {"object_name": ..., "file_path": ..., "file_size": ...}
+    """
+    downloader = BucketDownloader(
+        status_fn, os_client, namespace, bucket_name, part_size)
+    downloader.download_file(object_name, file_path, num_workers)
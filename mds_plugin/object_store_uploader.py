@@ -21,12 +21,156 @@
 # along with this program; if not, write to the Free Software Foundation, Inc.,
 # 51 Franklin St, Fifth Floor, Boston, MA 02110-1301 USA
 
+import base64
+import hashlib
+import json
 import threading
 import queue
 from typing import List
-import time
 import os
 
+# The directory below the shell user dir holding the manifests of the
+# directories uploaded with object_store.create_bucket_objects_from_local_dir
+UPLOAD_MANIFEST_DIR = os.path.join("plugin_data", "mds_plugin", "upload_manifests")
+
+# The size of the blocks read when computing MD5 hashes
+MD5_READ_BLOCK_SIZE = 1024 * 1024
+
+
+def get_upload_manifest_path(manifest_dir, local_dir_path, namespace, bucket_name):
+    """Returns the path of the manifest for uploading a directory to a bucket
+
+    Each directory and bucket has its own manifest, stored outside of the
+    uploaded directory, so the directory may be read-only.
+
+    Args:
+        manifest_dir (str): The directory holding the manifests
+        local_dir_path (str): The directory being uploaded
+        namespace (str): The Object Storage namespace
+        bucket_name (str): The name of the bucket
+
+    Returns:
+        The path of the manifest file
+    """
+    key = hashlib.sha256(json.dumps(
+        [os.path.abspath(local_dir_path), namespace, bucket_name]).encode(
+            "utf-8")).hexdigest()
+
+    return os.path.join(manifest_dir, f"{key}.jsonl")
+
+
+def get_upload_md5(file_path, file_size, part_size):
+    """Returns the MD5 Object Storage reports for a file once it is uploaded
+
+    Objects uploaded in a single part report the base64 encoded MD5 of their
+    content (content-md5), objects uploaded in multiple parts the base64
+    encoded MD5 of the concatenated part MD5s followed by the number of parts
+    (opc-multipart-md5).
+
+    Args:
+        file_path (str): The path of the file
+        file_size (int): The size of the file
+        part_size (int): The part size used for multipart uploads
+
+    Returns:
+        The MD5 as string
+    """
+    digests = []
+    with open(file_path, "rb") as f:
+        for _ in range(max(1, -(-file_size // part_size))):
+            md5 = hashlib.md5()
+            remaining = part_size
+            while remaining > 0:
+                block = f.read(min(remaining, MD5_READ_BLOCK_SIZE))
+                if not block:
+                    break
+                md5.update(block)
+                remaining -= len(block)
+            digests.append(md5.digest())
+
+    if file_size <= part_size:
+        return base64.b64encode(digests[0]).decode("utf-8")
+
+    md5 = base64.b64encode(hashlib.md5(b"".join(digests)).digest())
+    return f"{md5.decode('utf-8')}-{len(digests)}"
+
+
+class UploadManifest:
+    """Local record of the uploads of a BucketUploader
+
+    The manifest is a JSON lines journal, each line recording the state of the
+    upload of one object. It is used to skip objects uploaded by a previous
+    run and to resume their multipart uploads. Entries are keyed by
+    namespace, bucket and object name, and only used if the file still has
+    the same size, modification time and part size.
+
+    If the manifest cannot be written, the upload goes on without it.
+    """
+
+    def __init__(self, path=None, namespace=None, bucket_name=None) -> None:
+        self.path = path
+        self.namespace = namespace
+        self.bucket_name = bucket_name
+        self.lock = threading.Lock()
+        self.entries = {}
+
+        if path is None or not os.path.exists(path):
+            return
+
+        with open(path) as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # Ignore a line that was cut off by an interrupted run
+                    continue
+                self.entries[self._key(entry)] = entry
+
+    @staticmethod
+    def _key(entry):
+        return (entry.get("namespace"), entry.get("bucket_name"),
+                entry.get("object_name"))
+
+    def _file_state(self, file_info, part_size):
+        return {
+            "namespace": self.namespace,
+            "bucket_name": self.bucket_name,
+            "object_name": file_info["object_name"],
+            "file_path": os.path.abspath(file_info["file_path"]),
+            "file_size": file_info["file_size"],
+            "mtime": os.path.getmtime(file_info["file_path"]),
+            "part_size": part_size,
+        }
+
+    def get(self, file_info, part_size):
+        """Returns the entry of the given file or None if it changed since"""
+        state = self._file_state(file_info, part_size)
+        with self.lock:
+            entry = self.entries.get(self._key(state))
+
+        if entry is None or any(entry.get(k) != v for k, v in state.items()):
+            return None
+
+        return entry
+
+    def update(self, file_info, part_size, **values):
+        """Records the given values for the given file"""
+        entry = self._file_state(file_info, part_size) | values
+
+        with self.lock:
+            self.entries[self._key(entry)] = entry
+            if self.path is None:
+                return
+
+            try:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                with open(self.path, "a") as f:
+                    f.write(json.dumps(entry) + "\n")
+            except OSError:
+                # Keep the entries in memory only, the upload itself must
+                # not fail because of the manifest
+                self.path = None
+
 
 class BucketUploader:
     def __init__(
@@ -37,6 +181,8 @@ class BucketUploader:
         bucket_name,
         processes_per_file=5,
         part_size=1024 * 1024,
+        manifest_path=None,
+        skip_existing=True,
     ) -> None:
         self.status_fn = status_fn
         self.processes_per_file = processes_per_file
@@ -44,6 +190,8 @@ class BucketUploader:
         self.os_client = os_client
         self.namespace = namespace
         self.bucket_name = bucket_name
+        self.manifest = UploadManifest(manifest_path, namespace, bucket_name)
+        self.skip_existing = skip_existing
 
         self.work_queue = queue.Queue()
         self.progress_queue = queue.Queue()
@@ -51,18 +199,20 @@ class BucketUploader:
 
     def upload_files(self, files):
         self.files_done = 0
-        self.done = False
         self.num_files = len(files)
+
+        sized_files = []
         for f in files:
-            t0 = time.time()
             try:
-                self.work_queue.put_nowait(f)
-            except queue.Full as e:
-                self._process_status(False)
-            # avoid busy loop when worker queue is full but there's no progress either
-            t1 = time.time()
-            if t1 - t0 < 1:
-                time.sleep(1 - (t1 - t0))
+                f["file_size"] = os.path.getsize(f["file_path"])
+                sized_files.append(f)
+            except Exception as e:
+                self.progress_queue.put({"status": "ERROR", "error": e} | f)
+
+        # Queue the largest files first, so they do not end up as the tail of
+        # the upload with all other workers already idle
+        for f in sorted(sized_files, key=lambda f: f["file_size"], reverse=True):
+            self.work_queue.put(f)
 
         self._process_status(True)
 
@@ -70,14 +220,9 @@ class BucketUploader:
         while self.files_done < self.num_files:
             try:
                 progress = self.progress_queue.get(block=block)
-                if progress["status"] == "END":
+                if progress["status"] in ["END", "SKIPPED", "ERROR"]:
                     self.files_done += 1
-                    self.status_fn(progress)
-                elif progress["status"] == "ERROR":
-                    self.files_done += 1
-                    self.status_fn(progress)
-                else:
-                    self.status_fn(progress)
+                self.status_fn(progress)
             except queue.Empty as e:
                 break
 
@@ -90,6 +235,87 @@ class BucketUploader:
             parallel_process_count=self.processes_per_file,
         )
 
+    def _is_uploaded(self, file_info, check_md5=True):
+        """Checks whether the bucket already holds the file's content
+
+        Without check_md5 only the size of the object is compared, which is
+        enough for files the manifest records as uploaded.
+        """
+        import oci.exceptions
+
+        try:
+            headers = self.os_client.head_object(
+                namespace_name=self.namespace,
+                bucket_name=self.bucket_name,
+                object_name=file_info["object_name"],
+            ).headers
+        except oci.exceptions.ServiceError as e:
+            if e.status == 404:
+                return False
+            raise
+
+        if int(headers.get("content-length", -1)) != file_info["file_size"]:
+            return False
+        if not check_md5:
+            return True
+
+        remote_md5 = headers.get("opc-multipart-md5") or headers.get("content-md5")
+        return remote_md5 == get_upload_md5(
+            file_info["file_path"], file_info["file_size"], self.part_size)
+
+    def _upload_multipart(self, file_info, entry, progress):
+        import oci.exceptions
+        import oci.object_storage
+
+        assembler_args = {
+            "part_size": self.part_size,
+            "allow_parallel_uploads": True,
+            "parallel_process_count": self.processes_per_file,
+        }
+
+        def abort(assembler):
+            # Do not leave the uploaded parts behind in the bucket. An upload
+            # interrupted by the user is kept, so the next run can resume it.
+            self.manifest.update(file_info, self.part_size, upload_id=None)
+            try:
+                assembler.abort()
+            except Exception:
+                pass
+
+        if entry is not None and entry.get("upload_id"):
+            assembler = oci.object_storage.MultipartObjectAssembler(
+                self.os_client, self.namespace, self.bucket_name,
+                file_info["object_name"], **assembler_args)
+            assembler.add_parts_from_file(file_info["file_path"])
+            try:
+                # Only uploads the parts missing on the server
+                assembler.resume(
+                    upload_id=entry["upload_id"], progress_callback=progress)
+                assembler.commit()
+                return
+            except oci.exceptions.ServiceError as e:
+                # The multipart upload was committed, aborted or has expired
+                if e.status != 404:
+                    abort(assembler)
+                    raise
+            except Exception:
+                abort(assembler)
+                raise
+
+        assembler = oci.object_storage.MultipartObjectAssembler(
+            self.os_client, self.namespace, self.bucket_name,
+            file_info["object_name"], **assembler_args)
+        assembler.new_upload()
+        self.manifest.update(
+            file_info, self.part_size, upload_id=assembler.manifest["uploadId"])
+        try:
+            assembler.add_parts_from_file(file_info["file_path"])
+            assembler.upload(progress_callback=progress)
+            assembler.commit()
+        except Exception:
+            abort(assembler)
+            raise
+
     def _worker(self):
         upload_manager = self._make_upload_manager()
 
@@ -101,14 +327,6 @@ class BucketUploader:
             except queue.Empty:
                 continue
 
-            try:
-                file_info["file_size"] = os.path.getsize(file_info["file_path"])
-            except Exception as e:
-                self.progress_queue.put({"status": "ERROR", "error": e} | file_info)
-                continue
-
-            self.progress_queue.put({"status": "BEGIN"} | file_info)
-
             def progress(bytes_uploaded):
                 self.progress_queue.put(
                     {
@@ -119,14 +337,31 @@ class BucketUploader:
                 )
 
             try:
-                upload_manager.upload_file(
-                    namespace_name=self.namespace,
-                    bucket_name=self.bucket_name,
-                    object_name=file_info["object_name"],
-                    file_path=file_info["file_path"],
-                    part_size=self.part_size,
-                    progress_callback=progress,
-                )
+                entry = self.manifest.get(file_info, self.part_size)
+                # A file recorded as uploaded is only skipped if the object
+                # is still there, it might have been deleted since
+                if (entry is not None and entry.get("done")
+                        and self._is_uploaded(file_info, check_md5=False)) or (
+                        self.skip_existing and self._is_uploaded(file_info)):
+                    self.manifest.update(file_info, self.part_size, done=True)
+                    self.progress_queue.put({"status": "SKIPPED"} | file_info)
+                    continue
+
+                self.progress_queue.put({"status": "BEGIN"} | file_info)
+
+                if file_info["file_size"] > self.part_size:
+                    self._upload_multipart(file_info, entry, progress)
+                else:
+                    upload_manager.upload_file(
+                        namespace_name=self.namespace,
+                        bucket_name=self.bucket_name,
+                        object_name=file_info["object_name"],
+                        file_path=file_info["file_path"],
+                        part_size=self.part_size,
+                        progress_callback=progress,
+                    )
+
+                self.manifest.update(file_info, self.part_size, done=True)
                 self.progress_queue.put({"status": "END"} | file_info)
             except Exception as e:
                 self.progress_queue.put({"status": "ERROR", "error": e} | file_info)
@@ -154,19 +389,28 @@ def parallel_bucket_upload(
     processes_per_file,
     part_size,
     num_workers,
+    manifest_path=None,
+    skip_existing=True,
 ):
     """
     files: list of file_info dicts, that must contain at least "file_path" and "object_name"
     status_fn: callback(status_data)
+    manifest_path: path of a local manifest used to resume an interrupted upload,
+        see get_upload_manifest_path
+    skip_existing: whether to skip files already in the bucket with the same size and MD5
+
+    Files are uploaded largest first.
 
     status_data may be one of:
         {"status": "BEGIN"} | file_info
         {"status": "END"} | file_info
+        {"status": "SKIPPED"} | file_info
         {"status": "PROGRESS", "file_size": file_size, "bytes_uploaded": total_bytes_uploaded} | file_info
         {"status": "ERROR", "error": exception} | file_info
     """
     uploader = BucketUploader(
-        status_fn, os_client, namespace, bucket_name, processes_per_file, part_size
+        status_fn, os_client, namespace, bucket_name, processes_per_file, part_size,
+        manifest_path, skip_existing
     )
     uploader.start(num_workers)
     try:
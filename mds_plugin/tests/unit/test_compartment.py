@@ -0,0 +1,134 @@
+# Copyright (c) 2024, Oracle and/or its affiliates.
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License, version 2.0,
+# as published by the Free Software Foundation.
+#
+# This program is designed to work with certain software (including
+# but not limited to OpenSSL) that is licensed under separate terms, as
+# designated in a particular file or component or in included license
+# documentation.  The authors of MySQL hereby grant you an additional
+# permission to link the program and your derivative works with the
+# separately licensed software that they have either included with
+# the program or referenced in the documentation.
+#
+# This program is distributed in the hope that it will be useful,  but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See
+# the GNU General Public License, version 2.0, for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software Foundation, Inc.,
+# 51 Franklin St, Fifth Floor, Boston, MA 02110-1301 USA
+
+import types
+
+import oci
+import pytest
+
+from mds_plugin import compartment, core
+
+TENANCY_ID = "ocid1.tenancy..t"
+CONFIG = {"tenancy": TENANCY_ID, "profile": "DEFAULT"}
+
+
+def make_tree(*compartments):
+    return compartment.CompartmentTree(TENANCY_ID, [
+        oci.identity.models.Compartment(
+            id=compartment_id, compartment_id=parent_id, name=name,
+            lifecycle_state="ACTIVE")
+        for compartment_id, parent_id, name in compartments])
+
+
+@pytest.fixture
+def trees(monkeypatch):
+    """The cached tree and the tree fetched on refresh, or the exception"""
+    trees = {"cached": make_tree(("c1", TENANCY_ID, "dev")),
+             "refreshed": make_tree(("c1", TENANCY_ID, "dev"),
+                                    ("c2", "c1", "team"))}
+
+    def get_compartment_tree(config, refresh=False):
+        tree = trees["refreshed" if refresh else "cached"]
+        if isinstance(tree, Exception):
+            raise tree
+        return tree
+
+    monkeypatch.setattr(
+        compartment, "get_compartment_tree", get_compartment_tree)
+    return trees
+
+
+def test_full_path(trees):
+    assert compartment.get_compartment_full_path(TENANCY_ID, CONFIG) == "/"
+    assert compartment.get_compartment_full_path("c1", CONFIG) == "/dev"
+
+    # Compartments missing from the cached tree are looked up in a fresh one
+    assert compartment.get_compartment_full_path("c2", CONFIG) == "/dev/team"
+
+
+def test_full_path_of_unknown_compartment(trees, capsys):
+    with pytest.raises(ValueError, match="Compartment with id c3 not found"):
+        compartment.get_compartment_full_path("c3", CONFIG, interactive=False)
+
+    assert compartment.get_compartment_full_path("c3", CONFIG) is None
+    assert "Compartment with id c3 not found" in capsys.readouterr().out
+
+
+def test_full_path_refresh_errors(trees, capsys):
+    error = oci.exceptions.ServiceError(
+        429, "TooManyRequests", {}, "Too many requests")
+    trees["refreshed"] = error
+
+    with pytest.raises(oci.exceptions.ServiceError):
+        compartment.get_compartment_full_path("c2", CONFIG, interactive=False)
+
+    assert compartment.get_compartment_full_path("c2", CONFIG) is None
+    assert "Could not list all compartments" in capsys.readouterr().out
+
+    trees["refreshed"] = OSError("Network is unreachable")
+    with pytest.raises(OSError):
+        compartment.get_compartment_full_path("c2", CONFIG, interactive=False)
+
+    assert compartment.get_compartment_full_path("c2", CONFIG) is None
+    assert "ERROR: Network is unreachable" in capsys.readouterr().out
+
+
+class FakeIdentityClient:
+    """Lists the compartments of the tenancy in pages of page_size"""
+
+    def __init__(self, compartments, page_size=2):
+        self.compartments = compartments
+        self.page_size = page_size
+        self.pages = []
+
+    def list_compartments(self, compartment_id, compartment_id_in_subtree,
+                          page=None, limit=None, **kwargs):
+        assert compartment_id == TENANCY_ID
+        assert compartment_id_in_subtree
+        start = int(page or 0)
+        end = start + min(self.page_size, limit or self.page_size)
+        self.pages.append(start)
+        return types.SimpleNamespace(
+            data=self.compartments[start:end],
+            has_next_page=end < len(self.compartments), next_page=str(end))
+
+
+def test_tree_contains_all_pages(monkeypatch):
+    compartments = [
+        oci.identity.models.Compartment(
+            id=f"c{i}", compartment_id=f"c{i - 1}" if i else TENANCY_ID,
+            name=f"level{i}", lifecycle_state="ACTIVE")
+        for i in range(5)]
+    identity = FakeIdentityClient(compartments)
+    monkeypatch.setattr(core, "get_oci_identity_client",
+                        lambda config: identity)
+    compartment.clear_compartment_tree_cache()
+
+    try:
+        tree = compartment.get_compartment_tree(CONFIG)
+    finally:
+        compartment.clear_compartment_tree_cache()
+
+    assert identity.pages == [0, 2, 4]
+    assert sorted(tree.nodes) == ["c0", "c1", "c2", "c3", "c4"]
+    assert tree.get_full_path("c4") == "/level0/level1/level2/level3/level4"
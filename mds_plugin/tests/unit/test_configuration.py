@@ -0,0 +1,209 @@
+# Copyright (c) 2024, Oracle and/or its affiliates.
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License, version 2.0,
+# as published by the Free Software Foundation.
+#
+# This program is designed to work with certain software (including
+# but not limited to OpenSSL) that is licensed under separate terms, as
+# designated in a particular file or component or in included license
+# documentation.  The authors of MySQL hereby grant you an additional
+# permission to link the program and your derivative works with the
+# separately licensed software that they have either included with
+# the program or referenced in the documentation.
+#
+# This program is distributed in the hope that it will be useful,  but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See
+# the GNU General Public License, version 2.0, for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software Foundation, Inc.,
+# 51 Franklin St, Fifth Floor, Boston, MA 02110-1301 USA
+
+import os
+import types
+
+import oci.auth.signers
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+from mds_plugin import configuration
+
+TENANCY_ID = "ocid1.tenancy.oc1..aaaaaaaa"
+USER_ID = "ocid1.user.oc1..aaaaaaaa"
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    configuration.clear_config_cache()
+    yield
+    configuration.clear_config_cache()
+
+
+@pytest.fixture
+def files(tmp_path):
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    key_file = tmp_path / "key.pem"
+    key_file.write_bytes(key.private_bytes(
+        serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption()))
+
+    config_file = tmp_path / "config"
+    rc_file = tmp_path / "oci_cli_rc"
+    write_config(config_file, key_file, "us-ashburn-1")
+    rc_file.write_text("[DEFAULT]\ncompartment-id = ocid1.compartment..a\n")
+
+    return types.SimpleNamespace(
+        key=str(key_file), config=str(config_file), rc=str(rc_file))
+
+
+def write_config(config_file, key_file, region):
+    with open(config_file, "w") as f:
+        f.write(f"[DEFAULT]\nuser = {USER_ID}\n"
+                f"fingerprint = 11:22:33:44:55:66:77:88:99:00:aa:bb:cc:dd:ee:ff\n"
+                f"key_file = {key_file}\ntenancy = {TENANCY_ID}\n"
+                f"region = {region}\n")
+
+
+def touch_later(file_path):
+    # Makes sure the mtime changes on file systems with coarse timestamps
+    stat = os.stat(file_path)
+    os.utime(file_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+
+def get_config(files):
+    return configuration.get_config(
+        profile_name="DEFAULT", config_file_path=files.config,
+        cli_rc_file_path=files.rc, interactive=False, raise_exceptions=True)
+
+
+def test_file_signature(tmp_path):
+    file_path = tmp_path / "file"
+    missing = configuration.get_file_signature(str(file_path))
+    assert missing == (None,)
+
+    file_path.write_text("a")
+    created = configuration.get_file_signature(str(file_path))
+    assert created != missing
+
+    file_path.write_text("ab")
+    assert configuration.get_file_signature(str(file_path)) != created
+
+    # Same size, later modification time
+    signature = configuration.get_file_signature(str(file_path))
+    touch_later(file_path)
+    assert configuration.get_file_signature(str(file_path)) != signature
+
+    assert configuration.get_file_signature(None) == (None,)
+
+
+def test_config_is_cached_until_the_file_changes(files):
+    config = get_config(files)
+    assert config["region"] == "us-ashburn-1"
+    assert config["compartment-id"] == "ocid1.compartment..a"
+
+    # The cached profile and its signer are reused
+    cached = get_config(files)
+    assert cached["signer"] is config["signer"]
+    assert cached is not config
+
+    # Changing the file makes the profile and the signer to be recreated
+    write_config(files.config, files.key, "eu-frankfurt-1")
+    touch_later(files.config)
+    changed = get_config(files)
+    assert changed["region"] == "eu-frankfurt-1"
+    assert changed["signer"] is not config["signer"]
+    assert get_config(files)["signer"] is changed["signer"]
+
+
+def test_config_is_reloaded_when_the_key_file_changes(files):
+    config = get_config(files)
+
+    touch_later(files.key)
+
+    assert get_config(files)["signer"] is not config["signer"]
+
+
+def test_forget_cached_file(files):
+    config = get_config(files)
+
+    # Rewritten with a file of the same size and modification time, which
+    # the signature does not catch
+    stat = os.stat(files.config)
+    write_config(files.config, files.key, "us-phoenix-1")
+    os.utime(files.config, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    assert get_config(files)["region"] == "us-ashburn-1"
+
+    configuration.forget_cached_file(files.config)
+    reloaded = get_config(files)
+    assert reloaded["region"] == "us-phoenix-1"
+    assert reloaded["signer"] is not config["signer"]
+
+
+def test_cli_rc_file_is_parsed_again_after_a_change(files):
+    parsed = configuration.get_cli_rc_config(files.rc)
+    assert configuration.get_cli_rc_config(files.rc) is parsed
+    assert get_config(files)["compartment-id"] == "ocid1.compartment..a"
+
+    with open(files.rc, "w") as f:
+        f.write("[DEFAULT]\ncompartment-id = ocid1.compartment..bb\n")
+    touch_later(files.rc)
+
+    assert configuration.get_cli_rc_config(files.rc) is not parsed
+    assert get_config(files)["compartment-id"] == "ocid1.compartment..bb"
+
+    # Forgetting the file also drops the parsed rc file
+    parsed = configuration.get_cli_rc_config(files.rc)
+    configuration.forget_cached_file(files.rc)
+    assert configuration.get_cli_rc_config(files.rc) is not parsed
+
+
+def test_missing_cli_rc_file(tmp_path):
+    rc_file = tmp_path / "missing_rc"
+    parsed = configuration.get_cli_rc_config(str(rc_file))
+    assert parsed.sections() == []
+
+    rc_file.write_text("[DEFAULT]\nbucket-name = b1\n")
+    assert configuration.get_cli_rc_config(str(rc_file))["DEFAULT"][
+        "bucket-name"] == "b1"
+
+
+class FakeToken:
+    def __init__(self):
+        self.valid = True
+
+    def valid_with_jitter(self, margin):
+        assert margin == configuration.SIGNER_EXPIRY_MARGIN
+        return self.valid
+
+
+class FakeInstancePrincipalsSigner:
+    created = []
+
+    def __init__(self):
+        self.federation_client = types.SimpleNamespace(
+            security_token=FakeToken())
+        FakeInstancePrincipalsSigner.created.append(self)
+
+
+def test_instance_principal_signer_is_reused_until_near_expiry(monkeypatch):
+    FakeInstancePrincipalsSigner.created = []
+    monkeypatch.setattr(oci.auth.signers, "InstancePrincipalsSecurityTokenSigner",
+                        FakeInstancePrincipalsSigner)
+
+    signer = configuration.get_instance_principal_signer()
+    assert configuration.get_instance_principal_signer() is signer
+    assert configuration.get_instance_principal_signer() is signer
+
+    # The token expires within the margin
+    signer.federation_client.security_token.valid = False
+    renewed = configuration.get_instance_principal_signer()
+    assert renewed is not signer
+    assert configuration.get_instance_principal_signer() is renewed
+
+    # A signer without a token yet is replaced as well
+    renewed.federation_client.security_token = None
+    assert configuration.get_instance_principal_signer() is not renewed
+    assert len(FakeInstancePrincipalsSigner.created) == 3
@@ -0,0 +1,194 @@
+# Copyright (c) 2024, Oracle and/or its affiliates.
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License, version 2.0,
+# as published by the Free Software Foundation.
+#
+# This program is designed to work with certain software (including
+# but not limited to OpenSSL) that is licensed under separate terms, as
+# designated in a particular file or component or in included license
+# documentation.  The authors of MySQL hereby grant you an additional
+# permission to link the program and your derivative works with the
+# separately licensed software that they have either included with
+# the program or referenced in the documentation.
+#
+# This program is distributed in the hope that it will be useful,  but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See
+# the GNU General Public License, version 2.0, for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software Foundation, Inc.,
+# 51 Franklin St, Fifth Floor, Boston, MA 02110-1301 USA
+
+import time
+import types
+
+import pytest
+
+from mds_plugin import configuration, core
+
+CONFIG = {"profile": "DEFAULT", "tenancy": "ocid1.tenancy..t",
+          "user": "ocid1.user..u", "fingerprint": "11:22",
+          "region": "us-ashburn-1"}
+
+
+class FakeClient():
+    """Stands in for an OCI client class, counting the instances created"""
+    created = []
+
+    def __init__(self, config, retry_strategy=None, signer=None):
+        self.config = config
+        self.signer = signer
+        self.base_client = types.SimpleNamespace(endpoint=None)
+        FakeClient.created.append(self)
+
+
+class OtherFakeClient(FakeClient):
+    pass
+
+
+@pytest.fixture(autouse=True)
+def client_cache():
+    FakeClient.created = []
+    core.clear_oci_client_cache()
+    yield
+    core.clear_oci_client_cache()
+
+
+def test_clients_are_cached_by_key():
+    client = core.get_oci_client(FakeClient, CONFIG)
+
+    assert core.get_oci_client(FakeClient, dict(CONFIG)) is client
+    assert len(FakeClient.created) == 1
+
+    assert core.get_oci_client(OtherFakeClient, CONFIG) is not client
+    assert len(FakeClient.created) == 2
+
+
+@pytest.mark.parametrize("changes", [
+    {"profile": "OTHER"},
+    {"endpoint": "https://localhost:8080"},
+    {"signer": object()},
+    {"region": "eu-frankfurt-1"},
+])
+def test_clients_are_not_shared_between_configs(changes):
+    client = core.get_oci_client(FakeClient, CONFIG)
+
+    other = core.get_oci_client(FakeClient, {**CONFIG, **changes})
+
+    assert other is not client
+    assert core.get_oci_client(FakeClient, {**CONFIG, **changes}) is other
+    assert other.signer is changes.get("signer")
+    assert other.base_client.endpoint == changes.get("endpoint")
+
+
+def test_least_recently_used_clients_are_evicted():
+    configs = [{**CONFIG, "region": f"region-{i}"}
+               for i in range(core.OCI_CLIENT_CACHE_SIZE + 1)]
+    clients = [core.get_oci_client(FakeClient, config)
+               for config in configs[:-1]]
+
+    # Using the first client makes the second one the least recently used
+    assert core.get_oci_client(FakeClient, configs[0]) is clients[0]
+    core.get_oci_client(FakeClient, configs[-1])
+
+    assert len(core._oci_clients) == core.OCI_CLIENT_CACHE_SIZE
+    assert core.get_oci_client(FakeClient, configs[0]) is clients[0]
+    assert core.get_oci_client(FakeClient, configs[1]) is not clients[1]
+
+
+def test_clear_by_profile():
+    client = core.get_oci_client(FakeClient, CONFIG)
+    other = core.get_oci_client(FakeClient, {**CONFIG, "profile": "OTHER"})
+
+    core.clear_oci_client_cache("OTHER")
+
+    assert core.get_oci_client(FakeClient, CONFIG) is client
+    assert core.get_oci_client(
+        FakeClient, {**CONFIG, "profile": "OTHER"}) is not other
+
+
+def test_cache_is_cleared_on_profile_and_endpoint_changes(monkeypatch):
+    monkeypatch.setattr(configuration, "get_config", lambda **kwargs: None)
+    monkeypatch.setattr(configuration, "get_current_config",
+                        lambda config=None: CONFIG)
+    monkeypatch.setattr(configuration, "set_current_value",
+                        lambda **kwargs: None)
+
+    client = core.get_oci_client(FakeClient, CONFIG)
+    configuration.load_profile_as_current("DEFAULT", interactive=False)
+    assert core.get_oci_client(FakeClient, CONFIG) is not client
+
+    client = core.get_oci_client(FakeClient, CONFIG)
+    configuration.set_current_endpoint(
+        "https://localhost:8080", interactive=False)
+    assert core.get_oci_client(FakeClient, CONFIG) is not client
+
+
+def test_get_oci_client_benchmark():
+    count = 100000
+    client = core.get_oci_client(FakeClient, CONFIG)
+
+    start = time.perf_counter()
+    for _ in range(count):
+        assert core.get_oci_client(FakeClient, CONFIG) is client
+    elapsed = time.perf_counter() - start
+
+    assert len(FakeClient.created) == 1
+    print(f"\nget_oci_client with a cached client: "
+          f"{elapsed / count * 1000000:.2f} us per call")
+
+
+class FakeListClient():
+    """Lists the given items in pages of at most page_size items"""
+
+    def __init__(self, items, page_size=3):
+        self.items = items
+        self.page_size = page_size
+        self.calls = []
+
+    def list(self, compartment_id, page=None, limit=None):
+        self.calls.append((page, limit))
+        start = int(page or 0)
+        end = start + min(self.page_size, limit or self.page_size)
+        return types.SimpleNamespace(
+            data=self.items[start:end], has_next_page=end < len(self.items),
+            next_page=str(end))
+
+
+def test_iter_oci_list_is_lazy():
+    client = FakeListClient(list(range(10)))
+
+    items = core.iter_oci_list(client.list, compartment_id="c1")
+    assert client.calls == []
+
+    assert list(items) == list(range(10))
+    assert [page for page, _ in client.calls] == [None, "3", "6", "9"]
+
+
+def test_iter_oci_list_stops_at_the_limit():
+    client = FakeListClient(list(range(10)))
+
+    assert list(core.iter_oci_list(
+        client.list, limit=4, compartment_id="c1")) == [0, 1, 2, 3]
+
+    # No page is fetched once the limit is reached
+    assert client.calls == [(None, 4), ("3", 4)]
+
+    assert list(core.iter_oci_list(
+        client.list, limit=0, compartment_id="c1")) == []
+    assert len(client.calls) == 2
+
+
+def test_iter_oci_list_limits_the_matching_items():
+    client = FakeListClient(list(range(10)))
+
+    assert list(core.iter_oci_list(
+        client.list, limit=2, predicate=lambda item: item % 4 == 3,
+        compartment_id="c1")) == [3, 7]
+
+    # Full pages are fetched as the items are filtered on the client side
+    assert client.calls == [(None, core.OCI_LIST_PAGE_SIZE),
+                             ("3", core.OCI_LIST_PAGE_SIZE),
+                             ("6", core.OCI_LIST_PAGE_SIZE)]
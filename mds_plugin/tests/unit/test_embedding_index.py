@@ -0,0 +1,182 @@
+# Copyright (c) 2024, Oracle and/or its affiliates.
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License, version 2.0,
+# as published by the Free Software Foundation.
+#
+# This program is designed to work with certain software (including
+# but not limited to OpenSSL) that is licensed under separate terms, as
+# designated in a particular file or component or in included license
+# documentation.  The authors of MySQL hereby grant you an additional
+# permission to link the program and your derivative works with the
+# separately licensed software that they have either included with
+# the program or referenced in the documentation.
+#
+# This program is distributed in the hope that it will be useful,  but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See
+# the GNU General Public License, version 2.0, for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software Foundation, Inc.,
+# 51 Franklin St, Fifth Floor, Boston, MA 02110-1301 USA
+
+import json
+import pickle
+import re
+
+import numpy as np
+
+from mds_plugin import embedding_index
+from mds_plugin.embedding_index import EmbeddingIndex
+
+
+class FakeResult():
+    def __init__(self, rows):
+        self.rows = rows
+
+    def fetch_all(self):
+        return self.rows
+
+    def fetch_one(self):
+        return self.rows[0] if self.rows else None
+
+
+class FakeSession():
+    """Serves vector store tables from memory
+
+    tables maps the table names to (key_columns, rows), the rows being
+    dicts of column values. The checksum of a table is the number of times
+    it was changed.
+    """
+    uri = "mysql://user@localhost"
+
+    def __init__(self, tables):
+        self.tables = tables
+        self.versions = {name: 0 for name in tables}
+        self.checksums = 0
+        self.scans = 0
+
+    def change(self, table_name, rows):
+        self.tables[table_name] = (self.tables[table_name][0], rows)
+        self.versions[table_name] += 1
+
+    def run_sql(self, sql, args=None):
+        if sql.startswith("CHECKSUM TABLE"):
+            self.checksums += 1
+            table_name = sql.split("`.`")[1].rstrip("`")
+            return FakeResult([(table_name, self.versions[table_name])])
+
+        if "information_schema.STATISTICS" in sql:
+            return FakeResult([(column,)
+                               for column in self.tables[args[1]][0]])
+
+        match = re.match(r"SELECT (.*) FROM `\w+`\.`(\w+)`( WHERE (.*))?$",
+                         sql)
+        columns = [column.strip("`") for column in match[1].split(", ")]
+        key_columns, rows = self.tables[match[2]]
+        if match[3]:
+            rows = [row for row in rows
+                    if [row[column] for column in key_columns] == args]
+        else:
+            self.scans += 1
+        return FakeResult([tuple(row[column] for column in columns)
+                           for row in rows])
+
+
+class FakeClock():
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+def make_rows(count, key=lambda i: i, offset=0.0):
+    return [{"id": key(i), "segment": f"segment {i}",
+             "segment_embedding": pickle.dumps(
+                 np.full(4, i + offset, dtype=np.float32))}
+            for i in range(count)]
+
+
+def test_index_is_rebuilt_when_the_checksum_changes(tmp_path):
+    session = FakeSession({"docs": (["id"], make_rows(3))})
+    index = EmbeddingIndex(str(tmp_path), check_ttl=0)
+
+    table_index = index.get_table_index(session, "s", "docs")
+    assert table_index.keys == [(0,), (1,), (2,)]
+    assert table_index.matrix[2][0] == 2
+    assert session.scans == 1
+
+    # Unchanged tables are not read again
+    assert index.get_table_index(session, "s", "docs") is table_index
+    assert session.scans == 1
+
+    session.change("docs", make_rows(2, offset=10))
+    table_index = index.get_table_index(session, "s", "docs")
+    assert table_index.keys == [(0,), (1,)]
+    assert table_index.matrix[1][0] == 11
+    assert session.scans == 2
+
+
+def test_checksum_is_checked_once_per_ttl(tmp_path, monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(embedding_index, "time", clock)
+    session = FakeSession({"docs": (["id"], make_rows(3))})
+    index = EmbeddingIndex(str(tmp_path), check_ttl=60)
+
+    table_index = index.get_table_index(session, "s", "docs")
+    assert session.checksums == 1
+
+    # Changes are only picked up by the next check
+    session.change("docs", make_rows(1))
+    clock.now += 59
+    assert index.get_table_index(session, "s", "docs") is table_index
+    assert session.checksums == 1
+    assert len(table_index.keys) == 3
+
+    clock.now += 1
+    assert len(index.get_table_index(session, "s", "docs").keys) == 1
+    assert session.checksums == 2
+    assert session.scans == 2
+
+
+def test_binary_primary_keys_are_kept(tmp_path):
+    keys = [bytes([i, 0, 255, ord('"')]) for i in range(3)]
+    session = FakeSession(
+        {"docs": (["id"], make_rows(3, key=lambda i: keys[i]))})
+
+    EmbeddingIndex(str(tmp_path)).get_table_index(session, "s", "docs")
+
+    # A new process loads the keys from disk
+    table_index = EmbeddingIndex(str(tmp_path)).get_table_index(
+        session, "s", "docs")
+    assert session.scans == 1
+    assert table_index.keys == [(key,) for key in keys]
+    assert table_index.get_rows(session, [table_index.keys[1]],
+                                ["id", "segment"]) == [(keys[1], "segment 1")]
+
+
+def test_index_of_an_older_version_is_rebuilt(tmp_path):
+    session = FakeSession({"docs": (["id"], make_rows(3))})
+    table_index = EmbeddingIndex(str(tmp_path)).get_table_index(
+        session, "s", "docs")
+
+    with open(table_index.meta_path, "r", encoding="utf-8") as f:
+        meta = json.load(f)
+    meta["version"] = embedding_index.INDEX_FORMAT_VERSION - 1
+    with open(table_index.meta_path, "w", encoding="utf-8") as f:
+        json.dump(meta, f)
+
+    table_index = EmbeddingIndex(str(tmp_path)).get_table_index(
+        session, "s", "docs")
+    assert session.scans == 2
+    assert table_index.keys == [(0,), (1,), (2,)]
+
+
+def test_tables_without_primary_key_are_not_indexed(tmp_path):
+    session = FakeSession({"docs": ([], make_rows(3))})
+
+    assert EmbeddingIndex(str(tmp_path)).get_table_index(
+        session, "s", "docs") is None
+    assert session.scans == 0
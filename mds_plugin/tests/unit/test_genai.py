@@ -0,0 +1,294 @@
+# Copyright (c) 2024, Oracle and/or its affiliates.
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License, version 2.0,
+# as published by the Free Software Foundation.
+#
+# This program is designed to work with certain software (including
+# but not limited to OpenSSL) that is licensed under separate terms, as
+# designated in a particular file or component or in included license
+# documentation.  The authors of MySQL hereby grant you an additional
+# permission to link the program and your derivative works with the
+# separately licensed software that they have either included with
+# the program or referenced in the documentation.
+#
+# This program is distributed in the hope that it will be useful,  but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See
+# the GNU General Public License, version 2.0, for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software Foundation, Inc.,
+# 51 Franklin St, Fifth Floor, Boston, MA 02110-1301 USA
+
+import json
+import threading
+import types
+
+import mysqlsh
+import pytest
+
+from mds_plugin import genai, mockchat
+
+
+class FakeResult():
+    def __init__(self, rows):
+        self.rows = rows
+
+    def fetch_all(self):
+        return self.rows
+
+
+class FakeMultiResult():
+    """A result with several result sets, given as (column names, rows)"""
+
+    def __init__(self, result_sets):
+        self.result_sets = result_sets
+        self.current = 0
+
+    def fetch_all(self):
+        return self.result_sets[self.current][1]
+
+    def get_column_names(self):
+        return self.result_sets[self.current][0]
+
+    def next_result(self):
+        self.current += 1
+        return self.current < len(self.result_sets)
+
+
+class FakeChatSession():
+    """Mimics a MySQL Shell session answering with sys.heatwave_chat()
+
+    The tokens are returned in "response" result sets of two tokens each,
+    followed by the "chat_options" result set.
+    """
+    uri = "mysql://user@localhost"
+
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.options = None
+
+    def get_options(self):
+        return json.dumps({**self.options, "response": "".join(self.tokens)})
+
+    def run_sql(self, sql, args=None):
+        if sql.startswith("SET @chat_options"):
+            self.options = json.loads(args[0])
+            return FakeResult([])
+
+        if sql.startswith("CALL sys.heatwave_chat"):
+            return FakeMultiResult([
+                (["response"], [[json.dumps(token)]
+                                for token in self.tokens[i:i + 2]])
+                for i in range(0, len(self.tokens), 2)] + [
+                (["chat_options"], [[self.get_options()]])])
+
+        if sql == "SELECT @chat_options":
+            return FakeResult([[self.get_options()]])
+
+        return FakeResult([])
+
+
+class FakeSession():
+    """Mimics a MySQL Shell session translating with sys.ml_generate()
+
+    The translation of a text is the upper case text. The first generate
+    query fails with first_error if given.
+    """
+    uri = "mysql://user@localhost"
+
+    def __init__(self, first_error=None):
+        self.first_error = first_error
+        self.loads = 0
+        self.batches = []
+        self.threads = set()
+        self.closed = False
+
+    def run_sql(self, sql, args=None):
+        self.threads.add(threading.current_thread())
+        if "ml_model_load" in sql:
+            self.loads += 1
+            return FakeResult([])
+
+        if self.first_error is not None:
+            error, self.first_error = self.first_error, None
+            raise error
+
+        texts = json.loads(args[3])
+        self.batches.append(texts)
+        return FakeResult([
+            [i + 1, json.dumps({"text": f'"{text.upper()}"'})]
+            for i, text in enumerate(texts)])
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture(autouse=True)
+def translation_cache(tmp_path, monkeypatch):
+    cache = genai.TranslationCache(str(tmp_path / "cache.jsonl"))
+    monkeypatch.setattr(genai, "_translation_cache", cache)
+    return cache
+
+
+def test_translate_strings_batches_and_caches(translation_cache):
+    session = FakeSession()
+    texts = [f"text {i}" for i in range(genai.TRANSLATION_BATCH_SIZE + 5)]
+
+    translations = genai.translate_strings(
+        session, texts + ["text 0"], "German")
+
+    assert translations == [text.upper() for text in texts] + ["TEXT 0"]
+    assert [len(batch) for batch in session.batches] == [
+        genai.TRANSLATION_BATCH_SIZE, 5]
+    assert session.loads == 1
+
+    # The translations are cached, nothing is sent to the server
+    other_session = FakeSession()
+    assert genai.translate_strings(other_session, ["text 1"], "German") == [
+        "TEXT 1"]
+    assert other_session.loads == 0
+    assert other_session.batches == []
+
+
+def test_translate_strings_in_parallel(monkeypatch):
+    session = FakeSession()
+    opened = []
+
+    def open_session(uri, password=None):
+        opened.append(FakeSession())
+        return opened[-1]
+
+    monkeypatch.setattr(mysqlsh.globals.shell, "open_session", open_session,
+                        raising=False)
+    texts = [f"text {i}" for i in range(genai.TRANSLATION_BATCH_SIZE * 4)]
+
+    translations = genai.translate_strings(
+        session, texts, "German", max_parallel=3)
+
+    assert translations == [text.upper() for text in texts]
+    assert len(opened) == 2
+    assert all(s.closed for s in opened)
+    assert sum(len(s.batches) for s in [session] + opened) == 4
+
+    # The given session is only used on the calling thread, if at all before
+    # the other sessions took all batches
+    assert session.threads <= {threading.current_thread()}
+
+
+def test_only_an_unloaded_model_is_loaded_again():
+    session = FakeSession(first_error=Exception(
+        "ML006014: The model is not loaded."))
+
+    assert genai.translate_strings(session, ["a"], "German") == ["A"]
+    assert session.loads == 2
+
+    session = FakeSession(first_error=Exception("Lost connection"))
+    with pytest.raises(Exception, match="Lost connection"):
+        genai.translate_strings(session, ["b"], "German")
+    assert session.loads == 1
+
+
+def test_translate_plugin_function():
+    session = FakeSession()
+
+    assert genai.translate(["a", "b"], "German", session=session) == [
+        "A", "B"]
+    assert genai.translate(["a"], "English", session=session) == ["a"]
+
+
+class GuiMessages(list):
+    """Records the messages sent to the GUI"""
+
+    def __call__(self, message_type, data):
+        self.append((message_type, data))
+
+    @property
+    def tokens(self):
+        return [data["token"] for _, data in self if "token" in data]
+
+
+@pytest.mark.parametrize("stream", [True, False])
+def test_chat_streams_response_tokens(monkeypatch, stream):
+    monkeypatch.setattr(genai, "get_status", lambda session: {
+        "heatwave_support": True, "local_model_support": False,
+        "language_support": True})
+    session = FakeChatSession(["The ", "answer ", "is ", "42."])
+    messages = GuiMessages()
+
+    genai.chat("Question?", options={"stream": stream}, session=session,
+               send_gui_message=messages)
+
+    assert messages.tokens == (session.tokens if stream else [])
+    assert messages[-1][1]["response"] == "The answer is 42."
+
+
+class FakeTemplate(mockchat.Template):
+    """Answers every prompt with the given tokens, without a context"""
+
+    def __init__(self, tokens):
+        super().__init__()
+        self.tokens = tokens
+
+    def get_search_queries(self, query, options):
+        return []
+
+    def make_create_context_table(self):
+        return "create temporary table mysqlsh.context (id int)"
+
+    def make_select(self, text, params):
+        return None, [], None
+
+    def make_inserter(self, query_emb):
+        return lambda session, rows: None
+
+    def _query_topk(self, session, k, max_dist):
+        return FakeResult([])
+
+    def make_generator(self, query):
+        return lambda session, hint, context, options: FakeStream(self.tokens)
+
+
+class FakeStream(list):
+    """A streamed Cohere chat response, iterating over its events"""
+
+    def __init__(self, tokens):
+        super().__init__(
+            types.SimpleNamespace(event_type="text-generation", text=token)
+            for token in tokens)
+        self.text = "".join(tokens)
+        self.meta = None
+        self.citations = None
+
+
+def test_local_chat_streams_to_the_current_request(monkeypatch):
+    monkeypatch.setattr(genai, "get_status", lambda session: {
+        "heatwave_support": False, "local_model_support": True,
+        "language_support": False})
+    monkeypatch.setattr(mockchat, "g_embedding_model", object())
+    monkeypatch.setattr(mockchat, "g_chat", None)
+    templates = []
+    monkeypatch.setattr(mockchat, "CohereTemplate", lambda api_key: (
+        templates.append(FakeTemplate(["Hello", " world"])) or templates[-1]))
+
+    def chat(session):
+        messages = GuiMessages()
+        genai.chat("Hi", session=session, send_gui_message=messages,
+                   options={"stream": True, "lock_table_list": True,
+                            "tables": [{"schema_name": "s",
+                                        "table_name": "docs"}]})
+        return messages
+
+    session = FakeChatSession([])
+    first = chat(session)
+    second = chat(session)
+
+    # The tokens of each request go to the callback of that request
+    assert first.tokens == ["Hello", " world"]
+    assert second.tokens == ["Hello", " world"]
+    assert len(templates) == 1
+
+    # Another session gets its own chat
+    assert chat(FakeChatSession([])).tokens == ["Hello", " world"]
+    assert len(templates) == 2
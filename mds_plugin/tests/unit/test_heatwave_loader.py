@@ -0,0 +1,141 @@
+# Copyright (c) 2024, Oracle and/or its affiliates.
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License, version 2.0,
+# as published by the Free Software Foundation.
+#
+# This program is designed to work with certain software (including
+# but not limited to OpenSSL) that is licensed under separate terms, as
+# designated in a particular file or component or in included license
+# documentation.  The authors of MySQL hereby grant you an additional
+# permission to link the program and your derivative works with the
+# separately licensed software that they have either included with
+# the program or referenced in the documentation.
+#
+# This program is distributed in the hope that it will be useful,  but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See
+# the GNU General Public License, version 2.0, for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software Foundation, Inc.,
+# 51 Franklin St, Fifth Floor, Boston, MA 02110-1301 USA
+
+import threading
+
+from mds_plugin import heatwave_loader
+
+
+class FakeResult():
+    """Mimics the result of a MySQL Shell session's run_sql()"""
+
+    def __init__(self, column_names, result_sets):
+        self.column_names = column_names
+        self._result_sets = list(result_sets)
+
+    def fetch_all(self):
+        return self._result_sets[0]
+
+    def next_result(self):
+        self._result_sets.pop(0)
+        return len(self._result_sets) > 0
+
+
+class FakeSession():
+    """Mimics a MySQL Shell session, replying to sys.heatwave_load() calls
+
+    Each load waits until the barrier is passed, so the test fails if the
+    loads do not run at the same time.
+    """
+
+    def __init__(self, barrier=None, failing_schemas=()):
+        self.barrier = barrier
+        self.failing_schemas = failing_schemas
+        self.statements = []
+        self.threads = set()
+
+    def run_sql(self, sql, args=None):
+        self.statements.append(sql)
+        self.threads.add(threading.current_thread())
+
+        if self.barrier is not None:
+            self.barrier.wait(timeout=5)
+
+        for schema in self.failing_schemas:
+            if f'"{schema}"' in sql:
+                raise Exception(f"Load of {schema} failed")
+
+        return FakeResult(["LOAD SUMMARY"], [[["loaded"]], []])
+
+
+class FakeProgressSession():
+    def __init__(self, rows):
+        self.rows = rows
+        self.statements = []
+
+    def run_sql(self, sql, args=None):
+        self.statements.append((sql, args))
+        return FakeResult(["SCHEMA_NAME"], [self.rows])
+
+
+def test_schemas_are_loaded_in_parallel():
+    barrier = threading.Barrier(2)
+    sessions = [FakeSession(barrier), FakeSession(barrier)]
+    status = []
+    status_threads = set()
+
+    def status_fn(data):
+        status.append(data)
+        status_threads.add(threading.current_thread())
+
+    results, tables = heatwave_loader.parallel_heat_wave_load(
+        ["s1", "s2"], "JSON_OBJECT()", sessions, status_fn,
+        poll_interval=0.01)
+
+    assert set(results) == {"s1", "s2"}
+    assert "loaded" in results["s1"][0]
+    assert tables == []
+    assert all(len(session.statements) == 1 for session in sessions)
+
+    # The status is reported on the calling thread only
+    assert status_threads == {threading.current_thread()}
+    assert sorted((data["status"], data["schema"]) for data in status) == [
+        ("BEGIN", "s1"), ("BEGIN", "s2"), ("END", "s1"), ("END", "s2")]
+
+
+def test_failed_loads_are_reported():
+    sessions = [FakeSession(failing_schemas=["s2"])]
+    status = []
+
+    results, _ = heatwave_loader.parallel_heat_wave_load(
+        ["s1", "s2", "s3"], "JSON_OBJECT()", sessions, status.append,
+        poll_interval=0.01)
+
+    assert isinstance(results["s2"], Exception)
+    assert not isinstance(results["s1"], Exception)
+    assert not isinstance(results["s3"], Exception)
+    assert [data["schema"] for data in status
+            if data["status"] == "ERROR"] == ["s2"]
+    assert len([data for data in status if data["status"] == "END"]) == 2
+
+
+def test_table_progress_is_reported():
+    progress_session = FakeProgressSession([
+        ["s1", "t1", heatwave_loader.TABLE_LOADED_STATUS, 100, 1000, 2048, 2],
+        ["s1", "t2", "LOADING_RPDGSTABSTATE", 50, 10, 20, 1]])
+    status = []
+
+    _, tables = heatwave_loader.parallel_heat_wave_load(
+        ["s1"], "JSON_OBJECT()", [FakeSession()], status.append,
+        progress_session=progress_session, poll_interval=0.01)
+
+    assert progress_session.statements[0][1] == ["s1"]
+
+    tables = {table["table"]: table for table in tables}
+    assert tables["t1"]["rows_per_second"] == 500
+    assert tables["t1"]["bytes_per_second"] == 1024
+    assert "rows_per_second" not in tables["t2"]
+
+    # Unchanged tables are reported once
+    progress = [data for data in status if data["status"] == "PROGRESS"]
+    assert sorted(data["table"] for data in progress) == ["t1", "t2"]
@@ -0,0 +1,239 @@
+# Copyright (c) 2024, Oracle and/or its affiliates.
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License, version 2.0,
+# as published by the Free Software Foundation.
+#
+# This program is designed to work with certain software (including
+# but not limited to OpenSSL) that is licensed under separate terms, as
+# designated in a particular file or component or in included license
+# documentation.  The authors of MySQL hereby grant you an additional
+# permission to link the program and your derivative works with the
+# separately licensed software that they have either included with
+# the program or referenced in the documentation.
+#
+# This program is distributed in the hope that it will be useful,  but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See
+# the GNU General Public License, version 2.0, for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software Foundation, Inc.,
+# 51 Franklin St, Fifth Floor, Boston, MA 02110-1301 USA
+
+import threading
+import time
+import types
+
+import oci
+import pytest
+
+from mds_plugin import compartment, inventory
+
+TENANCY_ID = "ocid1.tenancy..t"
+CONFIG = {"tenancy": TENANCY_ID, "profile": "DEFAULT"}
+
+
+def make_compartment(compartment_id, parent_id, name, state="ACTIVE"):
+    return oci.identity.models.Compartment(
+        id=compartment_id, compartment_id=parent_id, name=name,
+        lifecycle_state=state)
+
+
+class FakeListClient:
+    """Serves the list calls of one resource type from memory
+
+    items maps each compartment id to the list of its resources, errors maps
+    a compartment id to the exception its list call fails with and delays a
+    compartment id to the seconds its list call takes. The resources are
+    returned in pages of page_size.
+    """
+
+    def __init__(self, items, errors=None, delays=None, page_size=2):
+        self.items = items
+        self.errors = errors or {}
+        self.delays = delays or {}
+        self.page_size = page_size
+        self.calls = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+
+    def list(self, compartment_id, page=None, **kwargs):
+        with self.lock:
+            self.calls.append(compartment_id)
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            time.sleep(self.delays.get(compartment_id, 0.01))
+            if compartment_id in self.errors:
+                raise self.errors[compartment_id]
+
+            start = int(page or 0)
+            items = self.items.get(compartment_id, [])
+            end = start + self.page_size
+            return types.SimpleNamespace(
+                data=items[start:end], has_next_page=end < len(items),
+                next_page=str(end))
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+
+
+def db_system(db_system_id, compartment_id, state="ACTIVE"):
+    return oci.mysql.models.DbSystemSummary(
+        id=db_system_id, compartment_id=compartment_id,
+        lifecycle_state=state)
+
+
+def vcn(vcn_id, compartment_id, state="AVAILABLE"):
+    return oci.core.models.Vcn(
+        id=vcn_id, compartment_id=compartment_id, lifecycle_state=state)
+
+
+@pytest.fixture
+def tree(monkeypatch):
+    compartments = [
+        make_compartment("c1", TENANCY_ID, "c1"),
+        make_compartment("c2", "c1", "c2"),
+        make_compartment("c3", TENANCY_ID, "c3"),
+        make_compartment("c4", TENANCY_ID, "c4", state="DELETED")]
+    tree = compartment.CompartmentTree(TENANCY_ID, compartments)
+    monkeypatch.setattr(
+        compartment, "get_compartment_tree", lambda config: tree)
+    return tree
+
+
+def use_clients(monkeypatch, **clients):
+    """Replaces the clients of the given resource types by fake ones"""
+    for resource_type, client in clients.items():
+        _, list_method_name, skipped_states = \
+            inventory.INVENTORY_RESOURCE_TYPES[resource_type]
+        monkeypatch.setitem(
+            inventory.INVENTORY_RESOURCE_TYPES, resource_type,
+            (lambda config, client=client, name=list_method_name:
+                types.SimpleNamespace(**{name: client.list}),
+             list_method_name, skipped_states))
+
+
+def test_inventory_fans_out_over_compartments(tree, monkeypatch):
+    db_systems = FakeListClient({
+        TENANCY_ID: [db_system("d1", TENANCY_ID)],
+        "c1": [db_system(f"d{i}", "c1") for i in range(2, 7)],
+        "c2": [db_system("d7", "c2"), db_system("d8", "c2", "DELETED")],
+    }, delays={"c1": 0.1, "c2": 0.1, "c3": 0.1})
+    networks = FakeListClient({"c3": [vcn("v1", "c3")]})
+    use_clients(monkeypatch, dbSystems=db_systems, networks=networks)
+
+    snapshot = inventory.take_inventory(
+        CONFIG, resource_types=["dbSystems", "networks"], max_workers=4,
+        requests_per_second=1000)
+
+    # The deleted compartment is skipped, each other one is listed once per
+    # resource type, the pages of a compartment one after the other
+    assert sorted(c.id for c in snapshot.compartments) == ["c1", "c2", "c3"]
+    assert sorted(set(db_systems.calls)) == sorted(
+        [TENANCY_ID, "c1", "c2", "c3"])
+    assert db_systems.calls.count("c1") == 3
+    assert sorted(networks.calls) == sorted([TENANCY_ID, "c1", "c2", "c3"])
+    assert 1 < db_systems.max_in_flight <= 4
+
+    assert [d.id for d in snapshot.resources["dbSystems"]] == [
+        "d1", "d2", "d3", "d4", "d5", "d6", "d7"]
+    assert [v.id for v in snapshot.resources["networks"]] == ["v1"]
+    assert snapshot.errors == []
+
+
+def test_inventory_of_a_compartment(tree, monkeypatch):
+    db_systems = FakeListClient({
+        "c1": [db_system("d1", "c1")], "c2": [db_system("d2", "c2")],
+        "c3": [db_system("d3", "c3")]})
+    use_clients(monkeypatch, dbSystems=db_systems)
+
+    snapshot = inventory.take_inventory(
+        CONFIG, compartment_id="c1", resource_types=["dbSystems"])
+
+    assert [c.id for c in snapshot.compartments] == ["c2"]
+    assert [d.id for d in snapshot.resources["dbSystems"]] == ["d1", "d2"]
+
+
+def test_inventory_errors_are_kept_per_compartment(tree, monkeypatch):
+    error = oci.exceptions.ServiceError(
+        404, "NotAuthorizedOrNotFound", {}, "Not authorized")
+    db_systems = FakeListClient(
+        {"c1": [db_system("d1", "c1")], "c3": [db_system("d3", "c3")]},
+        errors={"c2": error})
+    networks = FakeListClient({"c2": [vcn("v1", "c2")]})
+    use_clients(monkeypatch, dbSystems=db_systems, networks=networks)
+
+    snapshot = inventory.take_inventory(
+        CONFIG, resource_types=["dbSystems", "networks"])
+
+    # The failed call does not affect the other compartments or resource
+    # types
+    assert [d.id for d in snapshot.resources["dbSystems"]] == ["d1", "d3"]
+    assert [v.id for v in snapshot.resources["networks"]] == ["v1"]
+    assert len(snapshot.errors) == 1
+    assert snapshot.errors[0].to_dict() == {
+        "resource_type": "dbSystems", "compartment_id": "c2",
+        "error": str(error)}
+
+    result = snapshot.to_dict()
+    assert [d["id"] for d in result["resources"]["dbSystems"]] == [
+        "d1", "d3"]
+    assert len(result["compartments"]) == 3
+    assert result["errors"][0]["compartment_id"] == "c2"
+
+
+def test_inventory_unknown_resource_type(tree):
+    with pytest.raises(ValueError, match="Unknown resource type"):
+        inventory.take_inventory(CONFIG, resource_types=["buckets"])
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+def test_rate_limiter(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(inventory, "time", clock)
+    limiter = inventory.RateLimiter(8, burst=5)
+
+    # The burst is allowed right away
+    for _ in range(5):
+        limiter.acquire()
+    assert clock.now == 0
+
+    # Further calls are spaced by 1 / rate
+    for _ in range(10):
+        limiter.acquire()
+    assert clock.now == pytest.approx(1.25)
+
+    # An idle limiter refills up to the burst only
+    clock.now += 100
+    for _ in range(5):
+        limiter.acquire()
+    assert clock.now == pytest.approx(101.25)
+    limiter.acquire()
+    assert clock.now == pytest.approx(101.375)
+
+
+def test_rate_limiter_wrap(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(inventory, "time", clock)
+    limiter = inventory.RateLimiter(2, burst=1)
+    calls = []
+
+    throttled = limiter.wrap(lambda *args, **kwargs: calls.append(
+        (clock.now, args, kwargs)))
+    throttled(1, a=2)
+    throttled(3)
+
+    assert calls == [(0, (1,), {"a": 2}), (pytest.approx(0.5), (3,), {})]
@@ -0,0 +1,149 @@
+# Copyright (c) 2024, Oracle and/or its affiliates.
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License, version 2.0,
+# as published by the Free Software Foundation.
+#
+# This program is designed to work with certain software (including
+# but not limited to OpenSSL) that is licensed under separate terms, as
+# designated in a particular file or component or in included license
+# documentation.  The authors of MySQL hereby grant you an additional
+# permission to link the program and your derivative works with the
+# separately licensed software that they have either included with
+# the program or referenced in the documentation.
+#
+# This program is distributed in the hope that it will be useful,  but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See
+# the GNU General Public License, version 2.0, for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software Foundation, Inc.,
+# 51 Franklin St, Fifth Floor, Boston, MA 02110-1301 USA
+
+import queue
+import threading
+import types
+
+import pytest
+
+from mds_plugin import lifecycle_waiter
+
+
+@pytest.fixture(autouse=True)
+def fast_polls(monkeypatch):
+    monkeypatch.setattr(lifecycle_waiter, "MIN_POLL_INTERVAL", 0.01)
+    monkeypatch.setattr(lifecycle_waiter, "MAX_POLL_INTERVAL", 0.01)
+
+
+class FakeResources:
+    """Serves resources that become ACTIVE after a number of polls"""
+
+    def __init__(self, polls_until_active):
+        self.polls_until_active = polls_until_active
+        self.polls = {}
+        self.get_threads = set()
+        self.list_calls = 0
+
+    def resource(self, resource_id):
+        polls = self.polls[resource_id] = self.polls.get(resource_id, 0) + 1
+        state = "ACTIVE" if polls >= self.polls_until_active else "CREATING"
+        return types.SimpleNamespace(id=resource_id, lifecycle_state=state)
+
+    def get(self, resource_id):
+        self.get_threads.add(threading.current_thread())
+        return types.SimpleNamespace(data=self.resource(resource_id))
+
+    def list(self, compartment_id, **kwargs):
+        self.list_calls += 1
+        return types.SimpleNamespace(
+            data=[self.resource(resource_id) for resource_id in self.polls],
+            has_next_page=False, next_page=None)
+
+
+def is_active(resource):
+    return resource.lifecycle_state == "ACTIVE"
+
+
+def test_progress_is_processed_on_the_waiting_thread():
+    resources = FakeResources(polls_until_active=4)
+    waiter = lifecycle_waiter.LifecycleWaiter()
+    progress_queue = queue.Queue()
+    progress = []
+
+    future = waiter.wait("r1", resources.get, is_active, timeout=5,
+                         progress_queue=progress_queue)
+    lifecycle_waiter.process_progress(
+        progress_queue,
+        lambda resource, polls: progress.append(
+            (resource.lifecycle_state, polls, threading.current_thread())))
+
+    assert future.result().lifecycle_state == "ACTIVE"
+    assert [(state, polls) for state, polls, _ in progress] == [
+        ("CREATING", 1), ("CREATING", 2), ("CREATING", 3)]
+    assert {thread for _, _, thread in progress} == {
+        threading.current_thread()}
+    assert threading.current_thread() not in resources.get_threads
+
+
+def test_timeout_ends_the_progress():
+    resources = FakeResources(polls_until_active=1000)
+    waiter = lifecycle_waiter.LifecycleWaiter()
+    progress_queue = queue.Queue()
+    progress = []
+
+    future = waiter.wait("r1", resources.get, is_active, timeout=0.1,
+                         progress_queue=progress_queue)
+    lifecycle_waiter.process_progress(
+        progress_queue, lambda resource, polls: progress.append(polls))
+
+    with pytest.raises(TimeoutError):
+        future.result()
+    assert len(progress) > 0
+
+
+def test_waits_of_a_compartment_share_list_calls():
+    resources = FakeResources(polls_until_active=3)
+    resources.polls = {"r1": 0, "r2": 0}
+    waiter = lifecycle_waiter.LifecycleWaiter()
+
+    futures = [
+        waiter.wait(resource_id, resources.get, is_active, timeout=5,
+                    list_fn=resources.list, compartment_id="c1")
+        for resource_id in ["r1", "r2"]]
+
+    assert all(future.result(timeout=5).lifecycle_state == "ACTIVE"
+               for future in futures)
+    assert resources.list_calls > 0
+
+
+
+@pytest.mark.parametrize("cancel_in", ["get", "predicate"])
+def test_cancelling_during_a_poll_keeps_the_poller_running(cancel_in):
+    resources = FakeResources(polls_until_active=3)
+    cancelled_resources = FakeResources(polls_until_active=1)
+    waiter = lifecycle_waiter.LifecycleWaiter()
+    submitted = threading.Event()
+    futures = {}
+
+    # The caller cancels the wait while its resource is polled
+    def get(resource_id):
+        if cancel_in == "get":
+            submitted.wait(timeout=5)
+            futures["r1"].cancel()
+        return cancelled_resources.get(resource_id)
+
+    def predicate(resource):
+        if cancel_in == "predicate":
+            submitted.wait(timeout=5)
+            futures["r1"].cancel()
+        return is_active(resource)
+
+    pending = waiter.wait("r2", resources.get, is_active, timeout=5)
+    futures["r1"] = waiter.wait("r1", get, predicate, timeout=5)
+    submitted.set()
+
+    # The other pending waits are still served
+    assert pending.result(timeout=5).lifecycle_state == "ACTIVE"
+    assert futures["r1"].cancelled()
+    assert waiter._thread.is_alive()
@@ -0,0 +1,229 @@
+# Copyright (c) 2024, Oracle and/or its affiliates.
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License, version 2.0,
+# as published by the Free Software Foundation.
+#
+# This program is designed to work with certain software (including
+# but not limited to OpenSSL) that is licensed under separate terms, as
+# designated in a particular file or component or in included license
+# documentation.  The authors of MySQL hereby grant you an additional
+# permission to link the program and your derivative works with the
+# separately licensed software that they have either included with
+# the program or referenced in the documentation.
+#
+# This program is distributed in the hope that it will be useful,  but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See
+# the GNU General Public License, version 2.0, for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software Foundation, Inc.,
+# 51 Franklin St, Fifth Floor, Boston, MA 02110-1301 USA
+
+import pickle
+import re
+import time
+from collections import OrderedDict
+
+import numpy as np
+import pytest
+
+from mds_plugin import mockchat
+from mds_plugin.embedding_index import EmbeddingIndex
+
+
+class FakeResult():
+    def __init__(self, rows):
+        self.rows = rows
+
+    def fetch_all(self):
+        return self.rows
+
+    def fetch_one(self):
+        return self.rows[0] if self.rows else None
+
+
+class FakeSession():
+    """Serves vector store tables from memory
+
+    tables maps the table names to (key_columns, rows), the rows being
+    dicts of column values. The rows inserted into the context table are
+    recorded.
+    """
+    uri = "mysql://user@localhost"
+
+    def __init__(self, tables=None):
+        self.tables = tables or {}
+        self.inserted = []
+        self.scanned = []
+
+    def run_sql(self, sql, args=None):
+        if sql.startswith("INSERT INTO"):
+            self.inserted.append(tuple(args))
+            return FakeResult([])
+
+        if sql.startswith("CHECKSUM TABLE"):
+            return FakeResult([(sql.split("`.`")[1].rstrip("`"), 1)])
+
+        if "information_schema.STATISTICS" in sql:
+            return FakeResult([(column,)
+                               for column in self.tables[args[1]][0]])
+
+        result = []
+        for select in sql.split(" UNION "):
+            match = re.match(
+                r"SELECT (.*) FROM `\w+`\.`(\w+)`( WHERE (.*))?$", select)
+            if match is None:
+                continue
+            columns = [column.strip("`") for column in match[1].split(", ")]
+            key_columns, rows = self.tables[match[2]]
+            if match[3]:
+                rows = [row for row in rows
+                        if [row[column] for column in key_columns] == args]
+            else:
+                self.scanned.append(match[2])
+            result += [tuple(row[column] for column in columns)
+                       for row in rows]
+        return FakeResult(result)
+
+
+class FakeModel():
+    def __init__(self):
+        self.encoded = []
+
+    def encode(self, text):
+        self.encoded.append(text)
+        return np.full(4, len(text), dtype=np.float32)
+
+
+def make_rows(name, values):
+    return [{"document_name": f"{name} {i}", "segment": f"{name} segment {i}",
+             "metadata": "{}",
+             "segment_embedding": pickle.dumps(
+                 np.full(4, value, dtype=np.float32))}
+            for i, value in enumerate(values)]
+
+
+def brute_force_top_k(query_emb, embeddings, k):
+    distances = np.linalg.norm(np.asarray(embeddings) - query_emb, axis=1)
+    indexes = np.argsort(distances, kind="stable")[:k]
+    return indexes, distances[indexes]
+
+
+@pytest.fixture
+def template(tmp_path, monkeypatch):
+    monkeypatch.setattr(mockchat, "g_embedding_index",
+                        EmbeddingIndex(str(tmp_path / "index")))
+    template = mockchat.GenericDocumentTableTemplate()
+    template.source_tables = []
+    template._model = FakeModel()
+    return template
+
+
+@pytest.mark.parametrize("k", [0, 1, 5, 99, 100, 250])
+def test_top_k_by_distance(k):
+    rng = np.random.default_rng(k)
+    embeddings = rng.standard_normal((100, 16)).astype(np.float32)
+    query_emb = rng.standard_normal(16).astype(np.float32)
+
+    for candidates in [embeddings, list(embeddings)]:
+        indexes, distances = mockchat.top_k_by_distance(
+            query_emb, candidates, k)
+        expected_indexes, expected_distances = brute_force_top_k(
+            query_emb, embeddings, k)
+
+        assert len(indexes) == min(k, len(embeddings))
+        assert list(indexes) == list(expected_indexes)
+        np.testing.assert_allclose(distances, expected_distances, rtol=1e-4)
+
+
+def test_top_k_by_distance_without_embeddings():
+    indexes, distances = mockchat.top_k_by_distance(
+        np.zeros(4, dtype=np.float32), np.empty((0, 4), dtype=np.float32), 3)
+
+    assert len(indexes) == 0
+    assert len(distances) == 0
+
+
+def test_insert_topk_benchmark(template):
+    count = 100000
+    k = 10
+    rng = np.random.default_rng(0)
+    embeddings = rng.standard_normal((count, 384)).astype(np.float32)
+    query_emb = rng.standard_normal(384).astype(np.float32)
+    rows = [(f"doc {i}", f"segment {i}", "{}", pickle.dumps(embedding))
+            for i, embedding in enumerate(embeddings)]
+    template.default_limit = k
+
+    session = FakeSession()
+    start = time.perf_counter()
+    template.make_inserter(query_emb)(session, rows)
+    elapsed = time.perf_counter() - start
+
+    indexes, distances = brute_force_top_k(query_emb, embeddings, k)
+    assert [row[0] for row in session.inserted] == [
+        f"doc {i}" for i in indexes]
+    assert [row[2] for row in session.inserted] == [
+        f"segment {i}" for i in indexes]
+    np.testing.assert_allclose([row[1] for row in session.inserted],
+                               distances, rtol=1e-4)
+    print(f"\ninsert top {k} of {count} embeddings: {elapsed * 1000:.1f} ms")
+
+
+def test_indexed_and_fetched_rows_are_ranked_together(template):
+    session = FakeSession({
+        "indexed": (["document_name"], make_rows("indexed", [1, 5, 9])),
+        "no_key": ([], make_rows("no_key", [2, 4, 20])),
+    })
+    template.source_tables = [
+        {"schema_name": "s", "table_name": "indexed"},
+        {"schema_name": "s", "table_name": "no_key"},
+    ]
+    template.default_limit = 4
+
+    # The index of the table with a primary key is built once
+    template.prepare(session)
+    assert session.scanned == ["indexed"]
+
+    # The search only reads the table without a primary key
+    template.prepare(session)
+    query, args, _ = template.make_select("", {})
+    rows = session.run_sql(query, args).fetch_all()
+    template.make_inserter(np.zeros(4, dtype=np.float32))(session, rows)
+    assert session.scanned == ["indexed", "no_key"]
+    assert [(row[0], row[1], row[2]) for row in session.inserted] == [
+        ("indexed 0", 2.0, "indexed segment 0"),
+        ("no_key 0", 4.0, "no_key segment 0"),
+        ("no_key 1", 8.0, "no_key segment 1"),
+        ("indexed 1", 10.0, "indexed segment 1"),
+    ]
+
+
+@pytest.fixture
+def query_embeddings(monkeypatch):
+    monkeypatch.setattr(mockchat, "g_query_embeddings", OrderedDict())
+    monkeypatch.setattr(mockchat, "g_query_embeddings_model", None)
+    monkeypatch.setattr(mockchat, "QUERY_EMBEDDING_CACHE_SIZE", 2)
+    return mockchat.g_query_embeddings
+
+
+def test_query_embeddings_are_cached(query_embeddings):
+    model = FakeModel()
+
+    assert mockchat.encode_query(model, "a")[0] == 1
+    mockchat.encode_query(model, "bb")
+    mockchat.encode_query(model, "a")
+    assert model.encoded == ["a", "bb"]
+
+    # The least recently used embedding is evicted
+    mockchat.encode_query(model, "ccc")
+    assert list(query_embeddings) == ["a", "ccc"]
+    mockchat.encode_query(model, "bb")
+    assert model.encoded == ["a", "bb", "ccc", "bb"]
+
+    # The embeddings of another model are not reused
+    other_model = FakeModel()
+    mockchat.encode_query(other_model, "bb")
+    assert other_model.encoded == ["bb"]
+    assert list(query_embeddings) == ["bb"]
@@ -0,0 +1,110 @@
+# Copyright (c) 2024, Oracle and/or its affiliates.
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License, version 2.0,
+# as published by the Free Software Foundation.
+#
+# This program is designed to work with certain software (including
+# but not limited to OpenSSL) that is licensed under separate terms, as
+# designated in a particular file or component or in included license
+# documentation.  The authors of MySQL hereby grant you an additional
+# permission to link the program and your derivative works with the
+# separately licensed software that they have either included with
+# the program or referenced in the documentation.
+#
+# This program is distributed in the hope that it will be useful,  but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See
+# the GNU General Public License, version 2.0, for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software Foundation, Inc.,
+# 51 Franklin St, Fifth Floor, Boston, MA 02110-1301 USA
+
+import oci.object_storage.models
+import pytest
+
+from mds_plugin import object_store
+
+NAMESPACE = "ns"
+BUCKET = "bucket"
+
+
+class FakeObjectStorageClient():
+    """Lists the objects of a bucket in pages of at most page_size objects"""
+
+    def __init__(self, names, page_size=2):
+        self.names = sorted(names)
+        self.page_size = page_size
+        self.calls = []
+
+    def list_objects(self, namespace_name, bucket_name, prefix=None,
+                     fields=None, limit=None, start=None):
+        assert (namespace_name, bucket_name) == (NAMESPACE, BUCKET)
+        self.calls.append({"prefix": prefix, "start": start})
+
+        names = [name for name in self.names
+                 if (prefix is None or name.startswith(prefix))
+                 and (start is None or name >= start)]
+        page_size = min(self.page_size, limit or self.page_size)
+        return oci.response.Response(200, {}, oci.object_storage.models.ListObjects(
+            objects=[oci.object_storage.models.ObjectSummary(name=name)
+                     for name in names[:page_size]],
+            next_start_with=names[page_size] if len(names) > page_size
+            else None), None)
+
+
+@pytest.mark.parametrize("name, prefix, matches, no_matches", [
+    ("*", None, None, None),
+    ("report.CSV", None, ["report.csv", "REPORT.csv"], ["report.csv.gz"]),
+    ("data/*.csv", None, ["Data/a.csv", "data/b.CSV"], ["data/.csv", "a.csv"]),
+    ("2024-*", "2024-", ["2024-01.csv"], ["2024-"]),
+])
+def test_object_name_filter(name, prefix, matches, no_matches):
+    name_prefix, predicate = object_store.get_object_name_filter(name)
+
+    assert name_prefix == prefix
+    if predicate is None:
+        assert matches is None
+        return
+    for object_name in matches:
+        assert predicate(oci.object_storage.models.ObjectSummary(
+            name=object_name))
+    for object_name in no_matches:
+        assert not predicate(oci.object_storage.models.ObjectSummary(
+            name=object_name))
+
+
+def list_names(client, **kwargs):
+    return [obj.name for obj in object_store.iter_bucket_objects(
+        client, NAMESPACE, BUCKET, **kwargs)]
+
+
+def test_bucket_objects_are_listed_from_all_pages():
+    names = [f"2024-{i:02}.csv" for i in range(1, 8)] + ["readme.txt"]
+    client = FakeObjectStorageClient(names)
+
+    assert list_names(client) == sorted(names)
+    assert len(client.calls) == 4
+
+    # The literal start of the name is used as service side prefix
+    client.calls = []
+    assert list_names(client, name="2024-0*") == names[:7]
+    assert {call["prefix"] for call in client.calls} == {"2024-0"}
+
+    assert list_names(client, name="README.*") == ["readme.txt"]
+    assert list_names(client, prefix="read") == ["readme.txt"]
+
+
+def test_bucket_object_listing_stops_at_the_limit():
+    names = [f"{i:02}.csv" for i in range(10)]
+    client = FakeObjectStorageClient(names, page_size=2)
+
+    assert list_names(client, limit=3) == names[:3]
+
+    # No further pages are fetched once the limit is reached
+    assert [call["start"] for call in client.calls] == [None, "02.csv"]
+
+    client.calls = []
+    assert list_names(client, name="*5.csv", limit=1) == ["05.csv"]
+    assert client.calls[-1]["start"] == "04.csv"
@@ -0,0 +1,154 @@
+# Copyright (c) 2024, Oracle and/or its affiliates.
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License, version 2.0,
+# as published by the Free Software Foundation.
+#
+# This program is designed to work with certain software (including
+# but not limited to OpenSSL) that is licensed under separate terms, as
+# designated in a particular file or component or in included license
+# documentation.  The authors of MySQL hereby grant you an additional
+# permission to link the program and your derivative works with the
+# separately licensed software that they have either included with
+# the program or referenced in the documentation.
+#
+# This program is distributed in the hope that it will be useful,  but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See
+# the GNU General Public License, version 2.0, for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software Foundation, Inc.,
+# 51 Franklin St, Fifth Floor, Boston, MA 02110-1301 USA
+
+import base64
+import hashlib
+import os
+import threading
+import types
+
+import oci.exceptions
+
+from mds_plugin.object_store_downloader import parallel_bucket_download
+
+NAMESPACE = "ns"
+BUCKET_NAME = "bucket"
+PART_SIZE = 1024
+
+
+class FakeObjectStorageClient:
+    """Serves ranged downloads of an in-memory object
+
+    The first attempt to download each part in fail_parts breaks off with a
+    server error after the first chunk of the part.
+    """
+
+    def __init__(self, data, fail_parts=(), etag="etag-1"):
+        self.data = data
+        self.etag = etag
+        self.fail_parts = set(fail_parts)
+        self.requests = []
+        self.lock = threading.Lock()
+
+    def head_object(self, namespace_name, bucket_name, object_name, **kwargs):
+        return types.SimpleNamespace(headers={
+            "content-length": str(len(self.data)),
+            "etag": self.etag,
+            "content-md5": base64.b64encode(
+                hashlib.md5(self.data).digest()).decode("utf-8")})
+
+    def get_object(self, namespace_name, bucket_name, object_name,
+                   if_match=None, **kwargs):
+        if if_match != self.etag:
+            raise oci.exceptions.ServiceError(
+                412, "IfMatchFailed", {}, "Precondition failed")
+
+        start, end = (int(n)
+                      for n in kwargs["range"][len("bytes="):].split("-"))
+        part = start // PART_SIZE
+        with self.lock:
+            self.requests.append(part)
+            fail = part in self.fail_parts
+            self.fail_parts.discard(part)
+
+        data = self.data[start:end + 1]
+
+        def stream(chunk_size, decode_content=False):
+            for offset in range(0, len(data), 256):
+                yield data[offset:offset + 256]
+                if fail:
+                    raise oci.exceptions.ServiceError(
+                        500, "InternalServerError", {}, "Connection lost")
+
+        return types.SimpleNamespace(data=types.SimpleNamespace(
+            raw=types.SimpleNamespace(stream=stream)))
+
+
+def download(client, file_path, num_workers=4):
+    status = []
+    status_threads = set()
+
+    def status_fn(data):
+        status.append(data)
+        status_threads.add(threading.current_thread())
+
+    parallel_bucket_download(
+        "object", file_path, status_fn, client, NAMESPACE, BUCKET_NAME,
+        PART_SIZE, num_workers)
+
+    return status, status_threads
+
+
+def test_download(tmp_path):
+    data = os.urandom(PART_SIZE * 5 + 100)
+    client = FakeObjectStorageClient(data)
+    file_path = str(tmp_path / "object")
+
+    status, status_threads = download(client, file_path)
+
+    with open(file_path, "rb") as f:
+        assert f.read() == data
+    assert sorted(client.requests) == list(range(6))
+    assert not os.path.exists(f"{file_path}.part")
+    assert not os.path.exists(f"{file_path}.manifest")
+
+    # The progress is reported on the calling thread
+    assert status_threads == {threading.current_thread()}
+    assert status[0]["status"] == "BEGIN"
+    assert status[-1]["status"] == "END"
+    assert sum(s["bytes_downloaded"] for s in status
+               if s["status"] == "PROGRESS") == len(data)
+
+
+def test_download_retried_parts_are_counted_once(tmp_path):
+    data = os.urandom(PART_SIZE * 3)
+    client = FakeObjectStorageClient(data, fail_parts=[0, 2])
+    file_path = str(tmp_path / "object")
+
+    status, _ = download(client, file_path, num_workers=2)
+
+    with open(file_path, "rb") as f:
+        assert f.read() == data
+    assert sorted(client.requests) == [0, 0, 1, 2, 2]
+    assert status[-1]["status"] == "END"
+    assert sum(s["bytes_downloaded"] for s in status
+               if s["status"] == "PROGRESS") == len(data)
+
+
+def test_download_changed_object_fails(tmp_path):
+    client = FakeObjectStorageClient(os.urandom(PART_SIZE * 2))
+    file_path = str(tmp_path / "object")
+
+    def head_object(*args, **kwargs):
+        response = FakeObjectStorageClient.head_object(client, *args, **kwargs)
+        # The object was replaced after head_object
+        client.etag = "etag-2"
+        return response
+
+    client.head_object = head_object
+
+    status, _ = download(client, file_path)
+
+    assert status[-1]["status"] == "ERROR"
+    assert status[-1]["error"].status == 412
+    assert not os.path.exists(file_path)
@@ -0,0 +1,255 @@
+# Copyright (c) 2024, Oracle and/or its affiliates.
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License, version 2.0,
+# as published by the Free Software Foundation.
+#
+# This program is designed to work with certain software (including
+# but not limited to OpenSSL) that is licensed under separate terms, as
+# designated in a particular file or component or in included license
+# documentation.  The authors of MySQL hereby grant you an additional
+# permission to link the program and your derivative works with the
+# separately licensed software that they have either included with
+# the program or referenced in the documentation.
+#
+# This program is distributed in the hope that it will be useful,  but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See
+# the GNU General Public License, version 2.0, for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software Foundation, Inc.,
+# 51 Franklin St, Fifth Floor, Boston, MA 02110-1301 USA
+
+import base64
+import hashlib
+import io
+import os
+import types
+
+import oci.exceptions
+import pytest
+
+from mds_plugin.object_store_uploader import (
+    BucketUploader, get_upload_manifest_path, parallel_bucket_upload)
+
+NAMESPACE = "ns"
+PART_SIZE = 1024
+
+
+def b64_md5(data):
+    return base64.b64encode(hashlib.md5(data).digest()).decode("utf-8")
+
+
+def read_all(body):
+    chunks = []
+    while True:
+        chunk = body.read(64 * 1024)
+        if not chunk:
+            return b"".join(chunks)
+        chunks.append(chunk)
+
+
+class FakeObjectStorageClient:
+    """Keeps the objects and multipart uploads of the buckets in memory"""
+
+    def __init__(self):
+        self.base_client = types.SimpleNamespace(
+            endpoint="http://localhost",
+            session=types.SimpleNamespace(adapters={}, mount=lambda *args: None))
+        self.objects = {}
+        self.uploads = {}
+        self.uploaded_parts = []
+        self.aborted = []
+        self.fail_part = None
+
+    @staticmethod
+    def not_found():
+        return oci.exceptions.ServiceError(404, "NotFound", {}, "Not found")
+
+    def head_object(self, namespace_name, bucket_name, object_name, **kwargs):
+        obj = self.objects.get((bucket_name, object_name))
+        if obj is None:
+            raise self.not_found()
+
+        return types.SimpleNamespace(headers={
+            "content-length": str(len(obj["data"])), **obj["md5"]})
+
+    def put_object(self, namespace_name, bucket_name, object_name, body, **kwargs):
+        data = read_all(body)
+        self.objects[(bucket_name, object_name)] = {
+            "data": data, "md5": {"content-md5": b64_md5(data)}}
+        return types.SimpleNamespace(status=200, headers={})
+
+    def create_multipart_upload(self, namespace_name, bucket_name, details, **kwargs):
+        upload_id = f"upload-{len(self.uploads) + len(self.aborted)}"
+        self.uploads[upload_id] = {"bucket_name": bucket_name,
+                                   "object_name": details.object, "parts": {}}
+        return types.SimpleNamespace(data=types.SimpleNamespace(upload_id=upload_id))
+
+    def upload_part(self, namespace_name, bucket_name, object_name, upload_id,
+                    part_num, body, **kwargs):
+        if self.fail_part == part_num:
+            raise oci.exceptions.ServiceError(400, "InvalidPart", {}, "Failed")
+        if upload_id not in self.uploads:
+            raise self.not_found()
+
+        data = read_all(body)
+        self.uploads[upload_id]["parts"][part_num] = data
+        self.uploaded_parts.append((object_name, part_num))
+        return types.SimpleNamespace(status=200, headers={
+            "etag": f"{upload_id}-{part_num}", "opc-content-md5": b64_md5(data)})
+
+    def list_multipart_upload_parts(self, namespace_name, bucket_name, object_name,
+                                    upload_id, **kwargs):
+        if upload_id not in self.uploads:
+            raise self.not_found()
+
+        return types.SimpleNamespace(
+            data=[types.SimpleNamespace(part_number=num, size=len(data),
+                                        etag=f"{upload_id}-{num}", md5=b64_md5(data))
+                  for num, data in sorted(self.uploads[upload_id]["parts"].items())],
+            has_next_page=False, next_page=None)
+
+    def commit_multipart_upload(self, namespace_name, bucket_name, object_name,
+                                upload_id, details, **kwargs):
+        upload = self.uploads.pop(upload_id)
+        parts = [upload["parts"][p.part_num] for p in details.parts_to_commit]
+        md5 = base64.b64encode(hashlib.md5(
+            b"".join(hashlib.md5(part).digest() for part in parts)).digest())
+        self.objects[(bucket_name, object_name)] = {
+            "data": b"".join(parts),
+            "md5": {"opc-multipart-md5": f"{md5.decode('utf-8')}-{len(parts)}"}}
+        return types.SimpleNamespace(status=200, headers={})
+
+    def abort_multipart_upload(self, namespace_name, bucket_name, object_name,
+                               upload_id, **kwargs):
+        self.uploads.pop(upload_id, None)
+        self.aborted.append(upload_id)
+
+
+@pytest.fixture
+def files(tmp_path):
+    local_dir = tmp_path / "dump"
+    local_dir.mkdir()
+
+    result = []
+    for name, size in [("small.tsv", 100), ("large.tsv", 5 * PART_SIZE + 10),
+                       ("medium.tsv", 2 * PART_SIZE)]:
+        path = local_dir / name
+        path.write_bytes(os.urandom(size))
+        result.append({"object_name": name, "file_path": str(path)})
+
+    return result
+
+
+def upload(client, files, manifest_path, bucket_name="bucket", num_workers=1):
+    events = []
+    parallel_bucket_upload(
+        files=[dict(f) for f in files], status_fn=events.append, os_client=client,
+        namespace=NAMESPACE, bucket_name=bucket_name, processes_per_file=2,
+        part_size=PART_SIZE, num_workers=num_workers, manifest_path=manifest_path)
+
+    return {e["object_name"]: e["status"] for e in events
+            if e["status"] in ["END", "SKIPPED", "ERROR"]}, events
+
+
+def test_get_upload_manifest_path(tmp_path):
+    path = get_upload_manifest_path(str(tmp_path), "dump", NAMESPACE, "bucket")
+
+    assert os.path.dirname(path) == str(tmp_path)
+    assert path == get_upload_manifest_path(
+        str(tmp_path), os.path.abspath("dump"), NAMESPACE, "bucket")
+    assert path != get_upload_manifest_path(str(tmp_path), "dump", NAMESPACE, "bucket2")
+
+
+def test_upload_largest_first(files, tmp_path):
+    client = FakeObjectStorageClient()
+    status, events = upload(client, files, str(tmp_path / "manifest.jsonl"))
+
+    assert status == {"small.tsv": "END", "large.tsv": "END", "medium.tsv": "END"}
+    assert [e["object_name"] for e in events if e["status"] == "BEGIN"] == [
+        "large.tsv", "medium.tsv", "small.tsv"]
+    for f in files:
+        with open(f["file_path"], "rb") as data:
+            assert client.objects[("bucket", f["object_name"])]["data"] == data.read()
+
+
+def test_upload_skip(files, tmp_path):
+    client = FakeObjectStorageClient()
+    manifest_path = str(tmp_path / "manifest.jsonl")
+    upload(client, files, manifest_path)
+
+    status, _ = upload(client, files, manifest_path)
+    assert set(status.values()) == {"SKIPPED"}
+
+    # An object recorded as uploaded that was deleted since is uploaded again
+    del client.objects[("bucket", "medium.tsv")]
+    status, _ = upload(client, files, manifest_path)
+    assert status == {"small.tsv": "SKIPPED", "large.tsv": "SKIPPED",
+                      "medium.tsv": "END"}
+
+    # The manifest entries of one bucket are not used for another one
+    status, _ = upload(client, files, manifest_path, bucket_name="bucket2")
+    assert set(status.values()) == {"END"}
+
+    # A changed file is uploaded again
+    with open(files[0]["file_path"], "ab") as f:
+        f.write(b"more")
+    status, _ = upload(client, files, manifest_path)
+    assert status["small.tsv"] == "END"
+
+
+def test_upload_resume(files, tmp_path):
+    client = FakeObjectStorageClient()
+    manifest_path = str(tmp_path / "manifest.jsonl")
+    large = [f for f in files if f["object_name"] == "large.tsv"]
+
+    # Simulate a run that was interrupted after two parts of the large file
+    uploader = BucketUploader(None, client, NAMESPACE, "bucket",
+                              part_size=PART_SIZE, manifest_path=manifest_path)
+    file_info = dict(large[0], file_size=os.path.getsize(large[0]["file_path"]))
+    upload_id = client.create_multipart_upload(
+        NAMESPACE, "bucket", types.SimpleNamespace(object="large.tsv")).data.upload_id
+    with open(file_info["file_path"], "rb") as f:
+        for part_num in [1, 2]:
+            client.upload_part(NAMESPACE, "bucket", "large.tsv", upload_id,
+                               part_num, io.BytesIO(f.read(PART_SIZE)))
+    uploader.manifest.update(file_info, PART_SIZE, upload_id=upload_id)
+    client.uploaded_parts.clear()
+
+    status, _ = upload(client, large, manifest_path)
+
+    assert status == {"large.tsv": "END"}
+    assert client.uploaded_parts == [("large.tsv", n) for n in [3, 4, 5, 6]]
+    with open(file_info["file_path"], "rb") as f:
+        assert client.objects[("bucket", "large.tsv")]["data"] == f.read()
+
+
+def test_upload_failure_aborts(files, tmp_path):
+    client = FakeObjectStorageClient()
+    client.fail_part = 2
+    manifest_path = str(tmp_path / "manifest.jsonl")
+
+    status, _ = upload(client, files, manifest_path)
+
+    assert status == {"small.tsv": "END", "large.tsv": "ERROR",
+                      "medium.tsv": "ERROR"}
+    assert len(client.aborted) == 2
+    assert client.uploads == {}
+
+    # The next run starts new uploads instead of resuming the aborted ones
+    client.fail_part = None
+    status, _ = upload(client, files, manifest_path)
+    assert status == {"small.tsv": "SKIPPED", "large.tsv": "END",
+                      "medium.tsv": "END"}
+
+
+def test_upload_unwritable_manifest(files, tmp_path):
+    # The manifest cannot be created below a file
+    (tmp_path / "manifests").write_text("")
+
+    client = FakeObjectStorageClient()
+    status, _ = upload(client, files, str(tmp_path / "manifests" / "manifest.jsonl"))
+
+    assert set(status.values()) == {"END"}
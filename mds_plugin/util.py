@@ -46,6 +46,9 @@ def mds_heat_wave_load_data(**kwargs):
         enable_memory_check (bool): Whether to enable the memory check
         sql_mode (str): The sql_mode to use
         exclude_list (str): The database object list to exclude
+        max_parallel (int): The number of schemas loaded at the same time,
+            each on its own session
+        password (str): The password used to open the additional sessions
         session (object): The database session to use.
         interactive (bool): Indicates whether to execute in interactive mode
         raise_exceptions (bool): If set to true exceptions are raised
@@ -62,11 +65,15 @@ def mds_heat_wave_load_data(**kwargs):
     enable_memory_check = kwargs.get("enable_memory_check", True)
     sql_mode = kwargs.get("sql_mode", "")
     exclude_list = kwargs.get("exclude_list", "")
+    max_parallel = kwargs.get("max_parallel", 1)
+    password = kwargs.get("password")
 
     session = kwargs.get("session")
     interactive = kwargs.get("interactive", core.get_interactive_default())
     raise_exceptions = kwargs.get("raise_exceptions", not interactive)
 
+    from mds_plugin import heatwave_loader
+
     try:
         if not schemas:
             raise ValueError("At least one schema needs to be specified.")
@@ -78,12 +85,10 @@ def mds_heat_wave_load_data(**kwargs):
         set_load_parallelism = (
             "TRUE" if optimize_load_parallelism else "FALSE")
 
-        schemasJson = "JSON_ARRAY(" + \
-            ', '.join(f'"{s}"' for s in schemas) + ")"
         optionsJson = ("JSON_OBJECT("
                        f'"mode", "{mode}", '
                        f'"output", "{output}", '
-                       f'"sql_mode", {sql_mode}, '
+                       f'"sql_mode", "{sql_mode}", '
                        f'"policy", "{policy}", '
                        f'"set_load_parallelism", {set_load_parallelism}, '
                        f'"auto_enc", JSON_OBJECT("mode", "{"check" if enable_memory_check else "off"}")')
@@ -94,30 +99,24 @@ def mds_heat_wave_load_data(**kwargs):
         if interactive:
             print(f"Loading Data to HeatWave Cluster Using Auto Parallel Load.\n")
 
-        sql = f"CALL sys.heatwave_load({schemasJson}, {optionsJson})"
+        if max_parallel > 1 and len(schemas) > 1:
+            return heat_wave_load_data_in_parallel(
+                schemas=schemas, options_json=optionsJson,
+                max_parallel=max_parallel, password=password,
+                session=session, interactive=interactive)
+
+        sql = heatwave_loader.get_heat_wave_load_sql(schemas, optionsJson)
         if interactive:
             print(f"MySQL > {sql}\n")
 
         res = session.run_sql(sql)
 
-        out_str = ""
-        next_result = True
-        while next_result:
-            rows = res.fetch_all()
-
-            if len(rows) == 0:
-                next_result = res.next_result()
-                continue
-
-            if interactive:
-                print(core.format_result_set(res, rows, addFooter=False))
-            else:
-                out_str += out_str + "\n"
-
-            next_result = res.next_result()
-
-        if not interactive:
-            return out_str
+        results = heatwave_loader.format_results(res)
+        if interactive:
+            for result in results:
+                print(result)
+        else:
+            return "\n".join(results)
 
     except Exception as e:
         if raise_exceptions:
@@ -126,6 +125,83 @@ def mds_heat_wave_load_data(**kwargs):
             print(f"Error: {str(e)}")
 
 
+def heat_wave_load_data_in_parallel(schemas, options_json, max_parallel,
+                                    password, session, interactive):
+    """Loads each schema with its own sys.heatwave_load() call in parallel
+
+    The loads run on up to max_parallel additional sessions opened to the
+    server of the given session, which is used to track the progress.
+
+    Args:
+        schemas (list): The list of schemas
+        options_json (str): The SQL expression of the options JSON object
+        max_parallel (int): The number of schemas loaded at the same time
+        password (str): The password used to open the additional sessions
+        session (object): The database session to use.
+        interactive (bool): Indicates whether to execute in interactive mode
+
+    Returns:
+       None in interactive mode, the result sets as string otherwise
+    """
+    import mysqlsh
+    from mds_plugin import heatwave_loader
+
+    # Open the sessions up front, so a password prompt happens here and not
+    # in one of the load threads
+    sessions = []
+    try:
+        for _ in range(min(max_parallel, len(schemas))):
+            if password is not None:
+                sessions.append(mysqlsh.globals.shell.open_session(
+                    session.uri, password))
+            else:
+                sessions.append(
+                    mysqlsh.globals.shell.open_session(session.uri))
+
+        def load_status(data):
+            if not interactive:
+                return
+            if data["status"] == "BEGIN":
+                print(f"Loading schema {data['schema']} ...")
+            elif data["status"] == "END":
+                print(f"Schema {data['schema']} loaded in "
+                      f"{data['seconds']:.1f}s.")
+            elif data["status"] == "ERROR":
+                print(f"Schema {data['schema']} - ERROR: {data['error']}")
+            elif data["status"] == "PROGRESS" and \
+                    data.get("rows_per_second") is not None:
+                print(f"  {heatwave_loader.format_table_load(data)}")
+
+        results, tables = heatwave_loader.parallel_heat_wave_load(
+            schemas=schemas, options_json=options_json, sessions=sessions,
+            status_fn=load_status, progress_session=session)
+    finally:
+        for load_session in sessions:
+            load_session.close()
+
+    failed = [schema for schema, result in results.items()
+              if isinstance(result, Exception)]
+    if failed:
+        raise Exception(
+            f"{len(failed)} schema{'s' if len(failed) > 1 else ''} could not "
+            f"be loaded: {', '.join(failed)}")
+
+    out = []
+    for schema in schemas:
+        out.append(f"\nSchema {schema}:")
+        out.extend(results[schema])
+
+    if interactive:
+        for line in out:
+            print(line)
+    else:
+        # Add the throughput of the tables, printed while loading otherwise
+        out.extend(heatwave_loader.format_table_load(table)
+                   for table in tables
+                   if table.get("rows_per_second") is not None)
+        return "\n".join(out).strip()
+
+
 @plugin_function('mds.util.createComputeInstanceForEndpoint')
 def create_compute_instance_for_endpoint(**kwargs):
     """Returns a public compute instance
@@ -1031,6 +1107,7 @@ def import_from_bucket(**kwargs):
         admin_password (str): The password of the administrator account
         private_key_file_path (str): The file path to an SSH private key
         perform_cleanup (bool): Whether the PARs and bucket should be deleted
+        threads (int): The number of threads the dump is loaded with
         compartment_id (str): The OCID of the compartment
         config (object): An OCI config object or None.
         interactive (bool): Whether user input is considered
@@ -1049,6 +1126,7 @@ def import_from_bucket(**kwargs):
     db_system_ip = kwargs.get("db_system_ip")
     db_system_port = kwargs.get("db_system_port")
     perform_cleanup = kwargs.get("perform_cleanup")
+    threads = kwargs.get("threads")
     compartment_id = kwargs.get("compartment_id")
     config = kwargs.get("config")
     interactive = kwargs.get("interactive", True)
@@ -1212,6 +1290,8 @@ def import_from_bucket(**kwargs):
                        '--loadUsers=true',
                        '--showProgress=true',
                        '--ignoreVersion=true']
+                if threads:
+                    cmd.append(f'--threads={int(threads)}')
                 cmd = " ".join(cmd)
 
                 # Open channel
@@ -39,6 +39,7 @@ def dump(path, **kwargs):
         schema_name (str): The name of the schema to be exported.
         object_id (str): The ID of the object to be exported.
         object_name (str): The name of the object to be exported.
+        streaming (bool): Writes newline delimited JSON records instead of a single JSON document.
         session (object): The database session to use.
     """
     print(kwargs)
@@ -60,10 +61,15 @@ def dump(path, **kwargs):
         target_object, object_id = lib.core.identify_target_object(session,
                                                                    service_conditions, schema_conditions, object_conditions)
 
-        lib.core.select('mrs_user_schema_version').exec(session).first
+        version = lib.core.select('mrs_user_schema_version').exec(session).first
 
-        export = {'type': f"mrs{target_object.capitalize()}", 'version': lib.core.select(
-            'mrs_user_schema_version').exec(session).first}
+        if kwargs.get('streaming', False):
+            with open(path, 'w') as file:
+                lib.dump.write_dump_stream(
+                    session, file, target_object, object_id, version)
+            return
+
+        export = {'type': f"mrs{target_object.capitalize()}", 'version': version}
         if target_object == "service":
             export['service'] = lib.dump.get_service_dump(session, object_id)
         elif target_object == "schema":
@@ -72,7 +78,7 @@ def dump(path, **kwargs):
             export['object'] = lib.dump.get_db_object_dump(session, object_id)
 
         with open(path, 'w') as file:
-            file.write(json.dumps(export, indent=4))
+            json.dump(export, file, indent=4)
 
 
 @plugin_function('mrs.dump.service', shell=True, cli=True, web=True)
@@ -85,6 +91,7 @@ def dump_service(path, **kwargs):
     Keyword Args:
         service_id (str): The ID of the service to be exported.
         service_name (str): The name of the service to be exported.
+        streaming (bool): Writes newline delimited JSON records instead of a single JSON document.
         session (object): The database session to use.
     """
     dump(path, **kwargs)
@@ -102,6 +109,7 @@ def dump_schema(path, **kwargs):
         service_name (str): The name of the service to be exported.
         schema_id (str): The ID of the schema to be exported.
         schema_name (str): The name of the schema to be exported.
+        streaming (bool): Writes newline delimited JSON records instead of a single JSON document.
         session (object): The database session to use.
     """
     dump(path, **kwargs)
@@ -121,6 +129,7 @@ def dump_object(path, **kwargs):
         schema_name (str): The name of the schema to be exported.
         object_id (str): The ID of the object to be exported.
         object_name (str): The name of the object to be exported.
+        streaming (bool): Writes newline delimited JSON records instead of a single JSON document.
         session (object): The database session to use.
     """
     print(kwargs)
@@ -139,6 +148,7 @@ def load(path, **kwargs):
         schema_id (str): The ID of the target schema.
         schema_name (str): The name of the target schema.
         reuse_ids (bool): Indicates whether the existing ids should be reused.
+        batch_size (int): The number of records loaded per transaction from a streamed dump.
         session (object): The database session to use during the import.
     """
     session = kwargs.get('session', None)
@@ -168,49 +178,73 @@ def load(path, **kwargs):
             raise RuntimeError(
                 f"Unable to import data into objects of type: {target_object}.")
 
-        content = None
         try:
-            with open(path) as file:
-                content = json.load(file)
+            file = open(path)
         except Exception as e:
             raise RuntimeError(
                 f"Unable to load from file '{path}': {str(e)}.")
 
-        # Validates it is a valid load scenario
-        if content["type"] != expected_type:
-            raise RuntimeError(
-                f"Unable to load a {content.type} dump into a {target_object}.")
-
-        # Validates that the versions are compatible
-        this_version = lib.core.select(
-            'mrs_user_schema_version').exec(session).first
-        this_version = (this_version["major"],
-                        this_version["minor"],
-                        this_version["patch"])
-        dump_version = (content["version"]["major"],
-                        content["version"]["minor"],
-                        content["version"]["patch"])
-
-        if this_version < dump_version:
-            raise RuntimeError(
-                "Unable to load a dump of a newer version of the MRS plugin.")
-        elif this_version > dump_version:
-            # TODO(rennox): Dump upgrade logic is triggered here
-            pass
-
-        grantList = []
-        with lib.core.MrsDbTransaction(session):
-            if target_object == "service":
-                service = lib.services.get_service(
-                    session, service_id=object_id)
-                _, grant = lib.dump.load_schema_dump(
-                    session, object_id, content["schema"], reuse_ids)
-                grantList = grantList + grant
-            elif target_object == "schema":
-                schema = lib.schemas.get_schema(session, schema_id=object_id)
-                _, grant = lib.dump.load_object_dump(
-                    session, object_id, content["object"], reuse_ids)
-                grantList.append(grant)
+        with file:
+            # A streamed dump starts with a header record on its first line,
+            # anything else is read as a single JSON document
+            content = None
+            try:
+                header = json.loads(file.readline())
+                if isinstance(header, dict) and header.get("record") == "header":
+                    content = header
+            except ValueError:
+                pass
+
+            if content is None:
+                try:
+                    file.seek(0)
+                    content = json.load(file)
+                except Exception as e:
+                    raise RuntimeError(
+                        f"Unable to load from file '{path}': {str(e)}.")
+
+            # Validates it is a valid load scenario
+            if content["type"] != expected_type:
+                raise RuntimeError(
+                    f"Unable to load a {content['type']} dump into a {target_object}.")
+
+            # Validates that the versions are compatible
+            this_version = lib.core.select(
+                'mrs_user_schema_version').exec(session).first
+            this_version = (this_version["major"],
+                            this_version["minor"],
+                            this_version["patch"])
+            dump_version = (content["version"]["major"],
+                            content["version"]["minor"],
+                            content["version"]["patch"])
+
+            if this_version < dump_version:
+                raise RuntimeError(
+                    "Unable to load a dump of a newer version of the MRS plugin.")
+            elif this_version > dump_version:
+                # TODO(rennox): Dump upgrade logic is triggered here
+                pass
+
+            grantList = []
+            if content.get("record") == "header":
+                grantList = lib.dump.load_dump_stream(
+                    session, lib.dump.read_dump_stream(file), target_object,
+                    object_id, reuse_ids,
+                    kwargs.get('batch_size', lib.dump.STREAM_BATCH_SIZE))
+            else:
+                with lib.core.MrsDbTransaction(session):
+                    if target_object == "service":
+                        service = lib.services.get_service(
+                            session, service_id=object_id)
+                        _, grant = lib.dump.load_schema_dump(
+                            session, object_id, content["schema"], reuse_ids)
+                        grantList = grantList + grant
+                    elif target_object == "schema":
+                        schema = lib.schemas.get_schema(
+                            session, schema_id=object_id)
+                        _, grant = lib.dump.load_object_dump(
+                            session, object_id, content["object"], reuse_ids)
+                        grantList.append(grant)
 
         for grants in grantList:
             for grant in grants:
@@ -228,6 +262,7 @@ def load_schema(path, **kwargs):
         service_id (str): The ID of target service.
         service_name (str): The name of the target service.
         reuse_ids (bool): Indicates whether the existing ids should be reused.
+        batch_size (int): The number of records loaded per transaction from a streamed dump.
         session (object): The database session to use during the import.
     """
     load(path, **kwargs)
@@ -246,6 +281,7 @@ def load_object(path, **kwargs):
         schema_id (str): The ID of the target schema.
         schema_name (str): The name of the target schema.
         reuse_ids (bool): Indicates whether the existing ids should be reused.
+        batch_size (int): The number of records loaded per transaction from a streamed dump.
         session (object): The database session to use during the import.
     """
     load(path, **kwargs)
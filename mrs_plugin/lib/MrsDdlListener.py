@@ -1472,10 +1472,16 @@ class MrsDdlListener(MRSListener):
 
 
 class MrsDdlErrorListener(antlr4.error.ErrorListener.ErrorListener):
-    def __init__(self, errors):
+    def __init__(self, errors, line_offset=0, column_offset=0):
         self.errors = errors
+        # Position of the parsed text in the script, when parsing single statements
+        self.line_offset = line_offset
+        self.column_offset = column_offset
 
     def syntaxError(self, recognizer, offendingSymbol, line, column, msg, e):
+        if line == 1:
+            column += self.column_offset
+        line += self.line_offset
         self.errors.append({
             "line": line,
             "column": column,
@@ -21,13 +21,26 @@
 # along with this program; if not, write to the Free Software Foundation, Inc.,
 # 51 Franklin St, Fifth Floor, Boston, MA 02110-1301 USA
 
+import itertools
+import json
+
 from mrs_plugin import lib
-from mrs_plugin.lib import core, db_objects
+from mrs_plugin.lib import core
+
+# Number of db_objects fetched per round of metadata queries when streaming a dump
+STREAM_CHUNK_SIZE = 100
+
+# Number of db_objects loaded per transaction when loading a streamed dump
+STREAM_BATCH_SIZE = 100
+
+
+def hex_binary_formatter(value):
+    return f"0x{value.hex()}"
 
 
 def get_object_fields(session, id):
     return lib.core.select('field', where=['db_object_id=?'],
-                           binary_formatter=lambda x: f"0x{x.hex()}").exec(
+                           binary_formatter=hex_binary_formatter).exec(
         session, params=[id]).items
 
 
@@ -70,68 +83,134 @@ def reformat_field(field):
         object_reference['id'] = field['represents_reference_id']
 
 
-def get_object_dump(session, id):
-    'Gets a dump of the objects associated to a db_object'
+def group_by(items, key):
+    'Groups the given items by the value of the given key, keeping their order'
+    groups = {}
+    for item in items:
+        groups.setdefault(item[key], []).append(item)
+
+    return groups
+
+
+def get_db_object_dumps(session, db_object_condition, params):
+    """Gets the dumps of all db_objects matching the given condition
+
+    Instead of querying the objects and fields of each db_object one by one,
+    each metadata table is queried once for all the db_objects and the dumps
+    are assembled in memory, so the number of queries does not depend on the
+    number of db_objects.
+
+    Args:
+        session (object): The database session to use.
+        db_object_condition (str): The condition on the db_object table.
+        params (list): The parameters of the condition.
+
+    Returns:
+        The list of db_object dumps
+    """
+    db_object_ids = f"""
+        SELECT id FROM `mysql_rest_service_metadata`.`db_object`
+        WHERE {db_object_condition}"""
+    object_ids = f"""
+        SELECT id FROM `mysql_rest_service_metadata`.`object`
+        WHERE db_object_id IN ({db_object_ids})"""
+
+    dumps = lib.core.select(
+        'db_object', where=[db_object_condition],
+        binary_formatter=hex_binary_formatter).exec(session, params=params).items
+
     objects = lib.core.select(
-        'object', where=['db_object_id=?'],
-        binary_formatter=lambda x: f"0x{x.hex()}").exec(
-        session, params=[id]).items
+        'object', where=[f"db_object_id IN ({db_object_ids})"],
+        binary_formatter=hex_binary_formatter).exec(session, params=params).items
+
+    fields = lib.core.MrsDbExec(f"""
+        SELECT *
+        FROM `mysql_rest_service_metadata`.`object_fields_with_references`
+        WHERE object_id IN ({object_ids})""",
+        binary_formatter=hex_binary_formatter).exec(session, params=params).items
 
+    fields_by_object = group_by(fields, 'object_id')
     for obj in objects:
         # Removes fields if they are None in object
         cleanup_object(obj)
-        id = core.id_to_binary(obj['id'], 'object.id')
-        obj['fields'] = db_objects.get_object_fields_with_references(
-            session,
-            id,
-            binary_formatter=lambda x: f"0x{x.hex()}")
+        obj['fields'] = fields_by_object.get(obj['id'], [])
 
         for field in obj['fields']:
             reformat_field(field)
 
-    return objects
+    # A db_object may have one or more associated objects (from the object table)
+    objects_by_db_object = group_by(objects, 'db_object_id')
+    for db_object in dumps:
+        db_object["objects"] = objects_by_db_object.get(db_object['id'], [])
+
+    return dumps
+
+
+def iter_db_object_dumps(session, db_object_condition, params,
+                         chunk_size=STREAM_CHUNK_SIZE):
+    """Yields the dumps of all db_objects matching the given condition
+
+    The db_objects are dumped in chunks of chunk_size using
+    get_db_object_dumps, so at most one chunk of dumps is kept in memory.
+
+    Args:
+        session (object): The database session to use.
+        db_object_condition (str): The condition on the db_object table.
+        params (list): The parameters of the condition.
+        chunk_size (int): The number of db_objects to dump per chunk.
+
+    Returns:
+        A generator of db_object dumps
+    """
+    ids = [row["id"] for row in lib.core.select(
+        'db_object', cols=['id'], where=[db_object_condition],
+        order='id').exec(session, params=params).items]
+
+    for start in range(0, len(ids), chunk_size):
+        chunk = ids[start:start + chunk_size]
+        yield from get_db_object_dumps(
+            session, f"id IN ({','.join(['?'] * len(chunk))})", chunk)
+
+
+def get_object_dump(session, id):
+    'Gets a dump of the objects associated to a db_object'
+    dumps = get_db_object_dumps(session, 'id=?', [id])
+
+    return dumps[0]["objects"] if dumps else []
 
 
 def get_db_object_dump(session, id):
     'Gets a dump for a db_object'
-    obj = lib.core.select('db_object', where=['id=?'],
-                          binary_formatter=lambda x: f"0x{x.hex()}").exec(
-        session, params=[id]).first
+    dumps = get_db_object_dumps(session, 'id=?', [id])
 
-    # A db_object may have one or more associated objects (from the object table)
-    obj["objects"] = get_object_dump(session, id)
-
-    return obj
+    return dumps[0] if dumps else None
 
 
 def get_db_schema_dump(session, id):
     schema = lib.core.select('db_schema', where=['id=?'],
-                             binary_formatter=lambda x: f"0x{x.hex()}").exec(
+                             binary_formatter=hex_binary_formatter).exec(
         session, params=[id]).first
 
-    schema["objects"] = []
-
-    objects = lib.core.select('db_object', cols=['id'], where=['db_schema_id=?']).exec(
-        session, params=[id]).items
-
-    schema["objects"] = [get_db_object_dump(
-        session, object['id']) for object in objects]
+    schema["objects"] = get_db_object_dumps(session, 'db_schema_id=?', [id])
 
     return schema
 
 
 def get_service_dump(session, id):
     service = lib.core.select('service', where=['id=?'],
-                              binary_formatter=lambda x: f"0x{x.hex()}").exec(
+                              binary_formatter=hex_binary_formatter).exec(
         session, params=[id]).first
 
-    service["schemas"] = []
+    service["schemas"] = lib.core.select(
+        'db_schema', where=['service_id=?'],
+        binary_formatter=hex_binary_formatter).exec(session, params=[id]).items
 
-    schemas = lib.core.select('db_schema', cols=['id'], where=['service_id=?']).exec(
-        session, params=[id]).items
+    dumps = get_db_object_dumps(session, """db_schema_id IN (
+        SELECT id FROM `mysql_rest_service_metadata`.`db_schema` WHERE service_id=?)""", [id])
 
-    service["schemas"] = [get_db_schema_dump(
-        session, schema['id']) for schema in schemas]
+    dumps_by_schema = group_by(dumps, 'db_schema_id')
+    for schema in service["schemas"]:
+        schema["objects"] = dumps_by_schema.get(schema['id'], [])
 
     return service
 
@@ -186,7 +265,8 @@ def load_object_dump(session, target_schema_id, object, reuse_ids):
             "row_user_ownership_column", None))
 
 
-def load_schema_dump(session, target_service_id, schema, reuse_ids):
+def load_schema(session, target_service_id, schema, reuse_ids):
+    'Adds the schema of a dump to the target service, without its objects'
     schema_id = None
     if reuse_ids:
         schema_id = lib.core.id_to_binary(schema["id"], "object.id")
@@ -202,9 +282,125 @@ def load_schema_dump(session, target_service_id, schema, reuse_ids):
                                        schema["options"],
                                        schema_id=schema_id)
 
+    return schema_id
+
+
+def load_schema_dump(session, target_service_id, schema, reuse_ids):
+    schema_id = load_schema(session, target_service_id, schema, reuse_ids)
+
     grants = []
     for obj in schema["objects"]:
         _, grant = load_object_dump(session, schema_id, obj, reuse_ids)
         grants.append(grant)
 
     return schema_id, grants
+
+
+def write_dump_stream(session, file, target_object, object_id, version):
+    """Writes a dump as newline delimited JSON records
+
+    The first record is a header with the dump type and version, followed by
+    one record per service, schema and db_object. A db_object record belongs
+    to the schema record preceding it.
+
+    Args:
+        session (object): The database session to use.
+        file (object): The file object the records are written to.
+        target_object (str): The type of the dumped object.
+        object_id (bytes): The id of the dumped object.
+        version (dict): The MRS metadata version.
+    """
+    def write(record, **content):
+        file.write(json.dumps({"record": record, **content}))
+        file.write("\n")
+
+    write("header", type=f"mrs{target_object.capitalize()}", version=version)
+
+    if target_object == "object":
+        write("dbObject", data=get_db_object_dump(session, object_id))
+        return
+
+    if target_object == "service":
+        write("service", data=lib.core.select(
+            'service', where=['id=?'],
+            binary_formatter=hex_binary_formatter).exec(
+            session, params=[object_id]).first)
+        schemas = lib.core.select(
+            'db_schema', where=['service_id=?'],
+            binary_formatter=hex_binary_formatter).exec(
+            session, params=[object_id]).items
+    else:
+        schemas = [lib.core.select(
+            'db_schema', where=['id=?'],
+            binary_formatter=hex_binary_formatter).exec(
+            session, params=[object_id]).first]
+
+    for schema in schemas:
+        write("schema", data=schema)
+        schema_id = lib.core.id_to_binary(schema["id"], "schema_id")
+        for db_object in iter_db_object_dumps(
+                session, 'db_schema_id=?', [schema_id]):
+            write("dbObject", data=db_object)
+
+
+def read_dump_stream(file):
+    """Yields the records of a dump written by write_dump_stream
+
+    Args:
+        file (object): The file object positioned after the header record.
+
+    Returns:
+        A generator of records
+    """
+    for line_number, line in enumerate(file, start=2):
+        if not line.strip():
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError as e:
+            raise RuntimeError(
+                f"Invalid dump record at line {line_number}: {str(e)}.")
+
+
+def load_dump_stream(session, records, target_object, target_id, reuse_ids,
+                     batch_size=STREAM_BATCH_SIZE):
+    """Loads the records of a streamed dump into the target object
+
+    The records are loaded in transactions of batch_size records, so neither
+    the dump nor a single huge transaction is held while loading.
+
+    Args:
+        session (object): The database session to use.
+        records (iterable): The dump records, without the header record.
+        target_object (str): The type of the target object, service or schema.
+        target_id (bytes): The id of the target object.
+        reuse_ids (bool): Indicates whether the existing ids should be reused.
+        batch_size (int): The number of records loaded per transaction.
+
+    Returns:
+        The list of grants of the loaded db_objects
+    """
+    grants = []
+    schema_id = target_id if target_object == "schema" else None
+    records = iter(records)
+
+    while True:
+        batch = list(itertools.islice(records, batch_size))
+        if not batch:
+            break
+
+        with lib.core.MrsDbTransaction(session):
+            for record in batch:
+                record_type = record.get("record")
+                if record_type == "schema" and target_object == "service":
+                    schema_id = load_schema(
+                        session, target_id, record["data"], reuse_ids)
+                elif record_type == "dbObject" and schema_id is not None:
+                    _, grant = load_object_dump(
+                        session, schema_id, record["data"], reuse_ids)
+                    grants.append(grant)
+                else:
+                    raise RuntimeError(
+                        f"Unexpected dump record '{record_type}' while loading into a {target_object}.")
+
+    return grants
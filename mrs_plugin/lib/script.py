@@ -23,7 +23,13 @@
 
 import mrs_plugin.lib as lib
 import os.path
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+import time
 import antlr4
+from antlr4.dfa.DFA import DFA
 from antlr4.error.Errors import ParseCancellationException
 from antlr4.error.ErrorStrategy import DefaultErrorStrategy
 from mrs_plugin.lib.mrs_parser import MRSLexer
@@ -32,6 +38,265 @@ from mrs_plugin.lib.MrsDdlListener import MrsDdlListener, MrsDdlErrorListener
 from mrs_plugin.lib.MrsDdlExecutor import MrsDdlExecutor
 
 
+# Number of parsed statements kept in the statement cache
+STATEMENT_CACHE_SIZE = 1024
+
+# Parse trees of successfully parsed statements, keyed by the hash of the statement text, so that
+# running nearly identical scripts again only parses the statements that have been changed
+_statement_cache = OrderedDict()
+_statement_cache_lock = threading.Lock()
+
+# Matches the statement delimiter as well as quoted text and comments, which may contain semicolons
+_STATEMENT_DELIMITER = re.compile(r"""
+    '(?:\\.|[^'\\])*'
+    | "(?:\\.|[^"\\])*"
+    | `(?:\\.|[^`\\])*`
+    | /\*.*?\*/
+    | \#[^\n\r]*
+    | --(?:[ \t][^\n\r]*)?
+    | (?P<delimiter>;)""", re.VERBOSE | re.DOTALL)
+
+
+# Representative statements used to build up the DFA cache of the lexer and parser, see warm_up_parser()
+WARM_UP_STATEMENTS = [
+    'CONFIGURE REST METADATA ENABLED UPDATE IF AVAILABLE',
+    'CREATE OR REPLACE REST SERVICE localhost/myService ENABLED COMMENTS "A REST service" '
+    'AUTHENTICATION PATH "/authentication" REDIRECTION DEFAULT VALIDATION DEFAULT PAGE CONTENT DEFAULT '
+    'OPTIONS {"http": {"allowedOrigin": "auto"}, "returnInternalErrorDetails": true} METADATA {"position": 1}',
+    'CREATE REST SCHEMA /sakila ON SERVICE localhost/myService FROM `sakila` ENABLED '
+    'AUTHENTICATION REQUIRED ITEMS PER PAGE 25 COMMENTS "The sakila schema"',
+    'CREATE OR REPLACE REST DATA MAPPING VIEW /country ON SERVICE localhost/myService SCHEMA /sakila '
+    'AS sakila.country CLASS MyServiceSakilaCountry @INSERT @UPDATE @DELETE @NOCHECK {'
+    'countryId: country_id @SORTABLE, country: country, cities: sakila.city @UNNEST {city: city}'
+    '} ENABLED AUTHENTICATION REQUIRED ITEMS PER PAGE 25 FORMAT FEED',
+    'CREATE OR REPLACE REST PROCEDURE /filmInStock AS sakila.film_in_stock '
+    'PARAMETERS MyServiceSakilaFilmInStockParams {pFilmId: p_film_id @IN, pFilmCount: p_film_count @OUT} '
+    'RESULT MyServiceSakilaFilmInStock {inventoryId: inventory_id @DATATYPE("int")}',
+    'CREATE OR REPLACE REST FUNCTION /actorFunc AS sakila.actor_func',
+    'CREATE REST CONTENT SET /staticContent ON SERVICE localhost/myService FROM "./static" IGNORE "*.txt"',
+    'CREATE REST AUTH APP "MRS" ON SERVICE localhost/myService VENDOR MRS',
+    'CREATE REST USER "user"@"MRS" IDENTIFIED BY "password"',
+    'ALTER REST SERVICE localhost/myService NEW REQUEST PATH localhost/myAlteredService DISABLED',
+    'USE REST SERVICE localhost/myService',
+    'SHOW CREATE REST VIEW /country',
+    'SHOW REST SERVICES',
+    'DROP REST SCHEMA /sakila',
+]
+
+# The lexer and parser of each thread are reused for all statements, only the input stream is replaced
+_parser_instances = threading.local()
+
+# The DFA cache shared by all lexer and parser instances is updated while parsing, so only one statement is
+# parsed at a time
+_parser_lock = threading.RLock()
+
+# The thread building up the DFA cache, started once the first script has been parsed
+_warm_up_thread = None
+
+
+def get_mrs_parser(mrs_statement):
+    """Returns the parser of the current thread, set up to parse the given statement
+
+    Building the lexer and parser is expensive, so the instances are created
+    once per thread and only their input is reset for every statement.
+
+    Args:
+        mrs_statement (str): The statement to parse
+
+    Returns:
+        The MRSParser instance
+    """
+    parser = getattr(_parser_instances, "parser", None)
+    if parser is None:
+        lexer = MRSLexer(antlr4.InputStream(mrs_statement))
+        parser = MRSParser(antlr4.CommonTokenStream(lexer))
+        _parser_instances.parser = parser
+    else:
+        tokens = parser.getTokenStream()
+        lexer = tokens.tokenSource
+        lexer.inputStream = antlr4.InputStream(mrs_statement)
+        tokens.setTokenSource(lexer)
+        parser.setTokenStream(tokens)
+
+    parser.removeErrorListeners()
+
+    return parser
+
+
+def warm_up_parser():
+    """Builds up the DFA cache of the lexer and parser
+
+    The DFA cache is shared by all lexer and parser instances of the process and
+    is built lazily while parsing, which makes the first statements parsed in a
+    new process slow. This parses a representative set of statements, one at a
+    time, so statements parsed by other threads only wait for one of them.
+
+    Returns:
+        The time taken in seconds
+    """
+    start = time.perf_counter()
+    for statement in WARM_UP_STATEMENTS:
+        parse_mrs_statement(statement, [])
+
+    return time.perf_counter() - start
+
+
+def start_parser_warm_up():
+    """Runs warm_up_parser() in a background thread, once per process
+
+    Returns:
+        The started thread or None if the warm-up has been started before
+    """
+    global _warm_up_thread
+
+    with _parser_lock:
+        if _warm_up_thread is not None:
+            return None
+
+        _warm_up_thread = threading.Thread(
+            target=warm_up_parser, name="MrsParserWarmUp", daemon=True)
+
+    _warm_up_thread.start()
+
+    return _warm_up_thread
+
+
+def clear_parser_dfa_cache():
+    """Clears the DFA cache of the lexer and parser
+
+    Mainly useful to measure the parse times of a newly started process.
+    """
+    with _parser_lock:
+        for recognizer in (MRSLexer, MRSParser):
+            for i, decision_state in enumerate(recognizer.atn.decisionToState):
+                recognizer.decisionsToDFA[i] = DFA(decision_state, i)
+
+        MRSParser.sharedContextCache.cache.clear()
+
+
+def split_mrs_script(mrs_script):
+    """Splits the given MRS script into its statements
+
+    The statements are delimited by semicolons, semicolons inside of quoted
+    text or comments are skipped. This is a lot cheaper than lexing the whole
+    script, so only the statements that are not cached need to be lexed.
+
+    Args:
+        mrs_script (str): The script to split
+
+    Returns:
+        A list of (text, line, column) tuples, one per statement, where line
+        and column are the position of the statement in the script
+    """
+    statements = []
+    start = 0
+    line = 1
+    line_start = 0
+
+    def add_statement(end):
+        nonlocal line, line_start
+
+        segment = mrs_script[start:end]
+        text = segment.strip()
+        if text:
+            offset = start + len(segment) - len(segment.lstrip())
+            line += mrs_script.count("\n", line_start, offset)
+            line_start = mrs_script.rfind("\n", 0, offset) + 1
+            statements.append((text, line, offset - line_start))
+
+    for match in _STATEMENT_DELIMITER.finditer(mrs_script):
+        if match.group("delimiter") is not None:
+            add_statement(match.start())
+            start = match.end()
+    add_statement(len(mrs_script))
+
+    return statements
+
+
+def parse_mrs_statement(mrs_statement, syntax_errors, line=1, column=0):
+    """Parses a single MRS statement
+
+    Args:
+        mrs_statement (str): The statement to parse
+        syntax_errors (list): The list the syntax errors are added to
+        line (int): The line of the statement in the script
+        column (int): The column of the statement in the script
+
+    Returns:
+        The parse tree of the statement
+    """
+    with _parser_lock:
+        parser = get_mrs_parser(mrs_statement)
+        tokens = parser.getTokenStream()
+
+        # First try with the faster SLL parsing strategy
+        parser._interp.predictionMode = antlr4.PredictionMode.SLL
+        parser._errHandler = antlr4.BailErrorStrategy()
+
+        try:
+            tree = parser.mrsScript()
+        except ParseCancellationException as e:
+            # If the SLL strategy was not strong enough
+            # perform a Stage 2 parse with the default LL prediction mode
+            # cspell:ignore interp
+            tokens.reset()
+            parser.reset()
+            parser.addErrorListener(MrsDdlErrorListener(
+                syntax_errors, line_offset=line - 1, column_offset=column))
+            parser._errHandler = DefaultErrorStrategy()
+            parser._interp.predictionMode = antlr4.PredictionMode.LL
+            tree = parser.mrsScript()
+
+    return tree
+
+
+def parse_mrs_script(mrs_script, syntax_errors):
+    """Parses the given MRS script statement by statement
+
+    Statements that have been parsed successfully before are taken from the
+    statement cache instead of being parsed again.
+
+    Args:
+        mrs_script (str): The script to parse
+        syntax_errors (list): The list the syntax errors are added to
+
+    Returns:
+        The list of parse trees, one per statement
+    """
+    trees = []
+    for text, line, column in split_mrs_script(mrs_script):
+        key = hashlib.sha256(text.encode()).digest()
+
+        with _statement_cache_lock:
+            tree = _statement_cache.get(key)
+            if tree is not None:
+                _statement_cache.move_to_end(key)
+
+        if tree is None:
+            statement_errors = []
+            tree = parse_mrs_statement(text, statement_errors, line, column)
+
+            # Statements with syntax errors are not cached as the reported
+            # positions depend on the location of the statement in the script
+            if len(statement_errors) > 0:
+                syntax_errors.extend(statement_errors)
+            else:
+                with _statement_cache_lock:
+                    _statement_cache[key] = tree
+                    if len(_statement_cache) > STATEMENT_CACHE_SIZE:
+                        _statement_cache.popitem(last=False)
+
+        trees.append(tree)
+
+    return trees
+
+
+def clear_statement_cache():
+    """Removes all parse trees from the statement cache"""
+    with _statement_cache_lock:
+        _statement_cache.clear()
+
+
 def run_mrs_script(mrs_script=None, **kwargs):
     """Run the given MRS script
 
@@ -72,30 +337,12 @@ def run_mrs_script(mrs_script=None, **kwargs):
         except Exception as e:
             raise Exception(f"Error while loading file '{path}'. Error: {e}")
 
-    lexer = MRSLexer(antlr4.InputStream(mrs_script))
-
-    tokens = antlr4.CommonTokenStream(lexer)
-
-    parser = MRSParser(tokens)
-    parser.removeErrorListeners()
-    # First try with the faster SLL parsing strategy
-    parser._interp.predictionMode = antlr4.PredictionMode.SLL
-    parser._errHandler = antlr4.BailErrorStrategy()
+    # Prepare the parser for other kinds of statements, now that MRS scripts
+    # are being used, unless mrs.run.warmUpParser() did that already
+    start_parser_warm_up()
 
     syntax_errors = []
-
-    try:
-        tree = parser.mrsScript()
-    except ParseCancellationException as e:
-        # If the SLL strategy was not strong enough
-        # perform a Stage 2 parse with the default LL prediction mode
-        # cspell:ignore interp
-        tokens.reset()
-        parser.reset()
-        parser.addErrorListener(MrsDdlErrorListener(syntax_errors))
-        parser._errHandler = DefaultErrorStrategy()
-        parser._interp.predictionMode = antlr4.PredictionMode.LL
-        tree = parser.mrsScript()
+    trees = parse_mrs_script(mrs_script, syntax_errors)
 
     if len(syntax_errors) > 0:
         errors = []
@@ -120,7 +367,8 @@ def run_mrs_script(mrs_script=None, **kwargs):
                 session=session)
             walker = antlr4.ParseTreeWalker()
             try:
-                walker.walk(listener, tree)
+                for tree in trees:
+                    walker.walk(listener, tree)
             except Exception as e:
                 # The error will be in executor.results
                 executor.results.append(
@@ -222,13 +222,17 @@ def substitute_imports_in_template(template, enabled_crud_ops, required_datatype
         "Create", "Read", "Update",
         "Delete", "UpdateProcedure",
         "ReadUnique", "ReadFunction",
-        "Authenticate"
+        "Authenticate", "Batch"
     ]
     enabled_ops = set(enabled_crud_ops) if enabled_crud_ops else set()
 
     if requires_auth:
         enabled_ops.add("Authenticate")
 
+    # The bulk commands are available for every object that supports creating, updating or deleting single records
+    if enabled_ops & {"Create", "Update", "DeleteUnique"}:
+        enabled_ops.add("Batch")
+
     if required_datatypes is None:
         required_datatypes = []
 
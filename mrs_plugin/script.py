@@ -80,6 +80,20 @@ def run_mrs_script(mrs_script=None, **kwargs):
             raise
 
 
+@plugin_function('mrs.run.warmUpParser', shell=True, cli=True, web=True)
+def warm_up_parser():
+    """Prepares the MRS script parser in the background
+
+    The parser builds up its caches while parsing, which makes the first MRS
+    scripts parsed in a new shell slow. Calling this function ahead of
+    running the first script builds them in a background thread.
+
+    Returns:
+        None
+    """
+    lib.script.start_parser_warm_up()
+
+
 MRS_PREFIXES = [
     "CONFIGURE REST ",
     "CREATE REST ",
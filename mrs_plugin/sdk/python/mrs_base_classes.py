@@ -39,6 +39,7 @@ from datetime import datetime
 from typing import (
     TYPE_CHECKING,
     Any,
+    Awaitable,
     Callable,
     Generic,
     Literal,
@@ -54,7 +55,7 @@ from typing import (
     cast,
 )
 from urllib.parse import urlencode, quote
-from urllib.request import HTTPError, Request, urlopen
+from urllib.request import HTTPError, Request, URLError, urlopen
 
 
 ####################################################################################
@@ -158,6 +159,23 @@ class AuthAppNotFoundError(MrsError):
     _default_msg = "No auth apps are registered for the service"
 
 
+class MrsBatchError(MrsError):
+    """Raised when one or more records of a bulk command could not be processed.
+
+    The outcome of every record (successful or not) is available
+    in the `outcomes` attribute.
+    """
+
+    _default_msg = "One or more records of the bulk operation failed"
+
+    def __init__(
+        self, outcomes: Sequence["IMrsBatchOutcome"], msg: Optional[str] = None
+    ) -> None:
+        """Constructor."""
+        super().__init__(msg=msg)
+        self.outcomes = outcomes
+
+
 ####################################################################################
 #                                 Custom Types
 ####################################################################################
@@ -195,6 +213,9 @@ FuncResult = TypeVar("FuncResult", bound=str | int | float | bool)
 
 AuthAppName = TypeVar("AuthAppName", bound=Optional[str])
 
+BatchInput = TypeVar("BatchInput")
+BatchResult = TypeVar("BatchResult")
+
 
 class MrsResourceLink(TypedDict):
     """Available keys for the `links` field."""
@@ -239,6 +260,48 @@ class IMrsFunctionResponse(Generic[FuncResult], TypedDict):
     result: FuncResult
 
 
+class IMrsBatchOutcome(Generic[BatchResult], TypedDict):
+    """Outcome of a single record processed by a bulk command."""
+
+    index: int
+    ok: bool
+    result: Optional[BatchResult]
+    error: Optional[Exception]
+    attempts: int
+
+
+class MrsBatchOptions(TypedDict, total=False):
+    """Options supported by the bulk commands (`create_many()`,
+    `update_many()`, `create_batch()`, `update_batch()`...).
+
+    concurrency (int): maximum number of requests in flight at any
+        given time. Default value is `8`.
+        ```
+            actors = await self.my_service.sakila.actor.create_many(
+                [{"first_name": "Foo", "last_name": "Bar"}, ...], concurrency=16
+            )
+        ```
+    retries (int): how many times a record is submitted again after a
+        transient failure (e.g. a connection error or `503 Service Unavailable`).
+        Default value is `3`.
+    backoff (float): seconds to wait before the first retry, the delay
+        is doubled on every subsequent retry. Default value is `0.5`.
+    retry_non_idempotent (bool): whether records of non-idempotent commands
+        (`create_many()`, `create_batch()`) are also submitted again after
+        failures that may occur once the record has been processed (e.g.
+        `500 Internal Server Error`, `504 Gateway Timeout` or a timeout),
+        which may create duplicates. Otherwise, such records are only
+        submitted again if the request was rejected (`429 Too Many Requests`,
+        `503 Service Unavailable`) or the connection was refused. Default
+        value is `False`.
+    """
+
+    concurrency: int
+    retries: int
+    backoff: float
+    retry_non_idempotent: bool
+
+
 class AuthenticateOptions(Generic[AuthAppName], TypedDict):
     app_name: AuthAppName
     user: str
@@ -1152,6 +1215,174 @@ class MrsBaseObjectDelete(Generic[Filterable]):
         return json.loads(response.read(), object_hook=MrsJSONDataDecoder.convert_keys)
 
 
+class MrsBaseObjectBatch(Generic[BatchInput, BatchResult]):
+    """Implements the core logic utilized by the bulk commands.
+
+    Records are submitted by a fixed number of workers (see
+    `MrsBatchOptions.concurrency`), so the number of requests in flight
+    is bounded no matter how many records are processed. Records failing
+    because of transient errors are retried with exponential backoff.
+    Records of non-idempotent commands are only retried if the request was
+    not processed, unless `MrsBatchOptions.retry_non_idempotent` is set.
+    """
+
+    DEFAULT_CONCURRENCY = 8
+    DEFAULT_RETRIES = 3
+    DEFAULT_BACKOFF = 0.5
+
+    # HTTP status codes considered as temporary server-side conditions
+    TRANSIENT_HTTP_STATUS_CODES = frozenset((408, 429, 500, 502, 503, 504))
+
+    # HTTP status codes of requests rejected without being processed
+    UNPROCESSED_HTTP_STATUS_CODES = frozenset((429, 503))
+
+    def __init__(
+        self,
+        items: Sequence[BatchInput],
+        submit: Callable[[BatchInput], Awaitable[BatchResult]],
+        options: Optional[MrsBatchOptions] = None,
+        idempotent: bool = True,
+    ) -> None:
+        """Constructor.
+
+        Args:
+            items: records (or filters) to be processed.
+            submit: coroutine function processing a single record, e.g. `create()`.
+            options: See MrsBatchOptions to know more about the options.
+            idempotent: whether submitting a record twice has the same effect
+                as submitting it once, `False` for `create()`.
+        """
+        if options is None:
+            options = {}
+
+        self._items: Sequence[BatchInput] = items
+        self._submit: Callable[[BatchInput], Awaitable[BatchResult]] = submit
+        self._concurrency: int = max(
+            1, options.get("concurrency", MrsBaseObjectBatch.DEFAULT_CONCURRENCY)
+        )
+        self._retries: int = max(
+            0, options.get("retries", MrsBaseObjectBatch.DEFAULT_RETRIES)
+        )
+        self._backoff: float = options.get(
+            "backoff", MrsBaseObjectBatch.DEFAULT_BACKOFF
+        )
+        self._idempotent: bool = idempotent or options.get(
+            "retry_non_idempotent", False
+        )
+
+    @staticmethod
+    def is_transient(err: Exception) -> bool:
+        """Check if a request failed because of a temporary condition.
+
+        Args:
+            err: exception raised when processing the record.
+
+        Returns:
+            `True` if submitting the record again may succeed, `False` otherwise.
+        """
+        if isinstance(err, HTTPError):
+            return err.code in MrsBaseObjectBatch.TRANSIENT_HTTP_STATUS_CODES
+        return isinstance(err, (URLError, ConnectionError, TimeoutError))
+
+    @staticmethod
+    def is_unprocessed(err: Exception) -> bool:
+        """Check if a request failed without being processed by the server.
+
+        Args:
+            err: exception raised when processing the record.
+
+        Returns:
+            `True` if the request was rejected or the connection was refused,
+            `False` otherwise.
+        """
+        if isinstance(err, HTTPError):
+            return err.code in MrsBaseObjectBatch.UNPROCESSED_HTTP_STATUS_CODES
+        if isinstance(err, URLError):
+            return isinstance(err.reason, ConnectionRefusedError)
+        return isinstance(err, ConnectionRefusedError)
+
+    def _is_retriable(self, err: Exception) -> bool:
+        if self._idempotent:
+            return MrsBaseObjectBatch.is_transient(err)
+        return MrsBaseObjectBatch.is_unprocessed(err)
+
+    @staticmethod
+    def unwrap(outcomes: Sequence[IMrsBatchOutcome[BatchResult]]) -> list[BatchResult]:
+        """Get the results of a bulk command.
+
+        Args:
+            outcomes: list returned by `submit()`.
+
+        Raises:
+            MrsBatchError: if any of the records failed.
+
+        Returns:
+            The result of each record, in the same order the records were given.
+        """
+        if not all(outcome["ok"] for outcome in outcomes):
+            raise MrsBatchError(outcomes=outcomes)
+
+        return [cast(BatchResult, outcome["result"]) for outcome in outcomes]
+
+    async def _process(self, index: int, item: BatchInput) -> IMrsBatchOutcome[BatchResult]:
+        attempts = 0
+
+        while True:
+            attempts += 1
+            try:
+                result = await self._submit(item)
+            except Exception as err:  # pylint: disable=broad-exception-caught
+                if attempts > self._retries or not self._is_retriable(err):
+                    return {
+                        "index": index,
+                        "ok": False,
+                        "result": None,
+                        "error": err,
+                        "attempts": attempts,
+                    }
+                await asyncio.sleep(self._backoff * 2 ** (attempts - 1))
+            else:
+                return {
+                    "index": index,
+                    "ok": True,
+                    "result": result,
+                    "error": None,
+                    "attempts": attempts,
+                }
+
+    async def submit(self) -> list[IMrsBatchOutcome[BatchResult]]:
+        """Process all records as of `items` specified at construction time.
+
+        A failing record does not interrupt the processing of the others.
+
+        Returns:
+            A list with the outcome of each record, in the same order the
+            records were given:
+            ```
+                index: int
+                ok: bool
+                result: Optional[BatchResult]
+                error: Optional[Exception]
+                attempts: int
+            ```
+        """
+        outcomes: list[Optional[IMrsBatchOutcome[BatchResult]]] = [None] * len(
+            self._items
+        )
+        # Workers share the same iterator, so each record is picked up only once
+        pending = iter(enumerate(self._items))
+
+        async def worker() -> None:
+            for index, item in pending:
+                outcomes[index] = await self._process(index, item)
+
+        await asyncio.gather(
+            *(worker() for _ in range(min(self._concurrency, len(self._items))))
+        )
+
+        return cast(list[IMrsBatchOutcome[BatchResult]], outcomes)
+
+
 class MrsAuthenticate(Generic[AuthAppName]):
     def __init__(
         self,
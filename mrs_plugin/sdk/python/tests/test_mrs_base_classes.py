@@ -21,6 +21,7 @@
 # along with this program; if not, write to the Free Software Foundation, Inc.,
 # 51 Franklin St, Fifth Floor, Boston, MA 02110-1301 USA
 
+import asyncio
 import json
 import os
 import ssl
@@ -38,7 +39,7 @@ from typing import (
 )
 from unittest.mock import MagicMock
 from urllib.parse import quote, urlencode
-from urllib.request import HTTPError
+from urllib.request import HTTPError, URLError
 
 import pytest
 
@@ -51,6 +52,7 @@ from python.mrs_base_classes import (
     IMrsResourceDetails,
     IntField,
     MrsAuthenticate,
+    MrsBaseObjectBatch,
     MrsBaseObjectCreate,
     MrsBaseObjectDelete,
     MrsBaseObjectFunctionCall,
@@ -64,6 +66,7 @@ from python.mrs_base_classes import (
     Record,
     RecordNotFoundError,
     MrsBaseSession,
+    MrsBatchError,
     StringField,
     UndefinedDataClassField,
     UndefinedField,
@@ -1414,6 +1417,151 @@ async def test_query_encoder(
     )
 
 
+####################################################################################
+#                 Test "submit" Method (bulk commands' backbone)
+####################################################################################
+async def test_batch_submit_keeps_order():
+    """Check outcomes are reported in the same order records were given."""
+
+    async def submit(item: int) -> int:
+        await asyncio.sleep(item / 1000)
+        return item * 2
+
+    request = MrsBaseObjectBatch[int, int](items=[30, 10, 20], submit=submit)
+    outcomes = await request.submit()
+
+    assert [outcome["index"] for outcome in outcomes] == [0, 1, 2]
+    assert MrsBaseObjectBatch.unwrap(outcomes) == [60, 20, 40]
+
+
+async def test_batch_submit_bounded_concurrency():
+    """Check the number of requests in flight never exceeds `concurrency`."""
+    in_flight, max_in_flight = 0, 0
+
+    async def submit(item: int) -> int:
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.001)
+        in_flight -= 1
+        return item
+
+    request = MrsBaseObjectBatch[int, int](
+        items=list(range(50)), submit=submit, options={"concurrency": 4}
+    )
+    outcomes = await request.submit()
+
+    assert max_in_flight == 4
+    assert MrsBaseObjectBatch.unwrap(outcomes) == list(range(50))
+
+
+@pytest.mark.parametrize(
+    "error, retried",
+    [
+        (HTTPError(url="", code=503, msg="", hdrs=None, fp=None), True),  # type: ignore[arg-type]
+        (URLError(reason="Connection refused"), True),
+        (ConnectionResetError(), True),
+        (HTTPError(url="", code=400, msg="", hdrs=None, fp=None), False),  # type: ignore[arg-type]
+        (ValueError(), False),
+    ],
+)
+async def test_batch_submit_retries(error: Exception, retried: bool):
+    """Check only records failing because of transient errors are retried."""
+    submit = MagicMock(side_effect=[error, error, "foo"])
+
+    async def submit_async(item: str) -> str:
+        return submit(item)
+
+    request = MrsBaseObjectBatch[str, str](
+        items=["foo"], submit=submit_async, options={"retries": 3, "backoff": 0}
+    )
+    outcomes = await request.submit()
+
+    if retried:
+        assert outcomes == [
+            {"index": 0, "ok": True, "result": "foo", "error": None, "attempts": 3}
+        ]
+    else:
+        assert outcomes == [
+            {"index": 0, "ok": False, "result": None, "error": error, "attempts": 1}
+        ]
+
+
+@pytest.mark.parametrize(
+    "error, retried",
+    [
+        (HTTPError(url="", code=429, msg="", hdrs=None, fp=None), True),  # type: ignore[arg-type]
+        (HTTPError(url="", code=503, msg="", hdrs=None, fp=None), True),  # type: ignore[arg-type]
+        (URLError(reason=ConnectionRefusedError()), True),
+        (ConnectionRefusedError(), True),
+        (HTTPError(url="", code=500, msg="", hdrs=None, fp=None), False),  # type: ignore[arg-type]
+        (HTTPError(url="", code=504, msg="", hdrs=None, fp=None), False),  # type: ignore[arg-type]
+        (URLError(reason="Connection reset"), False),
+        (TimeoutError(), False),
+    ],
+)
+async def test_batch_submit_retries_non_idempotent(error: Exception, retried: bool):
+    """Check records of non-idempotent commands are only retried if they were not processed."""
+    submit = MagicMock(side_effect=[error, "foo"])
+
+    async def submit_async(item: str) -> str:
+        return submit(item)
+
+    request = MrsBaseObjectBatch[str, str](
+        items=["foo"],
+        submit=submit_async,
+        options={"retries": 3, "backoff": 0},
+        idempotent=False,
+    )
+    outcomes = await request.submit()
+
+    assert outcomes[0]["ok"] is retried
+    assert outcomes[0]["attempts"] == (2 if retried else 1)
+
+
+async def test_batch_submit_retries_non_idempotent_opt_in():
+    """Check all transient errors are retried if `retry_non_idempotent` is set."""
+    error = HTTPError(url="", code=504, msg="", hdrs=None, fp=None)  # type: ignore[arg-type]
+    submit = MagicMock(side_effect=[error, TimeoutError(), "foo"])
+
+    async def submit_async(item: str) -> str:
+        return submit(item)
+
+    request = MrsBaseObjectBatch[str, str](
+        items=["foo"],
+        submit=submit_async,
+        options={"retries": 3, "backoff": 0, "retry_non_idempotent": True},
+        idempotent=False,
+    )
+    outcomes = await request.submit()
+
+    assert outcomes == [
+        {"index": 0, "ok": True, "result": "foo", "error": None, "attempts": 3}
+    ]
+
+
+async def test_batch_submit_reports_failures():
+    """Check a failing record does not interrupt the processing of the others."""
+
+    async def submit(item: int) -> int:
+        if item == 1:
+            raise ValueError(item)
+        return item
+
+    request = MrsBaseObjectBatch[int, int](
+        items=[0, 1, 2], submit=submit, options={"retries": 1, "backoff": 0}
+    )
+    outcomes = await request.submit()
+
+    assert [outcome["ok"] for outcome in outcomes] == [True, False, True]
+    assert outcomes[1]["attempts"] == 1
+
+    with pytest.raises(MrsBatchError, match=MrsBatchError._default_msg) as exc_info:
+        MrsBaseObjectBatch.unwrap(outcomes)
+
+    assert exc_info.value.outcomes == outcomes
+
+
 ####################################################################################
 #                    Test "UndefinedDataClassField" Class
 ####################################################################################
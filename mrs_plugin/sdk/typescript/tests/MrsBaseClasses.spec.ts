@@ -33,6 +33,9 @@ import {
     ICreateOptions,
     IMrsDeleteResult,
     IUpdateOptions,
+    MrsBaseObjectBatch,
+    MrsBatchError,
+    MrsTransientError,
 } from "../MrsBaseClasses";
 
 // fixtures
@@ -973,4 +976,78 @@ describe("MRS SDK API", () => {
             });
         });
     });
+
+    describe("when processing resources in bulk", () => {
+        it("keeps the original order of the records", async () => {
+            const batch = new MrsBaseObjectBatch<number, number>([30, 10, 20], async (item) => {
+                await new Promise((resolve) => { setTimeout(resolve, item); });
+
+                return item * 2;
+            });
+            const results = await batch.fetch();
+
+            expect(MrsBaseObjectBatch.unwrap(results)).toEqual([60, 20, 40]);
+        });
+
+        it("limits the number of requests in flight", async () => {
+            let inFlight = 0;
+            let maxInFlight = 0;
+            const batch = new MrsBaseObjectBatch<number, number>([...Array(20).keys()], async (item) => {
+                maxInFlight = Math.max(maxInFlight, ++inFlight);
+                await new Promise((resolve) => { setTimeout(resolve, 1); });
+                --inFlight;
+
+                return item;
+            }, { concurrency: 3 });
+            await batch.fetch();
+
+            expect(maxInFlight).toBe(3);
+        });
+
+        it("retries records that failed because of transient errors", async () => {
+            const submit = vi.fn()
+                .mockRejectedValueOnce(new MrsTransientError("503. Service unavailable"))
+                .mockResolvedValueOnce("foo");
+            const batch = new MrsBaseObjectBatch<string, string>(["foo"], submit, { backoff: 1 });
+            const results = await batch.fetch();
+
+            expect(results).toEqual([{ index: 0, ok: true, result: "foo", attempts: 2 }]);
+        });
+
+        it("only retries records of non-idempotent commands that were not processed", async () => {
+            const submit = vi.fn()
+                .mockRejectedValueOnce(new MrsTransientError("503. Service unavailable", true))
+                .mockRejectedValueOnce(new MrsTransientError("504. Gateway timeout"))
+                .mockResolvedValueOnce("foo");
+            const batch = new MrsBaseObjectBatch<string, string>(["foo"], submit, { backoff: 1 }, false);
+            const results = await batch.fetch();
+
+            expect(submit).toHaveBeenCalledTimes(2);
+            expect(results[0]).toMatchObject({ index: 0, ok: false, attempts: 2 });
+        });
+
+        it("retries records of non-idempotent commands on any transient error if asked to", async () => {
+            const submit = vi.fn()
+                .mockRejectedValueOnce(new MrsTransientError("504. Gateway timeout"))
+                .mockResolvedValueOnce("foo");
+            const batch = new MrsBaseObjectBatch<string, string>(["foo"], submit,
+                { backoff: 1, retryNonIdempotent: true }, false);
+            const results = await batch.fetch();
+
+            expect(results).toEqual([{ index: 0, ok: true, result: "foo", attempts: 2 }]);
+        });
+
+        it("reports records that failed because of permanent errors", async () => {
+            const submit = vi.fn((item: string) => {
+                return item === "bar" ? Promise.reject(new Error("400. Bad request")) : Promise.resolve(item);
+            });
+            const batch = new MrsBaseObjectBatch<string, string>(["foo", "bar"], submit, { backoff: 1 });
+            const results = await batch.fetch();
+
+            expect(submit).toHaveBeenCalledTimes(2);
+            expect(results[0]).toEqual({ index: 0, ok: true, result: "foo", attempts: 1 });
+            expect(results[1]).toMatchObject({ index: 1, ok: false, attempts: 1 });
+            expect(() => { return MrsBaseObjectBatch.unwrap(results); }).toThrow(MrsBatchError);
+        });
+    });
 });
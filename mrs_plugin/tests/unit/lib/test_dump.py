@@ -0,0 +1,120 @@
+# Copyright (c) 2024, Oracle and/or its affiliates.
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License, version 2.0,
+# as published by the Free Software Foundation.
+#
+# This program is designed to work with certain software (including
+# but not limited to OpenSSL) that is licensed under separate terms, as
+# designated in a particular file or component or in included license
+# documentation.  The authors of MySQL hereby grant you an additional
+# permission to link the program and your derivative works with the
+# separately licensed software that they have either included with
+# the program or referenced in the documentation.
+#
+# This program is distributed in the hope that it will be useful,  but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See
+# the GNU General Public License, version 2.0, for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software Foundation, Inc.,
+# 51 Franklin St, Fifth Floor, Boston, MA 02110-1301 USA
+
+import io
+import json
+from contextlib import ExitStack
+
+import pytest
+from mrs_plugin import lib
+from ..helpers import DbObjectCT, get_default_db_object_init
+
+
+def get_service_dump_with_query_count(session, service_id, monkeypatch):
+    executed = []
+    exec_sql = lib.core.MrsDbExec.exec
+
+    def counting_exec(self, session, params=[]):
+        executed.append(str(self))
+        return exec_sql(self, session, params)
+
+    with monkeypatch.context() as m:
+        m.setattr(lib.core.MrsDbExec, "exec", counting_exec)
+        dump = lib.dump.get_service_dump(session, service_id)
+
+    return dump, len(executed)
+
+
+def test_get_service_dump_query_count(phone_book, monkeypatch):
+    with lib.core.MrsDbSession(session=phone_book["session"]) as session:
+        dump, query_count = get_service_dump_with_query_count(
+            session, phone_book["service_id"], monkeypatch)
+        db_object_count = sum(len(schema["objects"]) for schema in dump["schemas"])
+
+        with ExitStack() as stack:
+            for i in range(10):
+                db_object = get_default_db_object_init(
+                    session, phone_book["schema_id"], request_path=f"/dump_query_count_{i}")
+                stack.enter_context(DbObjectCT(session, **db_object))
+
+            dump, new_query_count = get_service_dump_with_query_count(
+                session, phone_book["service_id"], monkeypatch)
+
+            assert sum(len(schema["objects"]) for schema in dump["schemas"]) == db_object_count + 10
+            assert new_query_count == query_count
+
+            for schema in dump["schemas"]:
+                for db_object in schema["objects"]:
+                    assert db_object["db_schema_id"] == schema["id"]
+                    for obj in db_object["objects"]:
+                        assert obj["db_object_id"] == db_object["id"]
+                        assert len(obj["fields"]) > 0
+
+
+def test_write_dump_stream(phone_book):
+    with lib.core.MrsDbSession(session=phone_book["session"]) as session:
+        version = lib.core.select('mrs_user_schema_version').exec(session).first
+        schema_dump = lib.dump.get_db_schema_dump(session, phone_book["schema_id"])
+
+        file = io.StringIO()
+        lib.dump.write_dump_stream(session, file, "schema", phone_book["schema_id"], version)
+
+        file.seek(0)
+        header = json.loads(file.readline())
+        assert header == {"record": "header", "type": "mrsSchema", "version": version}
+
+        records = list(lib.dump.read_dump_stream(file))
+        assert records[0]["record"] == "schema"
+        assert records[0]["data"]["id"] == schema_dump["id"]
+        assert "objects" not in records[0]["data"]
+
+        db_objects = [record["data"] for record in records[1:]]
+        assert all(record["record"] == "dbObject" for record in records[1:])
+        assert sorted(db_objects, key=lambda o: o["id"]) == \
+            sorted(schema_dump["objects"], key=lambda o: o["id"])
+
+
+def test_iter_db_object_dumps(phone_book):
+    with lib.core.MrsDbSession(session=phone_book["session"]) as session:
+        db_objects = lib.dump.get_db_object_dumps(session, 'db_schema_id=?', [phone_book["schema_id"]])
+        streamed = list(lib.dump.iter_db_object_dumps(
+            session, 'db_schema_id=?', [phone_book["schema_id"]], chunk_size=1))
+
+        assert sorted(streamed, key=lambda o: o["id"]) == sorted(db_objects, key=lambda o: o["id"])
+
+
+def test_read_dump_stream():
+    file = io.StringIO('{"record": "schema", "data": {}}\n\n{"record": "dbObject"')
+
+    records = lib.dump.read_dump_stream(file)
+    assert next(records) == {"record": "schema", "data": {}}
+
+    with pytest.raises(RuntimeError, match="Invalid dump record at line 4"):
+        next(records)
+
+
+def test_load_dump_stream_unexpected_record(phone_book):
+    with lib.core.MrsDbSession(session=phone_book["session"]) as session:
+        with pytest.raises(RuntimeError, match="Unexpected dump record 'dbObject'"):
+            lib.dump.load_dump_stream(session, [{"record": "dbObject", "data": {}}],
+                                      "service", phone_book["service_id"], False)
@@ -0,0 +1,180 @@
+# Copyright (c) 2024, Oracle and/or its affiliates.
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License, version 2.0,
+# as published by the Free Software Foundation.
+#
+# This program is designed to work with certain software (including
+# but not limited to OpenSSL) that is licensed under separate terms, as
+# designated in a particular file or component or in included license
+# documentation.  The authors of MySQL hereby grant you an additional
+# permission to link the program and your derivative works with the
+# separately licensed software that they have either included with
+# the program or referenced in the documentation.
+#
+# This program is distributed in the hope that it will be useful,  but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See
+# the GNU General Public License, version 2.0, for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program; if not, write to the Free Software Foundation, Inc.,
+# 51 Franklin St, Fifth Floor, Boston, MA 02110-1301 USA
+
+import time
+from mrs_plugin import lib
+
+
+def generate_mrs_script(statement_count, comment=""):
+    statements = []
+    for i in range(statement_count):
+        statements.append(f"""CREATE OR REPLACE REST SERVICE localhost/service{i}
+    ENABLED
+    COMMENTS "Service {i}; {comment}"
+    AUTHENTICATION
+        PATH "/authentication"
+        REDIRECTION DEFAULT
+        VALIDATION DEFAULT
+        PAGE CONTENT DEFAULT
+    OPTIONS {{
+        "http": {{
+            "allowedOrigin": "auto"
+        }},
+        "returnInternalErrorDetails": true
+    }};""")
+        statements.append(f"SHOW CREATE REST SERVICE localhost/service{i};")
+
+    return "\n\n".join(statements)
+
+
+def test_split_mrs_script():
+    statements = lib.script.split_mrs_script("""SHOW REST SERVICES;;
+    CREATE REST SERVICE localhost/myService COMMENTS "a; b" # c;
+    /* d; */;
+  SHOW REST SCHEMAS -- e;""")
+
+    assert statements == [
+        ("SHOW REST SERVICES", 1, 0),
+        ('CREATE REST SERVICE localhost/myService COMMENTS "a; b" # c;\n    /* d; */', 2, 4),
+        ("SHOW REST SCHEMAS -- e;", 4, 2),
+    ]
+
+
+def test_parse_mrs_script():
+    lib.script.clear_statement_cache()
+
+    syntax_errors = []
+    trees = lib.script.parse_mrs_script(generate_mrs_script(10), syntax_errors)
+
+    assert syntax_errors == []
+    assert len(trees) == 20
+
+    # Only the changed statement is parsed again
+    script = generate_mrs_script(10).replace("Service 5;", "Service five;")
+    changed_trees = lib.script.parse_mrs_script(script, syntax_errors)
+
+    assert syntax_errors == []
+    for i, (tree, changed_tree) in enumerate(zip(trees, changed_trees)):
+        assert (tree is changed_tree) == (i != 10)
+
+    # Syntax errors report the position in the whole script and are not cached
+    script = "SHOW REST SERVICES;\n\nCREATE REST FOO;"
+    for _ in range(2):
+        syntax_errors = []
+        lib.script.parse_mrs_script(script, syntax_errors)
+
+        assert len(syntax_errors) == 1
+        assert syntax_errors[0]["line"] == 3
+        assert syntax_errors[0]["column"] == 12
+
+
+def test_parse_mrs_script_benchmark():
+    script = generate_mrs_script(500)
+
+    lib.script.clear_statement_cache()
+
+    start = time.perf_counter()
+    trees = lib.script.parse_mrs_script(script, [])
+    cold = time.perf_counter() - start
+
+    start = time.perf_counter()
+    cached_trees = lib.script.parse_mrs_script(script, [])
+    warm = time.perf_counter() - start
+
+    # Change a single statement, as an editor integration would do
+    script = script.replace("Service 250;", "Service 250 (edited);")
+    start = time.perf_counter()
+    edited_trees = lib.script.parse_mrs_script(script, [])
+    edited = time.perf_counter() - start
+
+    print(f"\nParsing {len(trees)} statements: cold {cold:.3f}s, "
+          f"cached {warm:.3f}s, one statement edited {edited:.3f}s")
+
+    assert len(cached_trees) == len(edited_trees) == 1000
+
+
+def test_warm_up_parser():
+    for statement in lib.script.WARM_UP_STATEMENTS:
+        syntax_errors = []
+        lib.script.parse_mrs_statement(statement, syntax_errors)
+
+        assert syntax_errors == [], statement
+
+    # The lexer and parser are reused by the thread
+    parser = lib.script.get_mrs_parser("SHOW REST SERVICES")
+
+    assert lib.script.get_mrs_parser("SHOW REST SCHEMAS") is parser
+
+
+def test_start_parser_warm_up(monkeypatch):
+    monkeypatch.setattr(lib.script, "_warm_up_thread", None)
+
+    thread = lib.script.start_parser_warm_up()
+    assert thread is not None
+    assert lib.script.start_parser_warm_up() is None
+
+    # Statements parsed while the warm-up runs are not affected by it
+    for statement in lib.script.WARM_UP_STATEMENTS:
+        syntax_errors = []
+        lib.script.parse_mrs_statement(statement, syntax_errors)
+        assert syntax_errors == [], statement
+
+    thread.join(timeout=60)
+    assert not thread.is_alive()
+
+
+def test_warm_up_parser_benchmark():
+    statements = [
+        f"CREATE OR REPLACE REST DATA MAPPING VIEW /actor{i} ON SERVICE localhost/myService SCHEMA /sakila "
+        f"AS sakila.actor CLASS MyServiceSakilaActor{i} @INSERT @UPDATE {{"
+        "actorId: actor_id @SORTABLE, firstName: first_name, lastName: last_name, "
+        "filmActor: sakila.film_actor @UNNEST { film: sakila.film @UNNEST { title: title } }"
+        "} AUTHENTICATION REQUIRED ITEMS PER PAGE 10"
+        for i in range(5)
+    ] + [
+        "CREATE REST SCHEMA /world ON SERVICE localhost/myService FROM `world` ENABLED",
+        'CREATE OR REPLACE REST SERVICE /myService COMMENTS "Test" OPTIONS {"logging": {"exceptions": true}}',
+    ]
+
+    def parse_latency():
+        latency = []
+        for statement in statements:
+            start = time.perf_counter()
+            lib.script.parse_mrs_statement(statement, [])
+            latency.append(time.perf_counter() - start)
+
+        return latency
+
+    lib.script.clear_parser_dfa_cache()
+    cold = parse_latency()
+
+    lib.script.clear_parser_dfa_cache()
+    warm_up = lib.script.warm_up_parser()
+    warm = parse_latency()
+
+    print(f"\nFirst statement: cold {cold[0] * 1000:.1f}ms, warm {warm[0] * 1000:.1f}ms "
+          f"(warm-up {warm_up * 1000:.1f}ms), all statements: cold {sum(cold) * 1000:.1f}ms, "
+          f"warm {sum(warm) * 1000:.1f}ms")
+
+    assert warm[0] < cold[0]
+    assert sum(warm) < sum(cold)
@@ -347,6 +347,29 @@ import {
     assert got == want
 
 
+def test_substitute_batch_imports_in_template():
+    template = """# --- importLoopStart
+from .mrs_base_classes import (
+    # --- importCreateOnlyStart
+    MrsBaseObjectCreate,
+    # --- importCreateOnlyEnd
+    # --- importBatchOnlyStart
+    MrsBaseObjectBatch,
+    # --- importBatchOnlyEnd
+)
+# --- importLoopEnd\n"""
+
+    res = substitute_imports_in_template(template, ["Read"], None, "Python")
+
+    assert res.get("template") == """from .mrs_base_classes import (
+)\n"""
+
+    for op in ["Create", "Update", "DeleteUnique"]:
+        res = substitute_imports_in_template(template, [op], None, "Python")
+
+        assert "MrsBaseObjectBatch," in res.get("template")
+
+
 def test_generate_function_interface():
     class_name = "MyServiceSakilaSumFuncResult"
     db_obj = {"object_type": "FUNCTION"}